@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark fuzzy alignment of extractions.
+
+Compares the indexed fuzzy window search used by WordAligner with the
+exhaustive scan over every window size and start, on synthetic chunks whose
+extractions only align fuzzily, and reports how many alignments agree.
+
+Usage:
+    python benchmarks/alignment_benchmark.py
+    python benchmarks/alignment_benchmark.py --chunk-tokens 200 400 --extractions 20
+"""
+
+import argparse
+import random
+import time
+
+from langextract import resolver
+from langextract.core import data
+
+_WORDS = (
+    "patient",
+    "was",
+    "prescribed",
+    "lisinopril",
+    "daily",
+    "for",
+    "hypertension",
+    "and",
+    "monitoring",
+    "smith",
+    "reviewed",
+    "the",
+    "results",
+    "blood",
+    "pressure",
+    "remained",
+    "elevated",
+    "despite",
+    "treatment",
+    "with",
+)
+
+
+def make_chunk(
+    num_tokens: int, num_extractions: int, seed: int = 0
+) -> tuple[str, list[str]]:
+  """Generates a chunk and extraction texts that need fuzzy alignment.
+
+  Args:
+    num_tokens: Number of words in the chunk.
+    num_extractions: Number of extraction texts.
+    seed: Random seed.
+
+  Returns:
+    The chunk text and extraction texts, each a span of the chunk with one
+    word replaced so that exact and lesser matching fail.
+  """
+  rng = random.Random(seed)
+  words = [rng.choice(_WORDS) for _ in range(num_tokens)]
+  extraction_texts = []
+  for _ in range(num_extractions):
+    length = rng.randint(4, 8)
+    start = rng.randrange(num_tokens - length)
+    span = words[start : start + length]
+    span[rng.randrange(length)] = "unmentioned"
+    extraction_texts.append(" ".join(span))
+  return " ".join(words), extraction_texts
+
+
+def time_alignment(
+    source_text: str, extraction_texts: list[str], exhaustive: bool
+) -> tuple[float, list[data.Extraction]]:
+  extractions = [
+      data.Extraction(extraction_class="finding", extraction_text=text)
+      for text in extraction_texts
+  ]
+  start = time.perf_counter()
+  aligned = resolver.WordAligner().align_extractions(
+      [[extraction] for extraction in extractions],
+      source_text,
+      enable_fuzzy_alignment=True,
+      exhaustive_fuzzy_alignment=exhaustive,
+  )
+  elapsed = time.perf_counter() - start
+  return elapsed, [group[0] for group in aligned]
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument(
+      "--chunk-tokens",
+      type=int,
+      nargs="+",
+      default=[50, 100, 200],
+      help="Chunk sizes in tokens to benchmark.",
+  )
+  parser.add_argument("--extractions", type=int, default=10)
+  args = parser.parse_args()
+
+  print(
+      f"{'tokens':>7} {'extractions':>11} {'indexed (s)':>12}"
+      f" {'exhaustive (s)':>15} {'agree':>6}"
+  )
+  for num_tokens in args.chunk_tokens:
+    source_text, extraction_texts = make_chunk(num_tokens, args.extractions)
+    indexed_time, indexed = time_alignment(
+        source_text, extraction_texts, exhaustive=False
+    )
+    exhaustive_time, exhaustive = time_alignment(
+        source_text, extraction_texts, exhaustive=True
+    )
+    agree = sum(
+        a.char_interval == b.char_interval for a, b in zip(indexed, exhaustive)
+    )
+    print(
+        f"{num_tokens:>7} {args.extractions:>11} {indexed_time:12.3f}"
+        f" {exhaustive_time:15.3f} {agree:>3}/{len(indexed)}"
+    )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark merging of multi-pass extractions.
+
+Compares the interval-index merge used by the Annotator with the previous
+pairwise overlap scan on synthetic documents with many extractions per pass.
+The time per extraction of the indexed merge should grow only
+logarithmically with the size, from 1,000 up to 100,000 extractions per pass
+and beyond.
+
+Usage:
+    python benchmarks/merge_benchmark.py
+    python benchmarks/merge_benchmark.py --sizes 10000 100000 300000 --passes 5
+"""
+
+import argparse
+import random
+import time
+
+from langextract import annotation
+from langextract.core import data
+
+
+def make_passes(
+    num_extractions: int, num_passes: int, seed: int = 0
+) -> list[list[data.Extraction]]:
+  """Generates extraction passes over a synthetic document.
+
+  Args:
+    num_extractions: Number of extractions in each pass.
+    num_passes: Number of extraction passes.
+    seed: Random seed.
+
+  Returns:
+    Extractions for each pass, with roughly half of the later-pass extractions
+    overlapping earlier ones.
+  """
+  rng = random.Random(seed)
+  doc_length = num_extractions * 20
+  passes = []
+  for pass_num in range(num_passes):
+    extractions = []
+    for i in range(num_extractions):
+      start = rng.randrange(doc_length)
+      end = start + rng.randint(1, 15)
+      extractions.append(
+          data.Extraction(
+              extraction_class=f"pass{pass_num}",
+              extraction_text=f"text{i}",
+              char_interval=data.CharInterval(start_pos=start, end_pos=end),
+          )
+      )
+    passes.append(extractions)
+  return passes
+
+
+def pairwise_merge(
+    all_extractions: list[list[data.Extraction]],
+) -> list[data.Extraction]:
+  """Reference merge comparing every new extraction with all merged ones."""
+  merged = list(all_extractions[0])
+  for pass_extractions in all_extractions[1:]:
+    for extraction in pass_extractions:
+      if not any(
+          annotation._extractions_overlap(extraction, existing)  # pylint: disable=protected-access
+          for existing in merged
+      ):
+        merged.append(extraction)
+  return merged
+
+
+def time_call(fn, *args) -> tuple[float, list[data.Extraction]]:
+  start = time.perf_counter()
+  result = fn(*args)
+  return time.perf_counter() - start, result
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument(
+      "--sizes",
+      type=int,
+      nargs="+",
+      default=[1000, 10000, 100000],
+      help="Extractions per pass to benchmark.",
+  )
+  parser.add_argument("--passes", type=int, default=3)
+  parser.add_argument(
+      "--skip-pairwise-above",
+      type=int,
+      default=10000,
+      help="Skip the quadratic reference for sizes above this value.",
+  )
+  args = parser.parse_args()
+
+  print(
+      f"{'size':>8} {'passes':>6} {'indexed (s)':>12}"
+      f" {'us/extraction':>14} {'pairwise (s)':>13}"
+  )
+  for size in args.sizes:
+    passes = make_passes(size, args.passes)
+    indexed_time, indexed = time_call(
+        annotation._merge_non_overlapping_extractions,  # pylint: disable=protected-access
+        passes,
+    )
+    if size <= args.skip_pairwise_above:
+      pairwise_time, expected = time_call(pairwise_merge, passes)
+      if [id(e) for e in indexed] != [id(e) for e in expected]:
+        raise AssertionError(f"Merge results differ for size {size}.")
+      pairwise = f"{pairwise_time:13.3f}"
+    else:
+      pairwise = f"{'skipped':>13}"
+    per_extraction = indexed_time / (size * args.passes) * 1e6
+    print(
+        f"{size:>8} {args.passes:>6} {indexed_time:12.3f}"
+        f" {per_extraction:14.2f} {pairwise}"
+    )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark per-request HTTP overhead of the Ollama provider.
+
+Sends prompts to a local stub of the Ollama generate endpoint that answers
+immediately, once with a new connection per request through requests.post
+(the previous behavior) and once through OllamaLanguageModel.infer, which
+reuses the keep-alive connections of its pooled session. The stub has no
+generation cost, so the timings are the client and connection overhead.
+
+Usage:
+    python benchmarks/ollama_session_benchmark.py
+    python benchmarks/ollama_session_benchmark.py --requests 2000
+"""
+
+import argparse
+import http.server
+import json
+import threading
+import time
+
+import requests
+
+from langextract.providers import ollama
+
+_RESPONSE = json.dumps({"response": '{"extractions": []}'}).encode()
+
+
+class _StubOllamaHandler(http.server.BaseHTTPRequestHandler):
+  """Answers every POST like a non-streaming /api/generate call."""
+
+  protocol_version = "HTTP/1.1"
+  # Headers and body are written separately; without this, delayed ACKs
+  # stall every response on a kept-alive connection.
+  disable_nagle_algorithm = True
+
+  def do_POST(self):  # pylint: disable=invalid-name
+    self.rfile.read(int(self.headers["Content-Length"]))
+    self.send_response(200)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(_RESPONSE)))
+    self.end_headers()
+    self.wfile.write(_RESPONSE)
+
+  def log_message(self, *args):  # pylint: disable=arguments-differ
+    pass
+
+
+def post_per_request(model_url: str, prompts: list[str]) -> None:
+  """Sends each prompt with a new connection, as the provider used to."""
+  for prompt in prompts:
+    response = requests.post(
+        f"{model_url}/api/generate",
+        headers={
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        },
+        json={"model": "stub", "prompt": prompt, "stream": False},
+        timeout=30,
+    )
+    response.raise_for_status()
+    response.json()
+
+
+def infer_with_session(model_url: str, prompts: list[str]) -> None:
+  model = ollama.OllamaLanguageModel(model_id="stub", model_url=model_url)
+  try:
+    for _ in model.infer(prompts):
+      pass
+  finally:
+    model.close()
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--requests", type=int, default=500)
+  args = parser.parse_args()
+
+  server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StubOllamaHandler)
+  server.daemon_threads = True
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  model_url = f"http://127.0.0.1:{server.server_address[1]}"
+  prompts = [f"prompt {i}" for i in range(args.requests)]
+
+  try:
+    print(f"{'client':>20} {'total (s)':>10} {'per request (ms)':>17}")
+    for name, fn in (
+        ("requests.post", post_per_request),
+        ("pooled session", infer_with_session),
+    ):
+      start = time.perf_counter()
+      fn(model_url, prompts)
+      elapsed = time.perf_counter() - start
+      print(f"{name:>20} {elapsed:10.3f} {1000 * elapsed / len(prompts):17.3f}")
+  finally:
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark tokenizer throughput.
+
+Compares core.tokenizer.tokenize with the previous implementation, which
+re-classified every token with extra regex calls and sliced each gap to look
+for newlines into one Token object per token, and reports throughput in MB/s
+and the memory retained by the result.
+
+Usage:
+    python benchmarks/tokenizer_benchmark.py
+    python benchmarks/tokenizer_benchmark.py --megabytes 50 --repeats 1
+"""
+
+import argparse
+import random
+import re
+import time
+import tracemalloc
+
+from langextract.core import tokenizer
+
+_WORDS = (
+    "Patient",
+    "was",
+    "prescribed",
+    "Lisinopril",
+    "10mg",
+    "daily",
+    "for",
+    "hypertension",
+    "and",
+    "I/O",
+    "monitoring",
+    "Dr.",
+    "Smith",
+    "reviewed",
+    "the",
+    "results",
+    "on",
+    "2024-03-15",
+    "(see",
+    "notes)",
+    "BP",
+    "140/90",
+    "mmHg",
+)
+
+_LETTERS_PATTERN = r"[A-Za-z]+"
+_DIGITS_PATTERN = r"[0-9]+"
+_SYMBOLS_PATTERN = r"[^A-Za-z0-9\s]+"
+_SLASH_ABBREV_PATTERN = r"[A-Za-z0-9]+(?:/[A-Za-z0-9]+)+"
+_LEGACY_TOKEN_PATTERN = re.compile(
+    rf"{_SLASH_ABBREV_PATTERN}|{_LETTERS_PATTERN}|{_DIGITS_PATTERN}|{_SYMBOLS_PATTERN}"
+)
+_LEGACY_WORD_PATTERN = re.compile(
+    rf"(?:{_LETTERS_PATTERN}|{_DIGITS_PATTERN})\Z"
+)
+
+
+def legacy_tokenize(text: str) -> tokenizer.TokenizedText:
+  """The previous tokenizer, kept as the baseline."""
+  tokens = []
+  previous_end = 0
+  for token_index, match in enumerate(_LEGACY_TOKEN_PATTERN.finditer(text)):
+    start_pos, end_pos = match.span()
+    matched_text = match.group()
+    token = tokenizer.Token(
+        index=token_index,
+        char_interval=tokenizer.CharInterval(
+            start_pos=start_pos, end_pos=end_pos
+        ),
+        token_type=tokenizer.TokenType.WORD,
+        first_token_after_newline=False,
+    )
+    if token_index > 0:
+      gap = text[previous_end:start_pos]
+      if "\n" in gap or "\r" in gap:
+        token.first_token_after_newline = True
+    if re.fullmatch(_DIGITS_PATTERN, matched_text):
+      token.token_type = tokenizer.TokenType.NUMBER
+    elif re.fullmatch(_SLASH_ABBREV_PATTERN, matched_text):
+      token.token_type = tokenizer.TokenType.ACRONYM
+    elif _LEGACY_WORD_PATTERN.fullmatch(matched_text):
+      token.token_type = tokenizer.TokenType.WORD
+    else:
+      token.token_type = tokenizer.TokenType.PUNCTUATION
+    tokens.append(token)
+    previous_end = end_pos
+  return tokenizer.TokenizedText(text=text, tokens=tokens)
+
+
+def make_corpus(num_bytes: int, seed: int = 0) -> str:
+  """Generates clinical-note-like ASCII text of roughly num_bytes bytes."""
+  rng = random.Random(seed)
+  parts = []
+  size = 0
+  while size < num_bytes:
+    sentence = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 20)))
+    sentence += rng.choice((". ", ".\n", "? ", "!\r\n", "; "))
+    parts.append(sentence)
+    size += len(sentence)
+  return "".join(parts)
+
+
+def best_time(fn, text: str, repeats: int) -> tuple[float, object]:
+  best = float("inf")
+  result = None
+  for _ in range(repeats):
+    start = time.perf_counter()
+    result = fn(text)
+    best = min(best, time.perf_counter() - start)
+  return best, result
+
+
+def retained_megabytes(fn, text: str) -> float:
+  """Returns the memory held by fn(text)'s result, excluding the text."""
+  tracemalloc.start()
+  try:
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(text)
+    retained = tracemalloc.get_traced_memory()[0] - before
+  finally:
+    tracemalloc.stop()
+  del result
+  return retained / 1_000_000
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument(
+      "--megabytes",
+      type=float,
+      default=10.0,
+      help="Size of the synthetic corpus in MB.",
+  )
+  parser.add_argument("--repeats", type=int, default=3)
+  args = parser.parse_args()
+
+  text = make_corpus(int(args.megabytes * 1_000_000))
+  megabytes = len(text.encode()) / 1_000_000
+
+  legacy_time, expected = best_time(legacy_tokenize, text, args.repeats)
+  current_time, actual = best_time(tokenizer.tokenize, text, args.repeats)
+  if actual != expected:
+    raise AssertionError("Tokenizer output differs from the baseline.")
+
+  del expected, actual
+
+  print(f"corpus: {megabytes:.1f} MB")
+  print(f"{'tokenizer':>10} {'time (s)':>9} {'MB/s':>7} {'retained MB':>12}")
+  for name, fn, seconds in (
+      ("legacy", legacy_tokenize, legacy_time),
+      ("current", tokenizer.tokenize, current_time),
+  ):
+    memory = retained_megabytes(fn, text)
+    print(
+        f"{name:>10} {seconds:9.3f} {megabytes / seconds:7.2f} {memory:12.1f}"
+    )
+
+
+if __name__ == "__main__":
+  main()
@@ -25,11 +25,13 @@ import sys
 from typing import Any, Dict
 
 from langextract import visualization
+from langextract.extraction import aextract as aextract_func
 from langextract.extraction import extract as extract_func
 
 __all__ = [
     # Public convenience functions (thin wrappers)
     "extract",
+    "aextract",
     "visualize",
     # Submodules exposed lazily on attribute access for ergonomics:
     "annotation",
@@ -55,6 +57,11 @@ def extract(*args: Any, **kwargs: Any):
   return extract_func(*args, **kwargs)
 
 
+async def aextract(*args: Any, **kwargs: Any):
+  """Top-level API: await lx.aextract(...)."""
+  return await aextract_func(*args, **kwargs)
+
+
 def visualize(*args: Any, **kwargs: Any):
   """Top-level API: lx.visualize(...)."""
   return visualization.visualize(*args, **kwargs)
@@ -23,11 +23,18 @@ Usage example:
     annotated_documents = annotator.annotate_documents(documents, resolver)
 """
 
-from collections.abc import Iterable, Iterator, Sequence
+import asyncio
+import bisect
+import collections
+from collections.abc import AsyncIterator, Iterable, Iterator, Sequence
+import concurrent.futures
+import inspect
 import itertools
+import multiprocessing
 import time
 
 from absl import logging
+import more_itertools
 
 from langextract import chunking
 from langextract import progress
@@ -36,14 +43,172 @@ from langextract import resolver as resolver_lib
 from langextract.core import base_model
 from langextract.core import data
 from langextract.core import exceptions
+from langextract.core import tokenizer
+from langextract.core import types as core_types
 
 ATTRIBUTE_SUFFIX = "_attributes"
 
+# With continuous batching and async annotation, chunks are submitted up to this
+# many times the number of workers ahead of the oldest unfinished chunk. A slow
+# chunk only holds back the order in which results are emitted, not the slots.
+_SCHEDULING_WINDOW_FACTOR = 4
+
 
 class DocumentRepeatError(exceptions.LangExtractError):
   """Exception raised when identical document ids are present."""
 
 
+# Target number of intervals per block of a _DisjointIntervals.
+_BLOCK_SIZE = 256
+
+
+class _DisjointIntervals:
+  """Intervals with disjoint interiors, sorted by start and by end.
+
+  Intervals are stored in blocks of up to 2 * _BLOCK_SIZE so that an
+  insertion splices one block rather than one list of every interval. A query
+  bisects the last ends of the blocks, then one block, in O(log n) time. An
+  insertion adds a splice of at most 2 * _BLOCK_SIZE entries, and a block
+  split, which splices the list of blocks, happens at most once every
+  _BLOCK_SIZE insertions.
+  """
+
+  def __init__(self, intervals: Sequence[tuple[int, int]] = ()):
+    """Initializes the intervals.
+
+    Args:
+      intervals: (start, end) pairs with disjoint interiors, sorted by start.
+    """
+    self._starts: list[list[int]] = []
+    self._ends: list[list[int]] = []
+    for index in range(0, len(intervals), _BLOCK_SIZE):
+      block = intervals[index : index + _BLOCK_SIZE]
+      self._starts.append([start for start, _ in block])
+      self._ends.append([end for _, end in block])
+    self._last_ends = [ends[-1] for ends in self._ends]
+
+  def first_start_ending_after(self, position: int) -> int | None:
+    """Returns the start of the first interval ending after position."""
+    block = bisect.bisect_right(self._last_ends, position)
+    if block == len(self._ends):
+      return None
+    index = bisect.bisect_right(self._ends[block], position)
+    return self._starts[block][index]
+
+  def insert(self, start: int, end: int) -> None:
+    """Inserts an interval whose interior is disjoint from the others."""
+    if not self._ends:
+      self._starts.append([start])
+      self._ends.append([end])
+      self._last_ends.append(end)
+      return
+    block = min(
+        bisect.bisect_right(self._last_ends, start), len(self._ends) - 1
+    )
+    starts, ends = self._starts[block], self._ends[block]
+    index = bisect.bisect_right(ends, start)
+    starts.insert(index, start)
+    ends.insert(index, end)
+    self._last_ends[block] = ends[-1]
+    if len(ends) > 2 * _BLOCK_SIZE:
+      self._starts[block : block + 1] = [
+          starts[:_BLOCK_SIZE],
+          starts[_BLOCK_SIZE:],
+      ]
+      self._ends[block : block + 1] = [ends[:_BLOCK_SIZE], ends[_BLOCK_SIZE:]]
+      self._last_ends[block : block + 1] = [ends[_BLOCK_SIZE - 1], ends[-1]]
+
+
+class _AcceptedIntervalIndex:
+  """Index of accepted char intervals for fast overlap queries.
+
+  Two intervals [s1, e1) and [s2, e2) overlap when s1 < e2 and s2 < e1, so
+  only their open interiors matter. The initial extractions, which may
+  overlap each other, are sorted once and strictly overlapping intervals of
+  positive length are unioned into components (touching ones are not).
+  Extractions added later do not overlap accepted ones, so they are inserted
+  as new components. Components and zero-length intervals are each kept in a
+  _DisjointIntervals, sorted by start and therefore also by end, so queries
+  take O(log n) time and insertions O(log n) plus a bounded splice.
+
+  Intervals with start > end are not indexed; they are compared linearly
+  with _extractions_overlap so the result matches pairwise checking exactly.
+  """
+
+  def __init__(self, extractions: Iterable[data.Extraction] = ()):
+    """Indexes accepted extractions, which may overlap each other.
+
+    Args:
+      extractions: The initially accepted extractions.
+    """
+    self._inverted: list[data.Extraction] = []
+    self._all: list[data.Extraction] = []
+    intervals = []
+    points = []
+    for extraction in extractions:
+      bounds = _interval_bounds(extraction)
+      if bounds is None:
+        continue
+      self._all.append(extraction)
+      start, end = bounds
+      if start > end:
+        self._inverted.append(extraction)
+      elif start == end:
+        points.append(bounds)
+      else:
+        intervals.append(bounds)
+    intervals.sort()
+    components = []
+    for start, end in intervals:
+      if components and start < components[-1][1]:
+        components[-1] = (components[-1][0], max(end, components[-1][1]))
+      else:
+        components.append((start, end))
+    self._components = _DisjointIntervals(components)
+    self._points = _DisjointIntervals(sorted(points))
+
+  def overlaps(self, extraction: data.Extraction) -> bool:
+    """Returns True if the extraction overlaps any accepted extraction."""
+    bounds = _interval_bounds(extraction)
+    if bounds is None:
+      return False
+    start, end = bounds
+    if start > end:
+      return any(_extractions_overlap(extraction, e) for e in self._all)
+
+    # The first interval ending after start is the only candidate.
+    for intervals in (self._components, self._points):
+      candidate = intervals.first_start_ending_after(start)
+      if candidate is not None and candidate < end:
+        return True
+    return any(_extractions_overlap(extraction, e) for e in self._inverted)
+
+  def add(self, extraction: data.Extraction) -> None:
+    """Adds an extraction for which overlaps() returned False."""
+    bounds = _interval_bounds(extraction)
+    if bounds is None:
+      return
+    self._all.append(extraction)
+    start, end = bounds
+    if start > end:
+      self._inverted.append(extraction)
+    elif start == end:
+      self._points.insert(start, end)
+    else:
+      self._components.insert(start, end)
+
+
+def _interval_bounds(extraction: data.Extraction) -> tuple[int, int] | None:
+  """Returns the (start, end) char positions of an extraction, if known."""
+  char_interval = extraction.char_interval
+  if char_interval is None:
+    return None
+  start, end = char_interval.start_pos, char_interval.end_pos
+  if start is None or end is None:
+    return None
+  return start, end
+
+
 def _merge_non_overlapping_extractions(
     all_extractions: list[Iterable[data.Extraction]],
 ) -> list[data.Extraction]:
@@ -52,6 +217,9 @@ def _merge_non_overlapping_extractions(
   When extractions from different passes overlap in their character positions,
   the extraction from the earlier pass is kept (first-pass wins strategy).
   Only non-overlapping extractions from later passes are added to the result.
+  Overlap checks use an interval index with O(log n) queries and block-bounded
+  insertions, so merging n extractions takes about O(n log n) time instead of
+  comparing every pair of extractions.
 
   Args:
     all_extractions: List of extraction iterables from different sequential
@@ -68,19 +236,13 @@ def _merge_non_overlapping_extractions(
     return list(all_extractions[0])
 
   merged_extractions = list(all_extractions[0])
+  accepted = _AcceptedIntervalIndex(merged_extractions)
 
   for pass_extractions in all_extractions[1:]:
     for extraction in pass_extractions:
-      overlaps = False
-      if extraction.char_interval is not None:
-        for existing_extraction in merged_extractions:
-          if existing_extraction.char_interval is not None:
-            if _extractions_overlap(extraction, existing_extraction):
-              overlaps = True
-              break
-
-      if not overlaps:
+      if not accepted.overlaps(extraction):
         merged_extractions.append(extraction)
+        accepted.add(extraction)
 
   return merged_extractions
 
@@ -116,6 +278,162 @@ def _extractions_overlap(
   return start1 < end2 and start2 < end1
 
 
+def _resolve_chunk_outputs(
+    resolver: resolver_lib.AbstractResolver,
+    raw_outputs: Sequence[str | None],
+    chunk_text: str,
+    token_offset: int,
+    char_offset: int | None,
+    debug: bool,
+    chunk_tokens: tokenizer.TokenizedText | None = None,
+    alignment_cache: resolver_lib.AlignmentCache | None = None,
+    **kwargs,
+) -> list[data.Extraction]:
+  """Resolves and aligns the raw output of each pass and merges the passes.
+
+  Args:
+    resolver: Resolver used to parse and align the model outputs.
+    raw_outputs: Top model output of each extraction pass for the chunk.
+      Passes without output, such as prompts that failed after their
+      retries, contribute no extractions.
+    chunk_text: Text of the chunk.
+    token_offset: Index of the chunk's first token in the document.
+    char_offset: Char position of the chunk in the document.
+    debug: Whether to populate debug fields.
+    chunk_tokens: Slice of the document's tokenization covering the chunk.
+      When given, alignment reuses it instead of tokenizing chunk_text.
+    alignment_cache: Cache of alignment results shared with earlier passes
+      over the chunk. With several raw outputs and no cache, one is shared by
+      the passes resolved here.
+    **kwargs: Additional arguments passed to the resolver.
+
+  Returns:
+    Merged extractions aligned to document-level positions.
+  """
+  if chunk_tokens is not None:
+    kwargs["tokenized_text"] = chunk_tokens
+  if alignment_cache is None and len(raw_outputs) > 1:
+    alignment_cache = resolver_lib.AlignmentCache()
+  if alignment_cache is not None:
+    kwargs["alignment_cache"] = alignment_cache
+  pass_extractions = []
+  for raw_output in raw_outputs:
+    if raw_output is None:
+      # The prompt failed and the model returned an empty result.
+      logging.warning("Skipping extraction pass without model output.")
+      continue
+    logging.debug("Top inference result: %s", raw_output)
+    annotated_chunk_extractions = resolver.resolve(
+        raw_output, debug=debug, **kwargs
+    )
+    aligned_extractions = resolver.align(
+        annotated_chunk_extractions,
+        chunk_text,
+        token_offset,
+        char_offset,
+        **kwargs,
+    )
+    pass_extractions.append(list(aligned_extractions))
+  return _merge_non_overlapping_extractions(pass_extractions)
+
+
+# Resolver of the current resolve worker process, set by _init_resolve_process.
+_process_resolver: resolver_lib.AbstractResolver | None = None
+
+
+def _init_resolve_process(resolver: resolver_lib.AbstractResolver) -> None:
+  """Stores the resolver in a resolve worker process."""
+  global _process_resolver  # pylint: disable=global-statement
+  _process_resolver = resolver
+
+
+def _resolve_chunk_outputs_in_process(*args, **kwargs) -> list[data.Extraction]:
+  """Runs _resolve_chunk_outputs with the worker process's resolver."""
+  assert _process_resolver is not None, "Resolve worker not initialized."
+  return _resolve_chunk_outputs(_process_resolver, *args, **kwargs)
+
+
+# Arguments that _resolve_chunk_outputs passes to the resolver itself.
+_RESOLVE_CHUNK_ARGS = frozenset({
+    "input_text",
+    "extractions",
+    "source_text",
+    "token_offset",
+    "char_offset",
+    "tokenized_text",
+    "alignment_cache",
+    "debug",
+})
+
+
+def _resolver_kwargs(
+    resolver: resolver_lib.AbstractResolver, kwargs: dict
+) -> dict:
+  """Returns the kwargs named by the resolver's resolve or align method."""
+  names = set()
+  for method in (resolver.resolve, resolver.align):
+    for parameter in inspect.signature(method).parameters.values():
+      if parameter.kind in (
+          inspect.Parameter.POSITIONAL_OR_KEYWORD,
+          inspect.Parameter.KEYWORD_ONLY,
+      ):
+        names.add(parameter.name)
+  names -= _RESOLVE_CHUNK_ARGS
+  return {key: value for key, value in kwargs.items() if key in names}
+
+
+def _new_resolve_executor(
+    resolver: resolver_lib.AbstractResolver, resolve_processes: int
+) -> concurrent.futures.ProcessPoolExecutor:
+  """Spawns resolve worker processes, each holding a copy of the resolver."""
+  return concurrent.futures.ProcessPoolExecutor(
+      max_workers=resolve_processes,
+      initializer=_init_resolve_process,
+      initargs=(resolver,),
+      mp_context=multiprocessing.get_context("spawn"),
+  )
+
+
+def _submit_chunk_resolution(
+    executor: concurrent.futures.Executor,
+    text_chunk: chunking.TextChunk,
+    pass_outputs: Sequence[Sequence[core_types.ScoredOutput]],
+    debug: bool,
+    resolver_kwargs: dict,
+) -> concurrent.futures.Future:
+  """Submits the resolution of a chunk to a resolve worker process.
+
+  Only the top output of each pass, the chunk text, its offsets and a compact
+  copy of its tokens are sent, along with resolver_kwargs.
+  """
+  return executor.submit(
+      _resolve_chunk_outputs_in_process,
+      [scored_outputs[0].output for scored_outputs in pass_outputs],
+      text_chunk.chunk_text,
+      text_chunk.token_interval.start_index,
+      text_chunk.char_interval.start_pos,
+      debug,
+      chunk_tokens=text_chunk.document_text.slice(
+          text_chunk.token_interval
+      ).compact(),
+      **resolver_kwargs,
+  )
+
+
+def _check_scored_outputs(
+    text_chunk: chunking.TextChunk,
+    scored_outputs: Sequence[core_types.ScoredOutput],
+) -> None:
+  """Raises InferenceOutputError if the model returned no outputs for a chunk."""
+  if not scored_outputs:
+    logging.error(
+        "No scored outputs for chunk with ID %s.", text_chunk.document_id
+    )
+    raise exceptions.InferenceOutputError(
+        "No scored outputs from language model."
+    )
+
+
 def _document_chunk_iterator(
     documents: Iterable[data.Document],
     max_char_buffer: int,
@@ -165,6 +483,7 @@ class Annotator:
       format_type: data.FormatType = data.FormatType.YAML,
       attribute_suffix: str = ATTRIBUTE_SUFFIX,
       fence_output: bool = False,
+      prompt_prefix_caching: bool = False,
   ):
     """Initializes Annotator.
 
@@ -178,8 +497,15 @@ class Annotator:
         ```yaml). When True, the model is prompted to generate fenced output and
         the resolver expects it. When False, raw JSON/YAML is expected. Defaults
         to True.
+      prompt_prefix_caching: If True, every prompt is built as the static
+        description and examples prefix followed by the per-chunk context and
+        question, and the prefix is declared to the language model through
+        set_prompt_prefix() so providers can cache it natively. Additional
+        context then follows the examples instead of preceding them.
     """
     self._language_model = language_model
+    self._prompt_prefix_caching = prompt_prefix_caching
+    self._declared_prompt_prefix: str | None = None
     self._prompt_generator = prompting.QAPromptGenerator(
         prompt_template,
         format_type=format_type,
@@ -201,6 +527,11 @@ class Annotator:
       batch_length: int = 1,
       debug: bool = True,
       extraction_passes: int = 1,
+      max_batches_in_flight: int = 1,
+      continuous_batching: bool = False,
+      concurrent_passes: bool = False,
+      pass_window_size: int | None = None,
+      resolve_processes: int = 0,
       **kwargs,
   ) -> Iterator[data.AnnotatedDocument]:
     """Annotates a sequence of documents with NLP extractions.
@@ -223,6 +554,34 @@ class Annotator:
         standard single extraction.
         Values > 1 reprocess tokens multiple times, potentially increasing
         costs with the potential for a more thorough extraction.
+      max_batches_in_flight: Maximum number of batches submitted to the
+        language model at once. Values > 1 pipeline inference with resolution:
+        while one batch is resolved and aligned, the following batches are
+        already being inferred in background threads. Documents are still
+        yielded in input order. Defaults to 1 (each batch is inferred only
+        after the previous one has been resolved).
+      continuous_batching: If True, chunks are not grouped into fixed batches.
+        Instead, max_workers single-chunk requests (taken from kwargs, the
+        language model, or batch_length, in that order) are kept in flight and
+        a new chunk is started as soon as any request completes, so one slow
+        chunk does not stall the other workers. Results are reassembled in
+        chunk order per document. batch_length and max_batches_in_flight are
+        not used in this mode.
+      concurrent_passes: If True and extraction_passes > 1, documents are
+        chunked once and the prompt of every chunk is sent extraction_passes
+        times within the same inference batch, so the passes run as
+        concurrent requests. Results are merged per chunk (earlier passes win
+        on overlaps). If False, each pass re-runs the whole annotation
+        sequentially.
+      pass_window_size: With sequential extraction passes, the number of
+        documents that all passes are run over before their results are
+        yielded. Memory then stays bounded by the window instead of the whole
+        input, and documents are yielded as soon as their window completes.
+        Defaults to None (all documents form a single window).
+      resolve_processes: Number of worker processes used to parse and align
+        model outputs. Values > 0 run the resolver for several chunks in
+        parallel on separate cores; the resolver and resolver kwargs must then
+        be picklable. Defaults to 0 (resolve in the calling thread).
       **kwargs: Additional arguments passed to LanguageModel.infer and Resolver.
 
     Yields:
@@ -232,9 +591,19 @@ class Annotator:
       ValueError: If there are no scored outputs during inference.
     """
 
-    if extraction_passes == 1:
+    self._language_model.begin_run()
+    if extraction_passes == 1 or concurrent_passes:
       yield from self._annotate_documents_single_pass(
-          documents, resolver, max_char_buffer, batch_length, debug, **kwargs
+          documents,
+          resolver,
+          max_char_buffer,
+          batch_length,
+          debug,
+          max_batches_in_flight=max_batches_in_flight,
+          continuous_batching=continuous_batching,
+          extraction_passes=extraction_passes,
+          resolve_processes=resolve_processes,
+          **kwargs,
       )
     else:
       yield from self._annotate_documents_sequential_passes(
@@ -244,9 +613,247 @@ class Annotator:
           batch_length,
           debug,
           extraction_passes,
+          max_batches_in_flight=max_batches_in_flight,
+          continuous_batching=continuous_batching,
+          pass_window_size=pass_window_size,
+          resolve_processes=resolve_processes,
           **kwargs,
       )
 
+  def _render_batch_prompts(
+      self, batch: Sequence[chunking.TextChunk], extraction_passes: int = 1
+  ) -> list[str]:
+    """Renders the prompt for every chunk of a batch.
+
+    Args:
+      batch: Chunks to render prompts for.
+      extraction_passes: Number of times each prompt is repeated, one request
+        per extraction pass. Repeats of a chunk are adjacent.
+
+    Returns:
+      Prompts in chunk order.
+    """
+    prompt_prefix = None
+    if self._prompt_prefix_caching:
+      prompt_prefix = self._prompt_generator.render_prefix()
+      if prompt_prefix != self._declared_prompt_prefix:
+        self._language_model.set_prompt_prefix(prompt_prefix)
+        self._declared_prompt_prefix = prompt_prefix
+
+    prompts = []
+    for text_chunk in batch:
+      if prompt_prefix is not None:
+        prompt = "\n".join([
+            prompt_prefix,
+            self._prompt_generator.render_suffix(
+                question=text_chunk.chunk_text,
+                additional_context=text_chunk.additional_context,
+            ),
+        ])
+      else:
+        prompt = self._prompt_generator.render(
+            question=text_chunk.chunk_text,
+            additional_context=text_chunk.additional_context,
+        )
+      prompts.extend([prompt] * extraction_passes)
+    return prompts
+
+  def _infer_batch(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[core_types.ScoredOutput]]:
+    """Runs inference on a batch and materializes the results."""
+    return list(
+        self._language_model.infer(batch_prompts=batch_prompts, **kwargs)
+    )
+
+  def _iter_batch_outputs(
+      self,
+      batches: Iterable[Sequence[chunking.TextChunk]],
+      max_batches_in_flight: int,
+      num_workers: int | None = None,
+      extraction_passes: int = 1,
+      **kwargs,
+  ) -> Iterator[
+      tuple[
+          Sequence[chunking.TextChunk],
+          Iterable[Sequence[core_types.ScoredOutput]],
+      ]
+  ]:
+    """Runs inference over batches and yields outputs in batch order.
+
+    With max_batches_in_flight > 1, up to that many batches are submitted to a
+    background thread pool of num_workers threads while the caller processes
+    the current batch, so the language model keeps working while resolution
+    and alignment run. When a request finishes, the pool immediately starts the
+    next submitted batch; only the order in which results are yielded waits
+    for earlier batches.
+
+    Args:
+      batches: Batches of text chunks to run inference on.
+      max_batches_in_flight: Maximum number of batches submitted at once.
+      num_workers: Number of threads running inference. Defaults to
+        max_batches_in_flight.
+      extraction_passes: Number of requests sent per chunk. Outputs of the
+        passes of a chunk are adjacent.
+      **kwargs: Additional arguments passed to LanguageModel.infer.
+
+    Yields:
+      Tuples of (batch, scored outputs for each request of the batch).
+    """
+    if max_batches_in_flight <= 1:
+      for batch in batches:
+        yield batch, self._language_model.infer(
+            batch_prompts=self._render_batch_prompts(batch, extraction_passes),
+            **kwargs,
+        )
+      return
+
+    batch_iter = iter(batches)
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(
+            num_workers or max_batches_in_flight, max_batches_in_flight
+        )
+    )
+    pending: collections.deque[
+        tuple[Sequence[chunking.TextChunk], concurrent.futures.Future]
+    ] = collections.deque()
+
+    def submit_next() -> None:
+      batch = next(batch_iter, None)
+      if batch is not None:
+        future = executor.submit(
+            self._infer_batch,
+            self._render_batch_prompts(batch, extraction_passes),
+            **kwargs,
+        )
+        pending.append((batch, future))
+
+    try:
+      for _ in range(max_batches_in_flight):
+        submit_next()
+      while pending:
+        batch, future = pending.popleft()
+        batch_scored_outputs = future.result()
+        # Refill the freed slot before handing the batch to the caller so that
+        # inference of later batches overlaps with its resolution.
+        submit_next()
+        yield batch, batch_scored_outputs
+    finally:
+      executor.shutdown(wait=True, cancel_futures=True)
+
+  def _continuous_batching_workers(self, batch_length: int, **kwargs) -> int:
+    """Returns the number of concurrent requests for continuous batching."""
+    max_workers = kwargs.get("max_workers") or getattr(
+        self._language_model, "max_workers", None
+    )
+    if isinstance(max_workers, int) and max_workers > 0:
+      return max_workers
+    return max(batch_length, 1)
+
+  def _resolve_chunk(
+      self,
+      resolver: resolver_lib.AbstractResolver,
+      text_chunk: chunking.TextChunk,
+      pass_outputs: Sequence[Sequence[core_types.ScoredOutput]],
+      debug: bool,
+      alignment_cache: resolver_lib.AlignmentCache | None = None,
+      **kwargs,
+  ) -> list[data.Extraction]:
+    """Resolves and aligns the model outputs of a chunk, merging its passes.
+
+    Args:
+      resolver: Resolver used to parse and align the model output.
+      text_chunk: The chunk the model outputs were generated for.
+      pass_outputs: Scored outputs of each extraction pass, best first.
+      debug: Whether to populate debug fields.
+      alignment_cache: Cache of alignment results shared with other passes.
+      **kwargs: Additional arguments passed to the resolver.
+
+    Returns:
+      Extractions aligned to document-level token and char positions.
+    """
+    return _resolve_chunk_outputs(
+        resolver,
+        [scored_outputs[0].output for scored_outputs in pass_outputs],
+        text_chunk.chunk_text,
+        text_chunk.token_interval.start_index,
+        text_chunk.char_interval.start_pos,
+        debug,
+        chunk_tokens=text_chunk.document_text.slice(text_chunk.token_interval),
+        alignment_cache=alignment_cache,
+        **kwargs,
+    )
+
+  def _iter_resolved_chunks(
+      self,
+      chunk_outputs: Iterable[
+          tuple[chunking.TextChunk, Sequence[Sequence[core_types.ScoredOutput]]]
+      ],
+      resolver: resolver_lib.AbstractResolver,
+      debug: bool,
+      resolve_processes: int = 0,
+      alignment_cache: resolver_lib.AlignmentCache | None = None,
+      **kwargs,
+  ) -> Iterator[tuple[chunking.TextChunk, list[data.Extraction]]]:
+    """Resolves and aligns chunk outputs, yielding them in chunk order.
+
+    With resolve_processes > 0, resolution runs in a process pool so parsing
+    and alignment of several chunks use multiple cores. The workers are
+    spawned rather than forked, so they do not inherit locks or threads of
+    the calling process. Only the raw model outputs, the chunk text, its
+    offsets and a compact copy of its tokens are sent to the workers, along
+    with the kwargs accepted by the resolver; the resolver is sent once per
+    worker process. alignment_cache is not shared with the workers, which
+    only cache alignments across the passes of one chunk.
+
+    Args:
+      chunk_outputs: Chunks with the scored outputs of each extraction pass.
+      resolver: Resolver used to parse and align the model outputs.
+      debug: Whether to populate debug fields.
+      resolve_processes: Number of worker processes. 0 resolves in the
+        calling thread.
+      alignment_cache: Cache of alignment results shared with other passes
+        over the chunks. Only used when resolving in the calling thread.
+      **kwargs: Additional arguments passed to the resolver. With
+        resolve_processes > 0, only those named by the resolver's resolve or
+        align method are sent, and they must be picklable.
+
+    Yields:
+      Tuples of (chunk, aligned extractions of the chunk).
+    """
+    if resolve_processes <= 0:
+      for text_chunk, pass_outputs in chunk_outputs:
+        yield text_chunk, self._resolve_chunk(
+            resolver,
+            text_chunk,
+            pass_outputs,
+            debug,
+            alignment_cache=alignment_cache,
+            **kwargs,
+        )
+      return
+
+    executor = _new_resolve_executor(resolver, resolve_processes)
+    resolver_kwargs = _resolver_kwargs(resolver, kwargs)
+    max_chunks_in_flight = resolve_processes * _SCHEDULING_WINDOW_FACTOR
+    pending: collections.deque[
+        tuple[chunking.TextChunk, concurrent.futures.Future]
+    ] = collections.deque()
+    try:
+      for text_chunk, pass_outputs in chunk_outputs:
+        future = _submit_chunk_resolution(
+            executor, text_chunk, pass_outputs, debug, resolver_kwargs
+        )
+        pending.append((text_chunk, future))
+        if len(pending) >= max_chunks_in_flight:
+          done_chunk, done_future = pending.popleft()
+          yield done_chunk, done_future.result()
+      while pending:
+        done_chunk, done_future = pending.popleft()
+        yield done_chunk, done_future.result()
+    finally:
+      executor.shutdown(wait=True, cancel_futures=True)
+
   def _annotate_documents_single_pass(
       self,
       documents: Iterable[data.Document],
@@ -254,9 +861,19 @@ class Annotator:
       max_char_buffer: int,
       batch_length: int,
       debug: bool,
+      max_batches_in_flight: int = 1,
+      continuous_batching: bool = False,
+      extraction_passes: int = 1,
+      resolve_processes: int = 0,
+      alignment_cache: resolver_lib.AlignmentCache | None = None,
       **kwargs,
   ) -> Iterator[data.AnnotatedDocument]:
-    """Single-pass annotation logic (original implementation)."""
+    """Annotates documents in a single sweep over their chunks.
+
+    With extraction_passes > 1, every chunk is requested once per pass within
+    the same batch and the passes are merged per chunk, so the corpus is only
+    chunked once and the passes run concurrently.
+    """
 
     logging.info("Starting document annotation.")
     doc_iter, doc_iter_for_chunks = itertools.tee(documents, 2)
@@ -268,7 +885,16 @@ class Annotator:
     annotated_extractions: list[data.Extraction] = []
     chunk_iter = _document_chunk_iterator(doc_iter_for_chunks, max_char_buffer)
 
-    batches = chunking.make_batches_of_textchunk(chunk_iter, batch_length)
+    if continuous_batching:
+      # Every chunk is its own request; the worker pool picks up the next
+      # chunk as soon as any request completes instead of waiting for the
+      # slowest chunk of a fixed batch.
+      num_workers = self._continuous_batching_workers(batch_length, **kwargs)
+      batches = ([text_chunk] for text_chunk in chunk_iter)
+      max_batches_in_flight = num_workers * _SCHEDULING_WINDOW_FACTOR
+    else:
+      num_workers = None
+      batches = chunking.make_batches_of_textchunk(chunk_iter, batch_length)
 
     model_info = progress.get_model_info(self._language_model)
 
@@ -276,44 +902,21 @@ class Annotator:
         batches, model_info=model_info, disable=not debug
     )
 
-    chars_processed = 0
-
-    for index, batch in enumerate(progress_bar):
-      logging.info("Processing batch %d with length %d", index, len(batch))
-
-      batch_prompts: list[str] = []
-      for text_chunk in batch:
-        batch_prompts.append(
-            self._prompt_generator.render(
-                question=text_chunk.chunk_text,
-                additional_context=text_chunk.additional_context,
-            )
-        )
-
-      # Show what we're currently processing
-      if debug and progress_bar:
-        batch_size = sum(len(chunk.chunk_text) for chunk in batch)
-        desc = progress.format_extraction_progress(
-            model_info,
-            current_chars=batch_size,
-            processed_chars=chars_processed,
-        )
-        progress_bar.set_description(desc)
-
-      batch_scored_outputs = self._language_model.infer(
-          batch_prompts=batch_prompts,
-          **kwargs,
-      )
+    batch_outputs = self._iter_batch_outputs(
+        progress_bar,
+        max_batches_in_flight,
+        num_workers=num_workers,
+        extraction_passes=extraction_passes,
+        **kwargs,
+    )
 
-      # Update total processed
-      if debug:
-        for chunk in batch:
-          if chunk.document_text:
-            char_interval = chunk.char_interval
-            chars_processed += char_interval.end_pos - char_interval.start_pos
+    def iter_chunk_outputs():
+      chars_processed = 0
+      for index, (batch, batch_scored_outputs) in enumerate(batch_outputs):
+        logging.info("Processing batch %d with length %d", index, len(batch))
 
-        # Update progress bar with final processed count
-        if progress_bar:
+        # Show what we're currently processing
+        if debug and progress_bar:
           batch_size = sum(len(chunk.chunk_text) for chunk in batch)
           desc = progress.format_extraction_progress(
               model_info,
@@ -322,53 +925,62 @@ class Annotator:
           )
           progress_bar.set_description(desc)
 
-      for text_chunk, scored_outputs in zip(batch, batch_scored_outputs):
-        logging.debug("Processing chunk: %s", text_chunk)
-        if not scored_outputs:
-          logging.error(
-              "No scored outputs for chunk with ID %s.", text_chunk.document_id
-          )
-          raise exceptions.InferenceOutputError(
-              "No scored outputs from language model."
-          )
-        while curr_document.document_id != text_chunk.document_id:
-          logging.info(
-              "Completing annotation for document ID %s.",
-              curr_document.document_id,
-          )
-          annotated_doc = data.AnnotatedDocument(
-              document_id=curr_document.document_id,
-              extractions=annotated_extractions,
-              text=curr_document.text,
-          )
-          yield annotated_doc
-          annotated_extractions.clear()
-
-          curr_document = next(doc_iter, None)
-          assert curr_document is not None, (
-              f"Document should be defined for {text_chunk} per"
-              " _document_chunk_iterator(...) specifications."
-          )
+        # Update total processed
+        if debug:
+          for chunk in batch:
+            if chunk.document_text:
+              char_interval = chunk.char_interval
+              chars_processed += char_interval.end_pos - char_interval.start_pos
+
+          # Update progress bar with final processed count
+          if progress_bar:
+            batch_size = sum(len(chunk.chunk_text) for chunk in batch)
+            desc = progress.format_extraction_progress(
+                model_info,
+                current_chars=batch_size,
+                processed_chars=chars_processed,
+            )
+            progress_bar.set_description(desc)
 
-        top_inference_result = scored_outputs[0].output
-        logging.debug("Top inference result: %s", top_inference_result)
+        chunk_outputs = more_itertools.batched(
+            batch_scored_outputs, extraction_passes
+        )
+        for text_chunk, pass_outputs in zip(batch, chunk_outputs):
+          logging.debug("Processing chunk: %s", text_chunk)
+          for scored_outputs in pass_outputs:
+            _check_scored_outputs(text_chunk, scored_outputs)
+          yield text_chunk, pass_outputs
+
+    resolved_chunks = self._iter_resolved_chunks(
+        iter_chunk_outputs(),
+        resolver,
+        debug,
+        resolve_processes=resolve_processes,
+        alignment_cache=alignment_cache,
+        **kwargs,
+    )
 
-        annotated_chunk_extractions = resolver.resolve(
-            top_inference_result, debug=debug, **kwargs
+    for text_chunk, chunk_extractions in resolved_chunks:
+      while curr_document.document_id != text_chunk.document_id:
+        logging.info(
+            "Completing annotation for document ID %s.",
+            curr_document.document_id,
         )
-        chunk_text = text_chunk.chunk_text
-        token_offset = text_chunk.token_interval.start_index
-        char_offset = text_chunk.char_interval.start_pos
-
-        aligned_extractions = resolver.align(
-            annotated_chunk_extractions,
-            chunk_text,
-            token_offset,
-            char_offset,
-            **kwargs,
+        annotated_doc = data.AnnotatedDocument(
+            document_id=curr_document.document_id,
+            extractions=annotated_extractions,
+            text=curr_document.text,
+        )
+        yield annotated_doc
+        annotated_extractions = []
+
+        curr_document = next(doc_iter, None)
+        assert curr_document is not None, (
+            f"Document should be defined for {text_chunk} per"
+            " _document_chunk_iterator(...) specifications."
         )
 
-        annotated_extractions.extend(aligned_extractions)
+      annotated_extractions.extend(chunk_extractions)
 
     progress_bar.close()
 
@@ -397,6 +1009,10 @@ class Annotator:
       batch_length: int,
       debug: bool,
       extraction_passes: int,
+      max_batches_in_flight: int = 1,
+      continuous_batching: bool = False,
+      pass_window_size: int | None = None,
+      resolve_processes: int = 0,
       **kwargs,
   ) -> Iterator[data.AnnotatedDocument]:
     """Sequential extraction passes logic for improved recall."""
@@ -407,10 +1023,58 @@ class Annotator:
         extraction_passes,
     )
 
-    document_list = list(documents)
+    if pass_window_size is None:
+      windows = [list(documents)]
+    elif pass_window_size < 1:
+      raise ValueError("pass_window_size must be a positive integer.")
+    else:
+      windows = more_itertools.batched(documents, pass_window_size)
+
+    # Each window is chunked on its own, so repeats across windows are
+    # detected here.
+    seen_ids = set()
+    for window in windows:
+      for document in window:
+        if document.document_id in seen_ids:
+          raise DocumentRepeatError(
+              f"Document id {document.document_id} is already visited."
+          )
+        seen_ids.add(document.document_id)
+      yield from self._annotate_document_window_passes(
+          window,
+          resolver,
+          max_char_buffer,
+          batch_length,
+          debug,
+          extraction_passes,
+          max_batches_in_flight=max_batches_in_flight,
+          continuous_batching=continuous_batching,
+          resolve_processes=resolve_processes,
+          **kwargs,
+      )
+
+    logging.info("Sequential extraction passes completed.")
+
+  def _annotate_document_window_passes(
+      self,
+      document_list: Sequence[data.Document],
+      resolver: resolver_lib.AbstractResolver,
+      max_char_buffer: int,
+      batch_length: int,
+      debug: bool,
+      extraction_passes: int,
+      max_batches_in_flight: int = 1,
+      continuous_batching: bool = False,
+      resolve_processes: int = 0,
+      **kwargs,
+  ) -> Iterator[data.AnnotatedDocument]:
+    """Runs all extraction passes over a window of documents and merges them."""
 
     document_extractions_by_pass: dict[str, list[list[data.Extraction]]] = {}
     document_texts: dict[str, str] = {}
+    # Every pass chunks the documents the same way, so extractions repeated
+    # by later passes reuse the alignment of earlier ones.
+    alignment_cache = resolver_lib.AlignmentCache()
 
     for pass_num in range(extraction_passes):
       logging.info(
@@ -423,6 +1087,10 @@ class Annotator:
           max_char_buffer,
           batch_length,
           debug=(debug and pass_num == 0),
+          max_batches_in_flight=max_batches_in_flight,
+          continuous_batching=continuous_batching,
+          resolve_processes=resolve_processes,
+          alignment_cache=alignment_cache,
           **kwargs,  # Only show progress on first pass
       ):
         doc_id = annotated_doc.document_id
@@ -435,6 +1103,13 @@ class Annotator:
             annotated_doc.extractions or []
         )
 
+    logging.info(
+        "Alignment cache: %d hits, %d misses (%.0f%% hit rate).",
+        alignment_cache.hits,
+        alignment_cache.misses,
+        100 * alignment_cache.hit_rate,
+    )
+
     for doc_id, all_pass_extractions in document_extractions_by_pass.items():
       merged_extractions = _merge_non_overlapping_extractions(
           all_pass_extractions
@@ -459,7 +1134,216 @@ class Annotator:
           text=document_texts[doc_id],
       )
 
-    logging.info("Sequential extraction passes completed.")
+  async def aannotate_documents(
+      self,
+      documents: Iterable[data.Document],
+      resolver: resolver_lib.AbstractResolver = resolver_lib.Resolver(
+          format_type=data.FormatType.YAML,
+      ),
+      max_char_buffer: int = 200,
+      debug: bool = True,
+      extraction_passes: int = 1,
+      max_concurrency: int = 10,
+      resolve_processes: int = 0,
+      **kwargs,
+  ) -> AsyncIterator[data.AnnotatedDocument]:
+    """Asynchronously annotates a sequence of documents with NLP extractions.
+
+    Every chunk (and every extraction pass of a chunk) is sent as its own
+    request through LanguageModel.ainfer. At most max_concurrency requests are
+    awaited at once, so many requests can be multiplexed on one event loop
+    without a thread per request. Parsing and aligning the outputs of each
+    chunk is CPU-bound, so it runs off the loop: in a worker thread, one chunk
+    at a time, or with resolve_processes > 0 in a process pool, several chunks
+    in parallel. Documents are yielded in input order as soon as all of their
+    chunks have been resolved.
+
+    Args:
+      documents: Documents to annotate. Each document is expected to have a
+        unique document_id.
+      resolver: Resolver to use for extracting information from text.
+      max_char_buffer: Max number of characters that we can run inference on.
+        The text will be broken into chunks up to this length.
+      debug: Whether to populate debug fields.
+      extraction_passes: Number of extraction passes. Passes of a chunk are
+        requested concurrently and merged per chunk, earlier passes winning on
+        overlaps.
+      max_concurrency: Maximum number of concurrent inference requests.
+      resolve_processes: Number of worker processes used to parse and align
+        model outputs. Values > 0 resolve several chunks in parallel on
+        separate cores; the resolver and resolver kwargs must then be
+        picklable. Defaults to 0 (resolve in a worker thread).
+      **kwargs: Additional arguments passed to LanguageModel.ainfer and
+        Resolver.
+
+    Yields:
+      Resolved annotations from input documents.
+
+    Raises:
+      InferenceOutputError: If there are no scored outputs for a chunk.
+    """
+    self._language_model.begin_run()
+    doc_iter, doc_iter_for_chunks = itertools.tee(documents, 2)
+    curr_document = next(doc_iter, None)
+    if curr_document is None:
+      logging.warning("No documents to process.")
+      return
+
+    chunk_iter = _document_chunk_iterator(doc_iter_for_chunks, max_char_buffer)
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def infer_pass(prompt: str) -> Sequence[core_types.ScoredOutput]:
+      async with semaphore:
+        batch_scored_outputs = await self._language_model.ainfer(
+            [prompt], **kwargs
+        )
+      return batch_scored_outputs[0]
+
+    executor = (
+        _new_resolve_executor(resolver, resolve_processes)
+        if resolve_processes > 0
+        else None
+    )
+    resolver_kwargs = _resolver_kwargs(resolver, kwargs) if executor else {}
+    # Resolvers are not required to be thread-safe.
+    resolve_lock = asyncio.Lock()
+
+    async def resolve_chunk(
+        text_chunk: chunking.TextChunk,
+        pass_outputs: Sequence[Sequence[core_types.ScoredOutput]],
+    ) -> list[data.Extraction]:
+      if executor is not None:
+        return await asyncio.wrap_future(
+            _submit_chunk_resolution(
+                executor, text_chunk, pass_outputs, debug, resolver_kwargs
+            )
+        )
+      async with resolve_lock:
+        return await asyncio.to_thread(
+            self._resolve_chunk,
+            resolver,
+            text_chunk,
+            pass_outputs,
+            debug,
+            **kwargs,
+        )
+
+    async def infer_chunk(
+        text_chunk: chunking.TextChunk,
+    ) -> list[data.Extraction]:
+      prompt = self._render_batch_prompts([text_chunk])[0]
+      pass_outputs = await asyncio.gather(
+          *(infer_pass(prompt) for _ in range(extraction_passes))
+      )
+      for scored_outputs in pass_outputs:
+        _check_scored_outputs(text_chunk, scored_outputs)
+      return await resolve_chunk(text_chunk, pass_outputs)
+
+    pending: collections.deque[tuple[chunking.TextChunk, asyncio.Future]] = (
+        collections.deque()
+    )
+
+    def schedule_next() -> None:
+      text_chunk = next(chunk_iter, None)
+      if text_chunk is not None:
+        pending.append(
+            (text_chunk, asyncio.ensure_future(infer_chunk(text_chunk)))
+        )
+
+    annotated_extractions: list[data.Extraction] = []
+    try:
+      for _ in range(max(max_concurrency, 1) * _SCHEDULING_WINDOW_FACTOR):
+        schedule_next()
+
+      while pending:
+        text_chunk, task = pending.popleft()
+        chunk_extractions = await task
+        schedule_next()
+
+        while curr_document.document_id != text_chunk.document_id:
+          yield data.AnnotatedDocument(
+              document_id=curr_document.document_id,
+              extractions=annotated_extractions,
+              text=curr_document.text,
+          )
+          annotated_extractions = []
+          curr_document = next(doc_iter, None)
+          assert curr_document is not None, (
+              f"Document should be defined for {text_chunk} per"
+              " _document_chunk_iterator(...) specifications."
+          )
+
+        annotated_extractions.extend(chunk_extractions)
+    finally:
+      for _, task in pending:
+        task.cancel()
+      await asyncio.gather(
+          *(task for _, task in pending), return_exceptions=True
+      )
+      if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    yield data.AnnotatedDocument(
+        document_id=curr_document.document_id,
+        extractions=annotated_extractions,
+        text=curr_document.text,
+    )
+
+  async def aannotate_text(
+      self,
+      text: str,
+      resolver: resolver_lib.AbstractResolver = resolver_lib.Resolver(
+          format_type=data.FormatType.YAML,
+      ),
+      max_char_buffer: int = 200,
+      additional_context: str | None = None,
+      debug: bool = True,
+      extraction_passes: int = 1,
+      max_concurrency: int = 10,
+      resolve_processes: int = 0,
+      **kwargs,
+  ) -> data.AnnotatedDocument:
+    """Asynchronously annotates text with NLP extractions.
+
+    Args:
+      text: Source text to annotate.
+      resolver: Resolver to use for extracting information from text.
+      max_char_buffer: Max number of characters that we can run inference on.
+      additional_context: Additional context to supplement prompt instructions.
+      debug: Whether to populate debug fields.
+      extraction_passes: Number of extraction passes to improve recall.
+      max_concurrency: Maximum number of concurrent inference requests.
+      resolve_processes: Number of worker processes used to parse and align
+        model outputs. Defaults to 0 (resolve in a worker thread).
+      **kwargs: Additional arguments for inference and resolver.
+
+    Returns:
+      Resolved annotations from text for document.
+    """
+    documents = [
+        data.Document(
+            text=text,
+            document_id=None,
+            additional_context=additional_context,
+        )
+    ]
+    annotations = [
+        annotated_doc
+        async for annotated_doc in self.aannotate_documents(
+            documents,
+            resolver,
+            max_char_buffer,
+            debug,
+            extraction_passes,
+            max_concurrency,
+            resolve_processes,
+            **kwargs,
+        )
+    ]
+    assert (
+        len(annotations) == 1
+    ), f"Expected 1 annotation but got {len(annotations)} annotations."
+    return annotations[0]
 
   def annotate_text(
       self,
@@ -472,6 +1356,10 @@ class Annotator:
       additional_context: str | None = None,
       debug: bool = True,
       extraction_passes: int = 1,
+      max_batches_in_flight: int = 1,
+      continuous_batching: bool = False,
+      concurrent_passes: bool = False,
+      resolve_processes: int = 0,
       **kwargs,
   ) -> data.AnnotatedDocument:
     """Annotates text with NLP extractions for text input.
@@ -488,6 +1376,15 @@ class Annotator:
         recall by finding additional entities. Defaults to 1, which performs
         standard single extraction. Values > 1 reprocess tokens multiple times,
         potentially increasing costs.
+      max_batches_in_flight: Maximum number of batches submitted to the
+        language model at once. Values > 1 overlap inference of later batches
+        with resolution of the current one.
+      continuous_batching: If True, keep max_workers single-chunk requests in
+        flight instead of processing fixed batches of batch_length chunks.
+      concurrent_passes: If True, chunk the text once and send all extraction
+        passes of a chunk as concurrent requests, merging them per chunk.
+      resolve_processes: Number of worker processes used to parse and align
+        model outputs. Defaults to 0 (resolve in the calling thread).
       **kwargs: Additional arguments for inference and resolver.
 
     Returns:
@@ -511,6 +1408,10 @@ class Annotator:
             batch_length,
             debug,
             extraction_passes,
+            max_batches_in_flight=max_batches_in_flight,
+            continuous_batching=continuous_batching,
+            concurrent_passes=concurrent_passes,
+            resolve_processes=resolve_processes,
             **kwargs,
         )
     )
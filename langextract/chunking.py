@@ -20,12 +20,14 @@ document into chunks of a required maximum length that we can perform
 inference on.
 """
 
+import bisect
 from collections.abc import Iterable, Iterator, Sequence
 import dataclasses
 import re
 
 from absl import logging
 import more_itertools
+import numpy as np
 
 from langextract.core import data
 from langextract.core import exceptions
@@ -204,7 +206,7 @@ def get_token_interval_text(
   if tokenized_text.text and not return_string:
     raise TokenUtilError(
         "Token util returns an empty string unexpectedly. Number of tokens is"
-        f" tokenized_text: {len(tokenized_text.tokens)}, token_interval is"
+        f" tokenized_text: {tokenized_text.num_tokens}, token_interval is"
         f" {token_interval.start_index} to {token_interval.end_index}, which"
         " should not lead to empty string."
     )
@@ -232,12 +234,10 @@ def get_char_interval(
         f"Start index {token_interval.start_index} must be < end index "
         f"{token_interval.end_index}."
     )
-  start_token = tokenized_text.tokens[token_interval.start_index]
-  # Penultimate token prior to interval.end_index
-  final_token = tokenized_text.tokens[token_interval.end_index - 1]
   return data.CharInterval(
-      start_pos=start_token.char_interval.start_pos,
-      end_pos=final_token.char_interval.end_pos,
+      start_pos=tokenized_text.starts[token_interval.start_index],
+      # Penultimate token prior to interval.end_index
+      end_pos=tokenized_text.ends[token_interval.end_index - 1],
   )
 
 
@@ -278,7 +278,11 @@ def make_batches_of_textchunk(
 
 
 class SentenceIterator:
-  """Iterate through sentences of a tokenized text."""
+  """Iterate through sentences of a tokenized text.
+
+  Sentences are looked up by binary search in the sentence boundaries cached
+  on the tokenized text. Assigning `curr_token_pos` moves the iterator.
+  """
 
   def __init__(
       self,
@@ -295,7 +299,7 @@ class SentenceIterator:
       IndexError: if curr_token_pos is not within the document.
     """
     self.tokenized_text = tokenized_text
-    self.token_len = len(tokenized_text.tokens)
+    self.token_len = tokenized_text.num_tokens
     if curr_token_pos < 0:
       raise IndexError(
           f"Current token position {curr_token_pos} can not be negative."
@@ -322,17 +326,12 @@ class SentenceIterator:
     assert self.curr_token_pos <= self.token_len
     if self.curr_token_pos == self.token_len:
       raise StopIteration
-    # This locates the sentence which contains the current token position.
-    sentence_range = tokenizer.find_sentence_range(
-        self.tokenized_text.text,
-        self.tokenized_text.tokens,
-        self.curr_token_pos,
-    )
-    assert sentence_range
-    # Start the sentence from the current token position.
-    # If we are in the middle of a sentence, we should start from there.
+    # This locates the end of the sentence which contains the current token
+    # position. If we are in the middle of a sentence, we start from there.
+    sentence_ends = self.tokenized_text.sentence_ends
     sentence_range = create_token_interval(
-        self.curr_token_pos, sentence_range.end_index
+        self.curr_token_pos,
+        sentence_ends[bisect.bisect_right(sentence_ends, self.curr_token_pos)],
     )
     self.curr_token_pos = sentence_range.end_index
     return sentence_range
@@ -399,6 +398,11 @@ class ChunkIterator:
     self.max_char_buffer = max_char_buffer
     self.sentence_iter = SentenceIterator(self.tokenized_text)
     self.broken_sentence = False
+    # Indices of the tokens that start a new line, for finding the last line
+    # break inside an overflowing sentence by binary search.
+    self._line_start_tokens = np.flatnonzero(
+        np.frombuffer(text.newline_flags, dtype=np.int8)
+    ).tolist()
 
     # TODO: Refactor redundancy between document and text.
     if document is None:
@@ -409,85 +413,63 @@ class ChunkIterator:
   def __iter__(self) -> Iterator[TextChunk]:
     return self
 
-  def _tokens_exceed_buffer(
-      self, token_interval: tokenizer.TokenInterval
-  ) -> bool:
-    """Check if the token interval exceeds the maximum buffer size.
-
-    Args:
-      token_interval: Token interval to check.
-
-    Returns:
-      True if the token interval exceeds the maximum buffer size.
-    """
-    char_interval = get_char_interval(self.tokenized_text, token_interval)
-    return (
-        char_interval.end_pos - char_interval.start_pos
-    ) > self.max_char_buffer
-
   def __next__(self) -> TextChunk:
     sentence = next(self.sentence_iter)
+    chunk_start = sentence.start_index
+    starts = self.tokenized_text.starts
+    ends = self.tokenized_text.ends
+    # A token interval [chunk_start, end) fits iff ends[end - 1] <= char_limit.
+    char_limit = starts[chunk_start] + self.max_char_buffer
+
     # If the next token is greater than the max_char_buffer, let it be the
     # entire chunk.
-    curr_chunk = create_token_interval(
-        sentence.start_index, sentence.start_index + 1
+    if ends[chunk_start] > char_limit:
+      self.sentence_iter.curr_token_pos = chunk_start + 1
+      self.broken_sentence = chunk_start + 1 < sentence.end_index
+      return self._make_chunk(chunk_start, chunk_start + 1)
+
+    # Find the first token of the sentence that no longer fits.
+    overflow_index = bisect.bisect_right(
+        ends, char_limit, chunk_start + 1, sentence.end_index
     )
-    if self._tokens_exceed_buffer(curr_chunk):
-      self.sentence_iter = SentenceIterator(
-          self.tokenized_text, curr_token_pos=sentence.start_index + 1
-      )
-      self.broken_sentence = curr_chunk.end_index < sentence.end_index
-      return TextChunk(
-          token_interval=curr_chunk,
-          document=self.document,
-      )
-
-    # Append tokens to the chunk up to the max_char_buffer.
-    start_of_new_line = -1
-    for token_index in range(curr_chunk.start_index, sentence.end_index):
-      if self.tokenized_text.tokens[token_index].first_token_after_newline:
-        start_of_new_line = token_index
-      test_chunk = create_token_interval(
-          curr_chunk.start_index, token_index + 1
+    if overflow_index < sentence.end_index:
+      chunk_end = overflow_index
+      # Terminate the chunk at the start of the most recent newline, if that
+      # newline is after the chunk start (prevents empty intervals).
+      line_start_index = (
+          bisect.bisect_right(self._line_start_tokens, overflow_index) - 1
       )
-      if self._tokens_exceed_buffer(test_chunk):
-        # Only break at newline if: 1) newline exists (> 0) and
-        # 2) it's after chunk start (prevents empty intervals)
-        if start_of_new_line > 0 and start_of_new_line > curr_chunk.start_index:
-          # Terminate the curr_chunk at the start of the most recent newline.
-          curr_chunk = create_token_interval(
-              curr_chunk.start_index, start_of_new_line
-          )
-        self.sentence_iter = SentenceIterator(
-            self.tokenized_text, curr_token_pos=curr_chunk.end_index
-        )
-        self.broken_sentence = True
-        return TextChunk(
-            token_interval=curr_chunk,
-            document=self.document,
-        )
-      else:
-        curr_chunk = test_chunk
-
+      if line_start_index >= 0:
+        line_start = self._line_start_tokens[line_start_index]
+        if line_start > chunk_start:
+          chunk_end = line_start
+      self.sentence_iter.curr_token_pos = chunk_end
+      self.broken_sentence = True
+      return self._make_chunk(chunk_start, chunk_end)
+
+    chunk_end = sentence.end_index
     if self.broken_sentence:
       self.broken_sentence = False
     else:
-      for sentence in self.sentence_iter:
-        test_chunk = create_token_interval(
-            curr_chunk.start_index, sentence.end_index
-        )
-        if self._tokens_exceed_buffer(test_chunk):
-          self.sentence_iter = SentenceIterator(
-              self.tokenized_text, curr_token_pos=curr_chunk.end_index
-          )
-          return TextChunk(
-              token_interval=curr_chunk,
-              document=self.document,
+      # Extend the chunk with the following whole sentences that still fit.
+      sentence_ends = self.tokenized_text.sentence_ends
+      first_end = bisect.bisect_left(sentence_ends, chunk_end)
+      last_fitting = (
+          bisect.bisect_right(
+              sentence_ends,
+              char_limit,
+              first_end,
+              key=lambda end: ends[end - 1],
           )
-        else:
-          curr_chunk = test_chunk
+          - 1
+      )
+      chunk_end = sentence_ends[last_fitting]
+      self.sentence_iter.curr_token_pos = chunk_end
+
+    return self._make_chunk(chunk_start, chunk_end)
 
+  def _make_chunk(self, start_index: int, end_index: int) -> TextChunk:
     return TextChunk(
-        token_interval=curr_chunk,
+        token_interval=create_token_interval(start_index, end_index),
         document=self.document,
     )
@@ -16,6 +16,7 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 from collections.abc import Iterator, Sequence
 import json
 from typing import Any, Mapping
@@ -45,6 +46,7 @@ class BaseLanguageModel(abc.ABC):
     self._constraint = constraint or types.Constraint()
     self._schema: Any = None  # BaseSchema instance
     self._fence_output_override: bool | None = None
+    self._prompt_prefix: str | None = None
     self._extra_kwargs: dict[str, Any] = kwargs.copy()
 
   @classmethod
@@ -73,6 +75,43 @@ class BaseLanguageModel(abc.ABC):
       self._fence_output_override = None
     self._fence_output_override = fence_output
 
+  def set_prompt_prefix(self, prefix: str | None) -> None:
+    """Declares a static prefix shared by the prompts of upcoming requests.
+
+    Callers such as the Annotator build every prompt as this prefix followed
+    by a per-request suffix. Providers with native prefix caching can register
+    the prefix once and send only the suffix of each prompt; other providers
+    keep sending full prompts.
+
+    Args:
+      prefix: The shared prompt prefix, or None to clear it.
+    """
+    self._prompt_prefix = prefix
+
+  def begin_run(self) -> None:
+    """Declares the start of a run over a set of documents.
+
+    Callers such as the Annotator call this before sending the requests of
+    each run. Providers that keep per-run state, such as a response cache
+    numbering repeated prompts, reset it here. The default does nothing.
+    """
+
+  def _split_prompt_prefix(self, prompt: str) -> tuple[str | None, str]:
+    """Splits a prompt into the declared prefix and the remaining suffix.
+
+    Args:
+      prompt: A full prompt.
+
+    Returns:
+      Tuple of (prefix, suffix). The prefix is None, and the suffix is the
+      whole prompt, if no prefix is declared or the prompt does not start
+      with it.
+    """
+    prefix = getattr(self, '_prompt_prefix', None)
+    if prefix and prompt.startswith(prefix):
+      return prefix, prompt[len(prefix) :].lstrip('\n')
+    return None, prompt
+
   @property
   def requires_fence_output(self) -> bool:
     """Whether this model requires fence output for parsing.
@@ -122,6 +161,45 @@ class BaseLanguageModel(abc.ABC):
       descending score.
     """
 
+  async def ainfer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[types.ScoredOutput]]:
+    """Asynchronously runs language model inference.
+
+    The default implementation runs infer() in a worker thread so that any
+    provider can be awaited from an event loop. Providers with a native async
+    client should override this method.
+
+    Args:
+      batch_prompts: Batch of inputs for inference.
+      **kwargs: Additional arguments for inference, like temperature and
+        max_decode_steps.
+
+    Returns:
+      List with one Sequence of ScoredOutputs per prompt, in prompt order.
+    """
+    return await asyncio.to_thread(
+        lambda: list(self.infer(batch_prompts, **kwargs))
+    )
+
+  def infer_unordered(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[tuple[int, Sequence[types.ScoredOutput]]]:
+    """Implements language model inference, yielding outputs as they finish.
+
+    For schedulers that can handle outputs out of order. Providers that run
+    prompts concurrently yield each output as soon as it is ready; the
+    default implementation yields the outputs of infer() in prompt order.
+
+    Args:
+      batch_prompts: Batch of inputs for inference.
+      **kwargs: Additional arguments for inference.
+
+    Yields:
+      Tuples of (index of the prompt in batch_prompts, its scored outputs).
+    """
+    yield from enumerate(self.infer(batch_prompts, **kwargs))
+
   def infer_batch(
       self, prompts: Sequence[str], batch_size: int = 32  # pylint: disable=unused-argument
   ) -> list[list[types.ScoredOutput]]:
@@ -141,6 +219,32 @@ class BaseLanguageModel(abc.ABC):
       results.append(list(output))
     return results
 
+  def close(self) -> None:
+    """Releases resources held by the model, such as worker threads.
+
+    The default implementation holds nothing. Models stay usable after
+    close() and reacquire resources on their next request.
+    """
+
+  async def aclose(self) -> None:
+    """Releases resources, including those bound to the running event loop.
+
+    The default implementation calls close().
+    """
+    self.close()
+
+  def __enter__(self) -> BaseLanguageModel:
+    return self
+
+  def __exit__(self, *exc_info: Any) -> None:
+    self.close()
+
+  async def __aenter__(self) -> BaseLanguageModel:
+    return self
+
+  async def __aexit__(self, *exc_info: Any) -> None:
+    await self.aclose()
+
   def parse_output(self, output: str) -> Any:
     """Parses model output as JSON or YAML.
 
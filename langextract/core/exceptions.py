@@ -20,11 +20,18 @@ foundational error types that are used throughout the codebase.
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+  from langextract.core import types as core_types
+
 __all__ = [
     "LangExtractError",
     "InferenceError",
     "InferenceConfigError",
     "InferenceRuntimeError",
+    "BatchInferenceError",
     "InferenceOutputError",
     "ProviderError",
     "SchemaError",
@@ -78,6 +85,38 @@ class InferenceRuntimeError(InferenceError):
     self.provider = provider
 
 
+class BatchInferenceError(InferenceRuntimeError):
+  """Exception raised when a prompt of a batch fails after its retries.
+
+  Results of other prompts in the batch that completed but were not yielded
+  are kept in `results`, so that callers can store them instead of paying
+  for them again.
+  """
+
+  def __init__(
+      self,
+      message: str,
+      *,
+      original: BaseException | None = None,
+      provider: str | None = None,
+      index: int | None = None,
+      results: dict[int, Sequence[core_types.ScoredOutput]] | None = None,
+  ) -> None:
+    """Initialize the batch error.
+
+    Args:
+      message: Error message.
+      original: Error of the last attempt of the failed prompt.
+      provider: Name of the provider that raised the error.
+      index: Index of the failed prompt in the batch.
+      results: Outputs of other prompts of the batch that were not yielded,
+        by prompt index.
+    """
+    super().__init__(message, original=original, provider=provider)
+    self.index = index
+    self.results = results or {}
+
+
 class InferenceOutputError(LangExtractError):
   """Exception raised when no scored outputs are available from the language model."""
 
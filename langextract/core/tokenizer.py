@@ -23,12 +23,17 @@ with newer larger context LLMs. This module is not used within the language
 model to represent tokens during inference.
 """
 
-from collections.abc import Sequence, Set
+import array
+import bisect
+from collections.abc import Iterable, Sequence, Set
 import dataclasses
 import enum
 import re
+import warnings
+import weakref
+
+import numpy as np
 
-from langextract import debug_utils
 from langextract.core import exceptions
 
 
@@ -118,30 +123,303 @@ class Token:
   first_token_after_newline: bool = False
 
 
-@dataclasses.dataclass
+class _ReadOnlyTokenList(list):
+  """List of Token objects that raises on in-place modification.
+
+  The tokens are a view of the columns of a TokenizedText, which an in-place
+  change would leave stale. Assign a new list to TokenizedText.tokens
+  instead.
+  """
+
+  def __init__(
+      self,
+      tokens: Iterable[Token] = (),
+      tokenized_text: "TokenizedText | None" = None,
+  ):
+    super().__init__(tokens)
+    self._tokenized_text = (
+        weakref.ref(tokenized_text) if tokenized_text is not None else None
+    )
+
+  @property
+  def tokenized_text(self) -> "TokenizedText | None":
+    """The TokenizedText whose current tokens these are, if any."""
+    tokenized_text = self._tokenized_text() if self._tokenized_text else None
+    # pylint: disable-next=protected-access
+    if tokenized_text is None or tokenized_text._tokens is not self:
+      return None
+    return tokenized_text
+
+  def _read_only(self, *args, **kwargs):
+    del args, kwargs
+    raise TypeError(
+        "TokenizedText.tokens is read-only; assign a new list of tokens to"
+        " TokenizedText.tokens instead."
+    )
+
+  __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+  append = extend = insert = pop = remove = clear = _read_only
+  sort = reverse = _read_only
+
+  def __reduce__(self):
+    # Copies and unpickled lists are detached from the columns, so they are
+    # plain lists that may be modified.
+    return (list, (list(self),))
+
+
+@dataclasses.dataclass(init=False, repr=False, eq=False)
 class TokenizedText:
   """Holds the result of tokenizing a text string.
 
+  Token data is stored column-wise in parallel arrays rather than as one
+  Token object per token, which keeps large documents compact. The `tokens`
+  list is built from the arrays on first access for backward compatibility;
+  chunking and alignment read the arrays directly. The list is read-only:
+  assign a new list to `tokens` to replace the tokens. Sentence boundaries are
+  computed on first use and cached.
+
+  The dataclass fields remain `text` and `tokens`, so `dataclasses.replace`,
+  `asdict` and `fields` see the same fields as before the columnar layout.
+
   Attributes:
     text: The original text that was tokenized.
-    tokens: A list of Token objects extracted from the text.
+    starts: Start character position (inclusive) of each token.
+    ends: End character position (exclusive) of each token.
+    token_types: TokenType value of each token.
+    newline_flags: 1 for each token that is the first token after a newline,
+      0 otherwise.
   """
 
   text: str
-  tokens: list[Token] = dataclasses.field(default_factory=list)
+  # The tokens field is the `tokens` property defined below.
+  tokens: list[Token]
+
+  def __init__(self, text: str, tokens: Iterable[Token] | None = None):
+    """Initializes the tokenized text.
+
+    Args:
+      text: The original text.
+      tokens: Optional Token objects extracted from the text.
+    """
+    self.text = text
+    self.tokens = tokens or []
+
+  @classmethod
+  def from_arrays(
+      cls,
+      text: str,
+      starts: array.array | memoryview,
+      ends: array.array | memoryview,
+      token_types: array.array | memoryview,
+      newline_flags: array.array | memoryview,
+  ) -> "TokenizedText":
+    """Creates a tokenized text from per-token column arrays.
+
+    Args:
+      text: The original text.
+      starts: Start character position of each token (typecode "q").
+      ends: End character position of each token (typecode "q").
+      token_types: TokenType value of each token (typecode "b").
+      newline_flags: First-token-after-newline flag of each token (typecode
+        "b"). Columns may also be memoryviews over such arrays.
+
+    Returns:
+      A TokenizedText backed by the given arrays.
+    """
+    tokenized = cls.__new__(cls)
+    tokenized.text = text
+    tokenized.starts = starts
+    tokenized.ends = ends
+    tokenized.token_types = token_types
+    tokenized.newline_flags = newline_flags
+    tokenized._tokens = None  # pylint: disable=protected-access
+    tokenized._sentence_ends = None  # pylint: disable=protected-access
+    return tokenized
+
+  def slice(self, token_interval: TokenInterval) -> "TokenizedText":
+    """Returns a view of a range of tokens without copying.
+
+    The view shares the text and the column buffers of this tokenized text,
+    so its character positions remain relative to the full text.
+
+    Args:
+      token_interval: The range of tokens to view.
+
+    Returns:
+      A TokenizedText over the tokens in the interval.
+    """
+    start, end = token_interval.start_index, token_interval.end_index
+    return TokenizedText.from_arrays(
+        self.text,
+        memoryview(self.starts)[start:end],
+        memoryview(self.ends)[start:end],
+        memoryview(self.token_types)[start:end],
+        memoryview(self.newline_flags)[start:end],
+    )
+
+  def compact(self) -> "TokenizedText":
+    """Returns a self-contained copy covering only the tokenized span.
+
+    The copy holds the text from the first token's start to the last token's
+    end, with positions relative to it, so it is cheap to pickle even when
+    this is a slice of a large document.
+
+    Returns:
+      A TokenizedText backed by its own arrays.
+    """
+    if not self.num_tokens:
+      return TokenizedText.from_arrays(
+          "",
+          array.array("q"),
+          array.array("q"),
+          array.array("b"),
+          array.array("b"),
+      )
+    base = self.starts[0]
+    return TokenizedText.from_arrays(
+        self.text[base : self.ends[-1]],
+        array.array("q", (start - base for start in self.starts)),
+        array.array("q", (end - base for end in self.ends)),
+        array.array("b", self.token_types),
+        array.array("b", self.newline_flags),
+    )
+
+  def __reduce__(self):
+    # Slices hold memoryviews, which cannot be pickled.
+    return (
+        TokenizedText.from_arrays,
+        (
+            self.text,
+            *(
+                column
+                if isinstance(column, array.array)
+                else array.array(column.format, column.tobytes())
+                for column in (
+                    self.starts,
+                    self.ends,
+                    self.token_types,
+                    self.newline_flags,
+                )
+            ),
+        ),
+    )
+
+  @property
+  def num_tokens(self) -> int:
+    """Number of tokens in the text."""
+    return len(self.starts)
+
+  @property
+  def tokens(self) -> list[Token]:
+    """Read-only list of Token objects, built from the arrays on first use."""
+    if self._tokens is None:
+      self._tokens = _ReadOnlyTokenList(
+          (
+              Token(
+                  index=index,
+                  token_type=TokenType(token_type),
+                  char_interval=CharInterval(start_pos=start, end_pos=end),
+                  first_token_after_newline=bool(after_newline),
+              )
+              for index, (start, end, token_type, after_newline) in enumerate(
+                  zip(
+                      self.starts,
+                      self.ends,
+                      self.token_types,
+                      self.newline_flags,
+                  )
+              )
+          ),
+          self,
+      )
+    return self._tokens
+
+  @property
+  def sentence_ends(self) -> array.array:
+    """End token index (exclusive) of every sentence, in increasing order.
+
+    Computed in one pass on first access. The last entry is always
+    num_tokens, so the sentence containing token i ends at the first entry
+    greater than i.
+    """
+    if self._sentence_ends is None:
+      self._sentence_ends = _find_sentence_ends(self)
+    return self._sentence_ends
+
+  @tokens.setter
+  def tokens(self, tokens: Iterable[Token]) -> None:
+    self._sentence_ends = None
+    self._tokens = _ReadOnlyTokenList(tokens, self)
+    self.starts = array.array(
+        "q", (token.char_interval.start_pos for token in self._tokens)
+    )
+    self.ends = array.array(
+        "q", (token.char_interval.end_pos for token in self._tokens)
+    )
+    self.token_types = array.array(
+        "b", (token.token_type for token in self._tokens)
+    )
+    self.newline_flags = array.array(
+        "b", (token.first_token_after_newline for token in self._tokens)
+    )
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, TokenizedText):
+      return NotImplemented
+    return (
+        self.text == other.text
+        and self.starts == other.starts
+        and self.ends == other.ends
+        and self.token_types == other.token_types
+        and self.newline_flags == other.newline_flags
+    )
+
+  def __repr__(self) -> str:
+    return f"TokenizedText(text={self.text!r}, num_tokens={self.num_tokens})"
 
 
 # Regex patterns for tokenization.
 _LETTERS_PATTERN = r"[A-Za-z]+"
 _DIGITS_PATTERN = r"[0-9]+"
-_SYMBOLS_PATTERN = r"[^A-Za-z0-9\s]+"
-_END_OF_SENTENCE_PATTERN = re.compile(r"[.?!]$")
+# Han ideographs, Hiragana and Katakana are written without spaces between
+# words, so each character becomes its own WORD token. Hangul is space
+# delimited and tokenized as runs of syllables.
+_CJK_CHARACTER_RANGES = (
+    r"\u3040-\u30ff\u31f0-\u31ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+    r"\uff66-\uff9f\U00020000-\U0002fa1f"
+)
+_HANGUL_RANGES = r"\u1100-\u11ff\u3130-\u318f\uac00-\ud7af"
+_CJK_CHARACTER_PATTERN = rf"[{_CJK_CHARACTER_RANGES}]"
+_HANGUL_PATTERN = rf"[{_HANGUL_RANGES}]+"
+_SYMBOL_CHARACTERS = rf"^A-Za-z0-9\s{_CJK_CHARACTER_RANGES}{_HANGUL_RANGES}"
+_SYMBOLS_PATTERN = rf"[{_SYMBOL_CHARACTERS}]+"
+_FULL_WIDTH_TERMINATORS = "。．｡！？"
+_CLOSING_QUOTES = "」』）〕】〉》”’"
+_OPENING_QUOTES = "「『（〔【〈《“‘"
+# A symbol run is split after full-width terminators and their closing quotes
+# or brackets when an opening quote follows, as in 。“, so that the quote
+# starts the token after the end of the sentence.
+_FULL_WIDTH_END_PATTERN = (
+    rf"[{_SYMBOL_CHARACTERS}]*?[{_FULL_WIDTH_TERMINATORS}]+[{_CLOSING_QUOTES}]*"
+    rf"(?=[{_OPENING_QUOTES}])"
+)
+_END_OF_SENTENCE_PATTERN = re.compile(
+    rf"(?:[.?!]|[{_FULL_WIDTH_TERMINATORS}][{_CLOSING_QUOTES}]*)$"
+)
 _SLASH_ABBREV_PATTERN = r"[A-Za-z0-9]+(?:/[A-Za-z0-9]+)+"
 
+# Each alternative is a named group so that a single match both finds and
+# classifies a token (via Match.lastgroup). Alternatives are tried in order.
 _TOKEN_PATTERN = re.compile(
-    rf"{_SLASH_ABBREV_PATTERN}|{_LETTERS_PATTERN}|{_DIGITS_PATTERN}|{_SYMBOLS_PATTERN}"
+    rf"(?P<ACRONYM>{_SLASH_ABBREV_PATTERN})"
+    rf"|(?P<WORD>{_LETTERS_PATTERN}|{_HANGUL_PATTERN}|{_CJK_CHARACTER_PATTERN})"
+    rf"|(?P<NUMBER>{_DIGITS_PATTERN})"
+    rf"|(?P<PUNCTUATION>{_FULL_WIDTH_END_PATTERN}|{_SYMBOLS_PATTERN})"
 )
-_WORD_PATTERN = re.compile(rf"(?:{_LETTERS_PATTERN}|{_DIGITS_PATTERN})\Z")
+_NEWLINE_PATTERN = re.compile(r"[\n\r]")
+_TOKEN_TYPE_VALUES = {
+    token_type.name: token_type.value for token_type in TokenType
+}
 
 # Known abbreviations that should not count as sentence enders.
 # TODO: This can potentially be removed given most use cases
@@ -149,10 +427,10 @@ _WORD_PATTERN = re.compile(rf"(?:{_LETTERS_PATTERN}|{_DIGITS_PATTERN})\Z")
 _KNOWN_ABBREVIATIONS = frozenset({"Mr.", "Mrs.", "Ms.", "Dr.", "Prof.", "St."})
 
 
-@debug_utils.debug_log_calls
 def tokenize(text: str) -> TokenizedText:
   """Splits text into tokens (words, digits, or punctuation).
 
+  CJK ideographs and kana are emitted as one WORD token per character.
   Each token is annotated with its character position and type (WORD or
   PUNCTUATION). If there is a newline or carriage return in the gap before
   a token, that token's `first_token_after_newline` is set to True.
@@ -163,35 +441,36 @@ def tokenize(text: str) -> TokenizedText:
   Returns:
     A TokenizedText object containing all extracted tokens.
   """
-  tokenized = TokenizedText(text=text)
-  previous_end = 0
-  for token_index, match in enumerate(_TOKEN_PATTERN.finditer(text)):
+  starts = array.array("q")
+  ends = array.array("q")
+  token_types = array.array("b")
+  append_start = starts.append
+  append_end = ends.append
+  append_type = token_types.append
+  type_values = _TOKEN_TYPE_VALUES
+  for match in _TOKEN_PATTERN.finditer(text):
     start_pos, end_pos = match.span()
-    matched_text = match.group()
-    # Create a new token.
-    token = Token(
-        index=token_index,
-        char_interval=CharInterval(start_pos=start_pos, end_pos=end_pos),
-        token_type=TokenType.WORD,
-        first_token_after_newline=False,
+    append_start(start_pos)
+    append_end(end_pos)
+    append_type(type_values[match.lastgroup])
+
+  # Tokens never contain whitespace, so every newline lies in the gap before
+  # some token: the first token starting after a newline position is the
+  # first token after that newline. The first token is never flagged.
+  newline_flags = array.array("b", bytes(len(starts)))
+  if starts:
+    newline_positions = np.fromiter(
+        (match.start() for match in _NEWLINE_PATTERN.finditer(text)),
+        dtype=np.int64,
+    )
+    following = np.searchsorted(
+        np.frombuffer(starts, dtype=np.int64), newline_positions, side="right"
     )
-    # Check if there's a newline in the gap before this token.
-    if token_index > 0:
-      gap = text[previous_end:start_pos]
-      if "\n" in gap or "\r" in gap:
-        token.first_token_after_newline = True
-    # Classify token type.
-    if re.fullmatch(_DIGITS_PATTERN, matched_text):
-      token.token_type = TokenType.NUMBER
-    elif re.fullmatch(_SLASH_ABBREV_PATTERN, matched_text):
-      token.token_type = TokenType.ACRONYM
-    elif _WORD_PATTERN.fullmatch(matched_text):
-      token.token_type = TokenType.WORD
-    else:
-      token.token_type = TokenType.PUNCTUATION
-    tokenized.tokens.append(token)
-    previous_end = end_pos
-  return tokenized
+    following = following[(following > 0) & (following < len(starts))]
+    np.frombuffer(newline_flags, dtype=np.int8)[following] = 1
+  return TokenizedText.from_arrays(
+      text, starts, ends, token_types, newline_flags
+  )
 
 
 def tokens_text(
@@ -214,26 +493,25 @@ def tokens_text(
   """
   if (
       token_interval.start_index < 0
-      or token_interval.end_index > len(tokenized_text.tokens)
+      or token_interval.end_index > tokenized_text.num_tokens
       or token_interval.start_index >= token_interval.end_index
   ):
 
     raise InvalidTokenIntervalError(
         f"Invalid token interval. start_index={token_interval.start_index}, "
         f"end_index={token_interval.end_index}, "
-        f"total_tokens={len(tokenized_text.tokens)}."
+        f"total_tokens={tokenized_text.num_tokens}."
     )
 
-  start_token = tokenized_text.tokens[token_interval.start_index]
-  end_token = tokenized_text.tokens[token_interval.end_index - 1]
   return tokenized_text.text[
-      start_token.char_interval.start_pos : end_token.char_interval.end_pos
+      tokenized_text.starts[token_interval.start_index] : tokenized_text.ends[
+          token_interval.end_index - 1
+      ]
   ]
 
 
 def _is_end_of_sentence_token(
-    text: str,
-    tokens: Sequence[Token],
+    tokenized_text: TokenizedText,
     current_idx: int,
     known_abbreviations: Set[str] = _KNOWN_ABBREVIATIONS,
 ) -> bool:
@@ -243,8 +521,7 @@ def _is_end_of_sentence_token(
   abbreviation. Only searches the text corresponding to the current token.
 
   Args:
-    text: The entire input text.
-    tokens: The sequence of Token objects.
+    tokenized_text: The tokenized input text.
     current_idx: The current token index to check.
     known_abbreviations: Abbreviations that should not count as sentence enders
       (e.g., "Dr.").
@@ -252,18 +529,13 @@ def _is_end_of_sentence_token(
   Returns:
     True if the token at `current_idx` ends a sentence, otherwise False.
   """
-  current_token_text = text[
-      tokens[current_idx]
-      .char_interval.start_pos : tokens[current_idx]
-      .char_interval.end_pos
-  ]
+  text = tokenized_text.text
+  starts = tokenized_text.starts
+  ends = tokenized_text.ends
+  current_token_text = text[starts[current_idx] : ends[current_idx]]
   if _END_OF_SENTENCE_PATTERN.search(current_token_text):
     if current_idx > 0:
-      prev_token_text = text[
-          tokens[current_idx - 1]
-          .char_interval.start_pos : tokens[current_idx - 1]
-          .char_interval.end_pos
-      ]
+      prev_token_text = text[starts[current_idx - 1] : ends[current_idx - 1]]
       if f"{prev_token_text}{current_token_text}" in known_abbreviations:
         return False
     return True
@@ -271,8 +543,7 @@ def _is_end_of_sentence_token(
 
 
 def _is_sentence_break_after_newline(
-    text: str,
-    tokens: Sequence[Token],
+    tokenized_text: TokenizedText,
     current_idx: int,
 ) -> bool:
   """Checks if there's a newline before the next token and if that next token starts uppercase.
@@ -283,42 +554,70 @@ def _is_sentence_break_after_newline(
   with a capital letter.
 
   Args:
-    text: The entire input text.
-    tokens: The sequence of Token objects.
+    tokenized_text: The tokenized input text.
     current_idx: The current token index.
 
   Returns:
     True if a newline is found between current_idx and current_idx+1, and
     the next token (if any) begins with an uppercase character.
   """
-  if current_idx + 1 >= len(tokens):
+  if current_idx + 1 >= tokenized_text.num_tokens:
     return False
 
-  gap_text = text[
-      tokens[current_idx]
-      .char_interval.end_pos : tokens[current_idx + 1]
-      .char_interval.start_pos
-  ]
+  text = tokenized_text.text
+  next_start = tokenized_text.starts[current_idx + 1]
+  gap_text = text[tokenized_text.ends[current_idx] : next_start]
   if "\n" not in gap_text:
     return False
 
-  next_token_text = text[
-      tokens[current_idx + 1]
-      .char_interval.start_pos : tokens[current_idx + 1]
-      .char_interval.end_pos
-  ]
+  next_token_text = text[next_start : tokenized_text.ends[current_idx + 1]]
   return bool(next_token_text) and next_token_text[0].isupper()
 
 
+def _find_sentence_ends(tokenized_text: TokenizedText) -> array.array:
+  """Finds the end of every sentence in a single pass over the tokens.
+
+  Whether a token ends a sentence does not depend on where the sentence
+  started, so the boundaries can be computed once for the whole text. Only
+  punctuation tokens and tokens before a line break are candidates.
+
+  Args:
+    tokenized_text: The tokenized text.
+
+  Returns:
+    Sorted exclusive sentence end indices, ending with num_tokens.
+  """
+  num_tokens = tokenized_text.num_tokens
+  sentence_ends = array.array("q")
+  if num_tokens:
+    types_view = np.frombuffer(tokenized_text.token_types, dtype=np.int8)
+    flags_view = np.frombuffer(tokenized_text.newline_flags, dtype=np.int8)
+    candidates = np.union1d(
+        np.flatnonzero(types_view == TokenType.PUNCTUATION),
+        np.flatnonzero(flags_view) - 1,
+    )
+    token_types = tokenized_text.token_types
+    for i in candidates.tolist():
+      if (
+          token_types[i] == TokenType.PUNCTUATION
+          and _is_end_of_sentence_token(tokenized_text, i, _KNOWN_ABBREVIATIONS)
+      ) or _is_sentence_break_after_newline(tokenized_text, i):
+        sentence_ends.append(i + 1)
+  if not sentence_ends or sentence_ends[-1] != num_tokens:
+    sentence_ends.append(num_tokens)
+  return sentence_ends
+
+
 def find_sentence_range(
     text: str,
-    tokens: Sequence[Token],
+    tokens: Sequence[Token] | TokenizedText,
     start_token_index: int,
 ) -> TokenInterval:
   """Finds a 'sentence' interval from a given start index.
 
   Sentence boundaries are defined by:
-    - punctuation tokens in _END_OF_SENTENCE_PATTERN
+    - punctuation tokens in _END_OF_SENTENCE_PATTERN, including the full-width
+      terminators 。！？
     - newline breaks followed by an uppercase letter
     - not abbreviations in _KNOWN_ABBREVIATIONS (e.g., "Dr.")
 
@@ -328,7 +627,10 @@ def find_sentence_range(
 
   Args:
     text: The original text.
-    tokens: The tokens that make up `text`.
+    tokens: The TokenizedText of `text`, or its `tokens` list. Any other
+      sequence of Token objects is deprecated: it is converted to a
+      TokenizedText on every call, which makes iterating over the sentences
+      quadratic.
     start_token_index: The token index from which to begin the sentence.
 
   Returns:
@@ -339,19 +641,34 @@ def find_sentence_range(
   Raises:
     SentenceRangeError: If `start_token_index` is out of range.
   """
-  if start_token_index < 0 or start_token_index >= len(tokens):
+  if isinstance(tokens, TokenizedText):
+    tokenized_text = tokens
+  elif (
+      isinstance(tokens, _ReadOnlyTokenList)
+      and tokens.tokenized_text is not None
+      and tokens.tokenized_text.text == text
+  ):
+    tokenized_text = tokens.tokenized_text
+  else:
+    warnings.warn(
+        "Passing a sequence of Token objects to find_sentence_range is"
+        " deprecated and will be removed in v2.0.0. Pass the TokenizedText"
+        " instead.",
+        FutureWarning,
+        stacklevel=2,
+    )
+    tokenized_text = TokenizedText(text=text, tokens=tokens)
+  num_tokens = tokenized_text.num_tokens
+  if start_token_index < 0 or start_token_index >= num_tokens:
     raise SentenceRangeError(
         f"start_token_index={start_token_index} out of range. "
-        f"Total tokens: {len(tokens)}."
+        f"Total tokens: {num_tokens}."
     )
 
-  i = start_token_index
-  while i < len(tokens):
-    if tokens[i].token_type == TokenType.PUNCTUATION:
-      if _is_end_of_sentence_token(text, tokens, i, _KNOWN_ABBREVIATIONS):
-        return TokenInterval(start_index=start_token_index, end_index=i + 1)
-    if _is_sentence_break_after_newline(text, tokens, i):
-      return TokenInterval(start_index=start_token_index, end_index=i + 1)
-    i += 1
-
-  return TokenInterval(start_index=start_token_index, end_index=len(tokens))
+  sentence_ends = tokenized_text.sentence_ends
+  return TokenInterval(
+      start_index=start_token_index,
+      end_index=sentence_ends[
+          bisect.bisect_right(sentence_ends, start_token_index)
+      ],
+  )
@@ -24,6 +24,7 @@ from __future__ import annotations
 from langextract.core import exceptions as core_exceptions
 
 # Backward compat re-exports
+BatchInferenceError = core_exceptions.BatchInferenceError
 InferenceConfigError = core_exceptions.InferenceConfigError
 InferenceError = core_exceptions.InferenceError
 InferenceOutputError = core_exceptions.InferenceOutputError
@@ -37,6 +38,7 @@ __all__ = [
     "InferenceError",
     "InferenceConfigError",
     "InferenceRuntimeError",
+    "BatchInferenceError",
     "InferenceOutputError",
     "ProviderError",
     "SchemaError",
@@ -16,6 +16,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable
 import typing
 from typing import cast
@@ -51,6 +52,10 @@ def extract(
     extraction_passes: int = 1,
     config: typing.Any = None,
     model: typing.Any = None,
+    concurrent_passes: bool = False,
+    pass_window_size: int | None = None,
+    resolve_processes: int = 0,
+    prompt_prefix_caching: bool = False,
 ) -> typing.Any:
   """Extracts structured information from text.
 
@@ -129,6 +134,26 @@ def extract(
         and config are provided, model takes precedence.
       model: Pre-configured language model to use for extraction. Takes
         precedence over all other parameters including config.
+      concurrent_passes: When extraction_passes > 1, chunk the input once and
+        send all passes of a chunk as concurrent requests in the same batch,
+        merging the results per chunk. Wall time then stays close to a single
+        pass given enough provider concurrency (max_workers). Token costs are
+        the same as sequential passes. Defaults to False (passes run one after
+        another over the whole input).
+      pass_window_size: When extraction_passes > 1 without concurrent_passes
+        and the input is an iterable of Documents, run all passes over windows
+        of this many documents and yield each window's results before reading
+        the next one. This bounds memory for large document streams. Defaults
+        to None (the whole input is one window).
+      resolve_processes: Number of worker processes used to parse model
+        outputs and align extractions to the source text. Values > 0 spread
+        this CPU-bound post-processing over several cores, which helps with
+        fast local models. Defaults to 0 (post-process in the calling thread).
+      prompt_prefix_caching: Build every prompt as the static description and
+        examples followed by the chunk, and declare that prefix to the model so
+        providers can cache it natively (Gemini context caching, the Ollama
+        system prompt). Additional context then follows the examples. Defaults
+        to False.
 
   Returns:
       An AnnotatedDocument with the extracted information when input is a
@@ -140,6 +165,211 @@ def extract(
       ValueError: If no API key is provided or found in environment variables.
       requests.RequestException: If URL download fails.
   """
+  annotator, res = _build_annotator_and_resolver(
+      prompt_description=prompt_description,
+      examples=examples,
+      model_id=model_id,
+      api_key=api_key,
+      language_model_type=language_model_type,
+      format_type=format_type,
+      temperature=temperature,
+      fence_output=fence_output,
+      use_schema_constraints=use_schema_constraints,
+      batch_length=batch_length,
+      max_workers=max_workers,
+      resolver_params=resolver_params,
+      language_model_params=language_model_params,
+      debug=debug,
+      model_url=model_url,
+      config=config,
+      model=model,
+      prompt_prefix_caching=prompt_prefix_caching,
+  )
+
+  if isinstance(text_or_documents, str) and io.is_url(text_or_documents):
+    text_or_documents = io.download_text_from_url(text_or_documents)
+
+  if isinstance(text_or_documents, str):
+    return annotator.annotate_text(
+        text=text_or_documents,
+        resolver=res,
+        max_char_buffer=max_char_buffer,
+        batch_length=batch_length,
+        additional_context=additional_context,
+        debug=debug,
+        extraction_passes=extraction_passes,
+        max_workers=max_workers,
+        concurrent_passes=concurrent_passes,
+        resolve_processes=resolve_processes,
+    )
+  else:
+    documents = cast(Iterable[data.Document], text_or_documents)
+    return annotator.annotate_documents(
+        documents=documents,
+        resolver=res,
+        max_char_buffer=max_char_buffer,
+        batch_length=batch_length,
+        debug=debug,
+        extraction_passes=extraction_passes,
+        max_workers=max_workers,
+        concurrent_passes=concurrent_passes,
+        pass_window_size=pass_window_size,
+        resolve_processes=resolve_processes,
+    )
+
+
+async def aextract(
+    text_or_documents: typing.Any,
+    prompt_description: str | None = None,
+    examples: typing.Sequence[typing.Any] | None = None,
+    model_id: str = "gemini-2.5-flash",
+    api_key: str | None = None,
+    format_type: typing.Any = None,
+    max_char_buffer: int = 1000,
+    temperature: float | None = None,
+    fence_output: bool | None = None,
+    use_schema_constraints: bool = True,
+    max_workers: int = 10,
+    additional_context: str | None = None,
+    resolver_params: dict | None = None,
+    language_model_params: dict | None = None,
+    debug: bool = True,
+    model_url: str | None = None,
+    extraction_passes: int = 1,
+    config: typing.Any = None,
+    model: typing.Any = None,
+    resolve_processes: int = 0,
+    prompt_prefix_caching: bool = False,
+) -> typing.Any:
+  """Asynchronously extracts structured information from text.
+
+  Async counterpart of extract(). Each chunk is sent as its own request through
+  the model's ainfer(), with at most max_workers requests in flight, so the
+  extraction can share an event loop with other work. Providers without native
+  async support run their blocking infer() in worker threads.
+
+  Args:
+      text_or_documents: The source text to extract information from, a URL to
+        download text from (starting with http:// or https://), or an iterable
+        of Document objects.
+      prompt_description: Instructions for what to extract from the text.
+      examples: List of ExampleData objects to guide the extraction.
+      model_id: The model ID to use for extraction.
+      api_key: API key for Gemini or other LLM services.
+      format_type: The format type for the output (JSON or YAML).
+      max_char_buffer: Max number of characters for inference.
+      temperature: The sampling temperature for generation.
+      fence_output: Whether to expect/generate fenced output.
+      use_schema_constraints: Whether to generate schema constraints for models.
+      max_workers: Maximum number of concurrent inference requests. Defaults to
+        10.
+      additional_context: Additional context to be added to the prompt during
+        inference.
+      resolver_params: Parameters for the `resolver.Resolver`.
+      language_model_params: Additional parameters for the language model.
+      debug: Whether to enable debug logging.
+      model_url: Endpoint URL for self-hosted or on-prem models.
+      extraction_passes: Number of extraction passes to improve recall. Passes
+        of a chunk are requested concurrently and merged per chunk (first
+        extraction wins for overlaps).
+      config: Model configuration to use for extraction.
+      model: Pre-configured language model to use for extraction.
+      resolve_processes: Number of worker processes used to parse model
+        outputs and align extractions. Defaults to 0 (post-process in a
+        worker thread, off the event loop). See extract().
+      prompt_prefix_caching: Declare the static prompt prefix to the model for
+        provider-side caching. See extract().
+
+  Returns:
+      An AnnotatedDocument with the extracted information when input is a
+      string or URL, or an async iterator of AnnotatedDocuments when input is an
+      iterable of Documents.
+
+  Raises:
+      ValueError: If examples is None or empty.
+      ValueError: If no API key is provided or found in environment variables.
+      requests.RequestException: If URL download fails.
+  """
+  annotator, res = _build_annotator_and_resolver(
+      prompt_description=prompt_description,
+      examples=examples,
+      model_id=model_id,
+      api_key=api_key,
+      language_model_type=None,
+      format_type=format_type,
+      temperature=temperature,
+      fence_output=fence_output,
+      use_schema_constraints=use_schema_constraints,
+      batch_length=max_workers,
+      max_workers=max_workers,
+      resolver_params=resolver_params,
+      language_model_params=language_model_params,
+      debug=debug,
+      model_url=model_url,
+      config=config,
+      model=model,
+      prompt_prefix_caching=prompt_prefix_caching,
+  )
+
+  if isinstance(text_or_documents, str) and io.is_url(text_or_documents):
+    text_or_documents = await asyncio.to_thread(
+        io.download_text_from_url, text_or_documents
+    )
+
+  if isinstance(text_or_documents, str):
+    return await annotator.aannotate_text(
+        text=text_or_documents,
+        resolver=res,
+        max_char_buffer=max_char_buffer,
+        additional_context=additional_context,
+        debug=debug,
+        extraction_passes=extraction_passes,
+        max_concurrency=max_workers,
+        resolve_processes=resolve_processes,
+    )
+  else:
+    documents = cast(Iterable[data.Document], text_or_documents)
+    return annotator.aannotate_documents(
+        documents=documents,
+        resolver=res,
+        max_char_buffer=max_char_buffer,
+        debug=debug,
+        extraction_passes=extraction_passes,
+        max_concurrency=max_workers,
+        resolve_processes=resolve_processes,
+    )
+
+
+def _build_annotator_and_resolver(
+    prompt_description: str | None,
+    examples: typing.Sequence[typing.Any] | None,
+    model_id: str,
+    api_key: str | None,
+    language_model_type: typing.Type[typing.Any] | None,
+    format_type: typing.Any,
+    temperature: float | None,
+    fence_output: bool | None,
+    use_schema_constraints: bool,
+    batch_length: int,
+    max_workers: int,
+    resolver_params: dict | None,
+    language_model_params: dict | None,
+    debug: bool,
+    model_url: str | None,
+    config: typing.Any,
+    model: typing.Any,
+    prompt_prefix_caching: bool,
+) -> tuple[annotation.Annotator, resolver.Resolver]:
+  """Validates extract() arguments and builds the annotator and resolver.
+
+  See extract() for a description of the arguments.
+
+  Returns:
+    The Annotator and Resolver used to run the extraction.
+
+  Raises:
+    ValueError: If examples is None or empty.
+  """
   if not examples:
     raise ValueError(
         "Examples are required for reliable extraction. Please provide at least"
@@ -163,9 +393,6 @@ def extract(
         UserWarning,
     )
 
-  if isinstance(text_or_documents, str) and io.is_url(text_or_documents):
-    text_or_documents = io.download_text_from_url(text_or_documents)
-
   prompt_template = prompting.PromptTemplateStructured(
       description=prompt_description
   )
@@ -182,7 +409,7 @@ def extract(
           "'use_schema_constraints' is ignored when 'model' is provided. "
           "The model should already be configured with schema constraints.",
           UserWarning,
-          stacklevel=2,
+          stacklevel=3,
       )
   elif config:
     if use_schema_constraints:
@@ -190,7 +417,7 @@ def extract(
           "With 'config', schema constraints are still applied via examples. "
           "Or pass explicit schema in config.provider_kwargs.",
           UserWarning,
-          stacklevel=2,
+          stacklevel=3,
       )
 
     language_model = factory.create_model(
@@ -205,7 +432,7 @@ def extract(
           "'language_model_type' is deprecated and will be removed in v2.0.0. "
           "Use model, config, or model_id parameters instead.",
           FutureWarning,
-          stacklevel=2,
+          stacklevel=3,
       )
 
     base_lm_kwargs: dict[str, typing.Any] = {
@@ -223,7 +450,7 @@ def extract(
           "'gemini_schema' is deprecated. Schema constraints are now "
           "automatically handled. This parameter will be ignored.",
           FutureWarning,
-          stacklevel=2,
+          stacklevel=3,
       )
       language_model_params = dict(language_model_params or {})
       language_model_params.pop("gemini_schema", None)
@@ -259,27 +486,6 @@ def extract(
       prompt_template=prompt_template,
       format_type=format_type,
       fence_output=fence_output,
+      prompt_prefix_caching=prompt_prefix_caching,
   )
-
-  if isinstance(text_or_documents, str):
-    return annotator.annotate_text(
-        text=text_or_documents,
-        resolver=res,
-        max_char_buffer=max_char_buffer,
-        batch_length=batch_length,
-        additional_context=additional_context,
-        debug=debug,
-        extraction_passes=extraction_passes,
-        max_workers=max_workers,
-    )
-  else:
-    documents = cast(Iterable[data.Document], text_or_documents)
-    return annotator.annotate_documents(
-        documents=documents,
-        resolver=res,
-        max_char_buffer=max_char_buffer,
-        batch_length=batch_length,
-        debug=debug,
-        extraction_passes=extraction_passes,
-        max_workers=max_workers,
-    )
+  return annotator, res
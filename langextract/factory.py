@@ -28,6 +28,7 @@ import typing
 from langextract import providers
 from langextract.core import base_model
 from langextract.core import exceptions
+from langextract.providers import cached
 from langextract.providers import router
 
 
@@ -40,6 +41,8 @@ class ModelConfig:
     provider: Optional explicit provider name or class name. Use this to
       disambiguate when multiple providers support the same model_id.
     provider_kwargs: Optional provider-specific keyword arguments.
+    cache: Optional persistent response cache. When set, the created model is
+      wrapped in a CachedLanguageModel backed by this cache.
   """
 
   model_id: str | None = None
@@ -47,6 +50,7 @@ class ModelConfig:
   provider_kwargs: dict[str, typing.Any] = dataclasses.field(
       default_factory=dict
   )
+  cache: cached.ResponseCacheConfig | None = None
 
 
 def _kwargs_with_environment_defaults(
@@ -119,6 +123,7 @@ def create_model(
         use_schema_constraints=use_schema_constraints,
         fence_output=fence_output,
     )
+    model = _wrap_with_cache(model, config)
     if return_fence_output:
       return model, model.requires_fence_output
     return model
@@ -152,7 +157,7 @@ def create_model(
     kwargs["model_id"] = model_id
 
   try:
-    model = provider_class(**kwargs)
+    model = _wrap_with_cache(provider_class(**kwargs), config)
     if return_fence_output:
       return model, model.requires_fence_output
     return model
@@ -162,6 +167,15 @@ def create_model(
     ) from e
 
 
+def _wrap_with_cache(
+    model: base_model.BaseLanguageModel, config: ModelConfig
+) -> base_model.BaseLanguageModel:
+  """Wraps the model in a response cache if the config requests one."""
+  if config.cache is None:
+    return model
+  return cached.CachedLanguageModel(model, config.cache)
+
+
 def create_model_from_id(
     model_id: str | None = None,
     provider: str | None = None,
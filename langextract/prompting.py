@@ -92,6 +92,11 @@ class QAPromptGenerator:
   question_prefix: str = "Q: "
   answer_prefix: str = "A: "
   fence_output: bool = True  # whether to wrap answers in ```json/```yaml fences
+  # (settings, examples block) of the last rendered examples; see
+  # _render_examples.
+  _examples_cache: tuple[tuple, str] | None = dataclasses.field(
+      default=None, init=False, repr=False, compare=False
+  )
 
   def __str__(self) -> str:
     """Returns a string representation of the prompt with an empty question."""
@@ -141,6 +146,41 @@ class QAPromptGenerator:
         f"{self.answer_prefix}{answer}\n",
     ])
 
+  def _render_examples(self) -> str:
+    """Returns the examples heading and formatted examples of the prompt.
+
+    Serializing examples is the most expensive part of rendering, and the
+    result is identical for every chunk of a run. The block is reused as long
+    as the template holds the same example objects and the formatting
+    settings are unchanged. Examples are expected not to be mutated in place
+    once rendered.
+
+    Returns:
+      The examples block, or an empty string if the template has no examples.
+    """
+    key = (
+        tuple(self.template.examples),
+        self.format_type,
+        self.attribute_suffix,
+        self.examples_heading,
+        self.question_prefix,
+        self.answer_prefix,
+        self.fence_output,
+    )
+    # Tuple comparison checks identity first, so unchanged examples compare
+    # without walking their contents.
+    if self._examples_cache is not None and self._examples_cache[0] == key:
+      return self._examples_cache[1]
+
+    examples_block = ""
+    if self.template.examples:
+      examples_block = "\n".join(
+          [self.examples_heading]
+          + [self.format_example_as_text(ex) for ex in self.template.examples]
+      )
+    self._examples_cache = (key, examples_block)
+    return examples_block
+
   def render(self, question: str, additional_context: str | None = None) -> str:
     """Generate a text representation of the prompt.
 
@@ -158,10 +198,45 @@ class QAPromptGenerator:
       prompt_lines.append(f"{additional_context}\n")
 
     if self.template.examples:
-      prompt_lines.append(self.examples_heading)
-      for ex in self.template.examples:
-        prompt_lines.append(self.format_example_as_text(ex))
+      prompt_lines.append(self._render_examples())
 
     prompt_lines.append(f"{self.question_prefix}{question}")
     prompt_lines.append(self.answer_prefix)
     return "\n".join(prompt_lines)
+
+  def render_prefix(self) -> str:
+    """Returns the static part of the prompt: description and examples.
+
+    Together with render_suffix this splits a prompt into a prefix that is
+    identical for every question and a per-question suffix, so that providers
+    can cache the prefix. render_prefix() + "\n" + render_suffix(question)
+    equals render(question) when there is no additional context.
+
+    Returns:
+      The prompt prefix shared by all questions.
+    """
+    prompt_lines: list[str] = [f"{self.template.description}\n"]
+    if self.template.examples:
+      prompt_lines.append(self._render_examples())
+    return "\n".join(prompt_lines)
+
+  def render_suffix(
+      self, question: str, additional_context: str | None = None
+  ) -> str:
+    """Returns the per-question part of the prompt following render_prefix.
+
+    Args:
+      question: That will be presented to the model.
+      additional_context: Additional context to include in the prompt. Placed
+        after the examples so that the prefix stays identical across
+        questions. An empty string is ignored.
+
+    Returns:
+      The question part of the prompt.
+    """
+    prompt_lines: list[str] = []
+    if additional_context:
+      prompt_lines.append(f"{additional_context}\n")
+    prompt_lines.append(f"{self.question_prefix}{question}")
+    prompt_lines.append(self.answer_prefix)
+    return "\n".join(prompt_lines)
@@ -33,9 +33,12 @@ from langextract.providers.router import register_lazy
 registry = router  # Backward compat alias
 
 __all__ = [
+    'cached',
+    'concurrency',
     'gemini',
     'openai',
     'ollama',
+    'retry',
     'router',
     'registry',  # Backward compat
     'schemas',
@@ -0,0 +1,517 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent response cache for LangExtract language models.
+
+CachedLanguageModel wraps any BaseLanguageModel and stores its responses in a
+local SQLite database keyed by a hash of the provider class, model ID, prompt
+and generation settings. Re-running a pipeline with unchanged prompts then
+replays the stored responses instead of calling the provider again.
+
+Usage with factory.create_model():
+    from langextract import factory
+    from langextract.providers import cached
+
+    config = factory.ModelConfig(
+        model_id="gemini-2.5-flash",
+        cache=cached.ResponseCacheConfig(
+            path="~/.cache/langextract/responses.sqlite",
+            max_size_bytes=512 * 1024 * 1024,
+        ),
+    )
+    model = factory.create_model(config)
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+import dataclasses
+import enum
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Final
+
+from langextract.core import base_model
+from langextract.core import exceptions
+from langextract.core import types as core_types
+
+# Arguments that change how a request is sent but not what the model returns.
+_NON_GENERATION_KWARGS: Final[frozenset[str]] = frozenset({
+    'api_key',
+    'base_url',
+    'max_workers',
+    'model_url',
+    'organization',
+    'timeout',
+})
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class ResponseCacheConfig:
+  """Configuration of a persistent response cache.
+
+  Attributes:
+    path: Path of the SQLite database file. Created if missing unless
+      read_only is set.
+    max_size_bytes: Maximum total size of stored responses. Least recently
+      used entries are evicted beyond it. None means unbounded.
+    read_only: If True, the cache is only read: misses are sent to the model
+      but their responses are not stored and hits do not update recency.
+      Use this to replay a recorded run without modifying the cache.
+  """
+
+  path: str | os.PathLike[str]
+  max_size_bytes: int | None = None
+  read_only: bool = False
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class CacheStats:
+  """Snapshot of response cache counters.
+
+  Attributes:
+    hits: Number of prompts answered from the cache.
+    misses: Number of prompts sent to the wrapped model.
+    evictions: Number of entries evicted to respect max_size_bytes.
+  """
+
+  hits: int = 0
+  misses: int = 0
+  evictions: int = 0
+
+
+def _json_default(value: Any) -> Any:
+  """Serializes values json does not support, identically across processes.
+
+  Raises:
+    TypeError: If the value has no deterministic serialization, such as an
+      arbitrary object whose repr includes its address.
+  """
+  if isinstance(value, enum.Enum):
+    return value.value
+  if dataclasses.is_dataclass(value) and not isinstance(value, type):
+    return dataclasses.asdict(value)
+  if isinstance(value, (set, frozenset)):
+    return sorted(
+        value,
+        key=lambda item: json.dumps(
+            item, sort_keys=True, default=_json_default
+        ),
+    )
+  if isinstance(value, bytes):
+    return value.hex()
+  if hasattr(value, 'model_dump'):
+    # Pydantic models, such as the config types of provider SDKs.
+    return value.model_dump(mode='json', exclude_none=True)
+  raise TypeError(
+      f'Object of type {type(value).__name__} is not JSON serializable'
+  )
+
+
+class ResponseCache:
+  """SQLite-backed store of model responses with size-based LRU eviction.
+
+  The store is safe to use from multiple threads. Several processes may share
+  one database file; the size limit is then enforced approximately.
+  """
+
+  def __init__(self, config: ResponseCacheConfig):
+    """Opens (and creates if needed) the cache database.
+
+    Args:
+      config: Cache configuration.
+
+    Raises:
+      InferenceConfigError: If read_only is set and the database does not
+        exist, or the database cannot be opened.
+    """
+    self._config = config
+    self._lock = threading.Lock()
+    self._evictions = 0
+    path = os.path.expanduser(os.fspath(config.path))
+    try:
+      if config.read_only:
+        if not os.path.exists(path):
+          raise exceptions.InferenceConfigError(
+              f'Read-only response cache {path!r} does not exist.'
+          )
+        self._conn = sqlite3.connect(
+            f'file:{path}?mode=ro', uri=True, check_same_thread=False
+        )
+      else:
+        if os.path.dirname(path):
+          os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' outputs TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_access REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS responses_last_access'
+            ' ON responses (last_access)'
+        )
+        self._conn.commit()
+      self._total_size = self._conn.execute(
+          'SELECT COALESCE(SUM(size), 0) FROM responses'
+      ).fetchone()[0]
+    except sqlite3.Error as e:
+      raise exceptions.InferenceConfigError(
+          f'Failed to open response cache {path!r}: {e}'
+      ) from e
+
+  @property
+  def evictions(self) -> int:
+    """Number of entries evicted by this instance."""
+    return self._evictions
+
+  def get(self, key: str) -> list[core_types.ScoredOutput] | None:
+    """Returns the stored outputs for a key, or None on a miss."""
+    with self._lock:
+      row = self._conn.execute(
+          'SELECT outputs FROM responses WHERE key = ?', (key,)
+      ).fetchone()
+      if row is None:
+        return None
+      if not self._config.read_only:
+        self._conn.execute(
+            'UPDATE responses SET last_access = ? WHERE key = ?',
+            (time.time(), key),
+        )
+        self._conn.commit()
+    return [
+        core_types.ScoredOutput(score=item['score'], output=item['output'])
+        for item in json.loads(row[0])
+    ]
+
+  def put(self, key: str, outputs: Sequence[core_types.ScoredOutput]) -> None:
+    """Stores outputs for a key and evicts old entries if over the limit."""
+    if self._config.read_only:
+      return
+    value = json.dumps(
+        [{'score': o.score, 'output': o.output} for o in outputs]
+    )
+    size = len(value.encode('utf-8'))
+    with self._lock:
+      previous = self._conn.execute(
+          'SELECT size FROM responses WHERE key = ?', (key,)
+      ).fetchone()
+      self._conn.execute(
+          'INSERT OR REPLACE INTO responses (key, outputs, size, last_access)'
+          ' VALUES (?, ?, ?, ?)',
+          (key, value, size, time.time()),
+      )
+      self._total_size += size - (previous[0] if previous else 0)
+      self._evict_locked()
+      self._conn.commit()
+
+  def close(self) -> None:
+    """Closes the database connection."""
+    with self._lock:
+      self._conn.close()
+
+  def _evict_locked(self) -> None:
+    """Deletes least recently used entries until under max_size_bytes."""
+    max_size = self._config.max_size_bytes
+    if max_size is None or self._total_size <= max_size:
+      return
+    # Other processes may have written to the same file; recount first.
+    self._total_size = self._conn.execute(
+        'SELECT COALESCE(SUM(size), 0) FROM responses'
+    ).fetchone()[0]
+    if self._total_size <= max_size:
+      return
+    evicted = []
+    for key, size in self._conn.execute(
+        'SELECT key, size FROM responses ORDER BY last_access ASC'
+    ):
+      if self._total_size <= max_size:
+        break
+      evicted.append((key,))
+      self._total_size -= size
+    self._conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+    self._evictions += len(evicted)
+
+
+class CachedLanguageModel(base_model.BaseLanguageModel):
+  """Language model wrapper that caches responses on local disk.
+
+  Requests are keyed by a SHA-256 hash of the wrapped provider class, model
+  ID, prompt and generation settings (temperature, format type, schema and
+  generation kwargs). Identical requests repeated within one run, such as the
+  prompts of multiple extraction passes, are cached as separate entries by
+  their occurrence number, so a replayed run returns the same sequence of
+  responses as the recorded run. Occurrences are counted from the last call
+  to begin_run(), which the Annotator makes at the start of every run.
+
+  Attributes other than inference are delegated to the wrapped model.
+  """
+
+  def __init__(
+      self,
+      model: base_model.BaseLanguageModel,
+      cache: ResponseCacheConfig | ResponseCache,
+  ):
+    """Initializes the cached model.
+
+    Args:
+      model: The language model to wrap.
+      cache: Cache configuration, or an open ResponseCache to share between
+        models.
+    """
+    super().__init__()
+    self._model = model
+    self._cache = (
+        cache if isinstance(cache, ResponseCache) else ResponseCache(cache)
+    )
+    self._lock = threading.Lock()
+    self._occurrences: dict[str, int] = {}
+    self._hits = 0
+    self._misses = 0
+
+  def __getattr__(self, name: str) -> Any:
+    # Only called for attributes not found on the wrapper itself.
+    if name == '_model':
+      raise AttributeError(name)
+    return getattr(self._model, name)
+
+  @property
+  def model(self) -> base_model.BaseLanguageModel:
+    """The wrapped language model."""
+    return self._model
+
+  @property
+  def stats(self) -> CacheStats:
+    """Hit, miss and eviction counters of this model's cache."""
+    with self._lock:
+      return CacheStats(
+          hits=self._hits,
+          misses=self._misses,
+          evictions=self._cache.evictions,
+      )
+
+  def apply_schema(self, schema_instance: Any) -> None:
+    self._model.apply_schema(schema_instance)
+
+  def set_fence_output(self, fence_output: bool | None) -> None:
+    self._model.set_fence_output(fence_output)
+
+  def set_prompt_prefix(self, prefix: str | None) -> None:
+    self._model.set_prompt_prefix(prefix)
+
+  def begin_run(self) -> None:
+    """Restarts occurrence numbering so a new run replays the recorded one."""
+    with self._lock:
+      self._occurrences.clear()
+    self._model.begin_run()
+
+  @property
+  def requires_fence_output(self) -> bool:
+    return self._model.requires_fence_output
+
+  def merge_kwargs(
+      self, runtime_kwargs: Mapping[str, Any] | None = None
+  ) -> dict[str, Any]:
+    return self._model.merge_kwargs(runtime_kwargs)
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
+    """Runs inference, answering prompts from the cache where possible.
+
+    Prompts missing from the cache are sent to the wrapped model in a single
+    batch, and their responses are stored once received. If the batch raises
+    a BatchInferenceError, the responses it completed are stored too, so a
+    rerun only sends the prompts that failed.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params forwarded to the wrapped model.
+
+    Yields:
+      Lists of ScoredOutputs, in prompt order.
+    """
+    keys = self._request_keys(batch_prompts, kwargs)
+    cached_outputs = [self._cache.get(key) for key in keys]
+    miss_prompts = [
+        prompt
+        for prompt, outputs in zip(batch_prompts, cached_outputs)
+        if outputs is None
+    ]
+    self._record(hits=len(keys) - len(miss_prompts), misses=len(miss_prompts))
+
+    miss_keys = [
+        key for key, outputs in zip(keys, cached_outputs) if outputs is None
+    ]
+    miss_results = iter(
+        self._model.infer(miss_prompts, **kwargs) if miss_prompts else ()
+    )
+    for key, outputs in zip(keys, cached_outputs):
+      if outputs is None:
+        try:
+          outputs = list(next(miss_results))
+        except exceptions.BatchInferenceError as e:
+          self._store_completed(miss_keys, e)
+          raise
+        self._store(key, outputs)
+      yield outputs
+
+  def infer_unordered(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[tuple[int, Sequence[core_types.ScoredOutput]]]:
+    """Yields cached outputs first, then the wrapped model's as they finish.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params forwarded to the wrapped model.
+
+    Yields:
+      Tuples of (index of the prompt in batch_prompts, list of ScoredOutputs).
+    """
+    keys = self._request_keys(batch_prompts, kwargs)
+    miss_indices = []
+    hits = []
+    for index, key in enumerate(keys):
+      outputs = self._cache.get(key)
+      if outputs is None:
+        miss_indices.append(index)
+      else:
+        hits.append((index, outputs))
+    self._record(hits=len(hits), misses=len(miss_indices))
+
+    yield from hits
+    if not miss_indices:
+      return
+    miss_keys = [keys[i] for i in miss_indices]
+    try:
+      for miss_index, outputs in self._model.infer_unordered(
+          [batch_prompts[i] for i in miss_indices], **kwargs
+      ):
+        outputs = list(outputs)
+        self._store(miss_keys[miss_index], outputs)
+        yield miss_indices[miss_index], outputs
+    except exceptions.BatchInferenceError as e:
+      self._store_completed(miss_keys, e)
+      raise
+
+  async def ainfer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[core_types.ScoredOutput]]:
+    """Asynchronous counterpart of infer() using the wrapped model's ainfer.
+
+    As with infer(), if the batch raises a BatchInferenceError, the responses
+    it completed are stored before the error propagates.
+    """
+    keys = self._request_keys(batch_prompts, kwargs)
+    results = [self._cache.get(key) for key in keys]
+    miss_indices = [i for i, outputs in enumerate(results) if outputs is None]
+    self._record(hits=len(keys) - len(miss_indices), misses=len(miss_indices))
+
+    if miss_indices:
+      try:
+        miss_results = await self._model.ainfer(
+            [batch_prompts[i] for i in miss_indices], **kwargs
+        )
+      except exceptions.BatchInferenceError as e:
+        self._store_completed([keys[i] for i in miss_indices], e)
+        raise
+      for i, outputs in zip(miss_indices, miss_results):
+        results[i] = list(outputs)
+        self._store(keys[i], results[i])
+    return results
+
+  def close(self) -> None:
+    """Closes the underlying cache database and the wrapped model."""
+    self._cache.close()
+    self._model.close()
+
+  async def aclose(self) -> None:
+    """Closes the underlying cache database and the wrapped model."""
+    self._cache.close()
+    await self._model.aclose()
+
+  def _store(
+      self, key: str, outputs: Sequence[core_types.ScoredOutput]
+  ) -> None:
+    """Stores outputs unless the request failed and produced none."""
+    if any(output.output is not None for output in outputs):
+      self._cache.put(key, outputs)
+
+  def _store_completed(
+      self, miss_keys: Sequence[str], error: exceptions.BatchInferenceError
+  ) -> None:
+    """Stores the results a failed batch completed but did not yield."""
+    for index, outputs in error.results.items():
+      self._store(miss_keys[index], list(outputs))
+
+  def _record(self, hits: int, misses: int) -> None:
+    with self._lock:
+      self._hits += hits
+      self._misses += misses
+
+  def _request_keys(
+      self, batch_prompts: Sequence[str], kwargs: Mapping[str, Any]
+  ) -> list[str]:
+    """Returns the cache key of every prompt in the batch."""
+    settings = self._generation_settings(kwargs)
+    keys = []
+    with self._lock:
+      for prompt in batch_prompts:
+        digest = hashlib.sha256(
+            json.dumps([settings, prompt]).encode('utf-8')
+        ).hexdigest()
+        occurrence = self._occurrences.get(digest, 0)
+        self._occurrences[digest] = occurrence + 1
+        keys.append(f'{digest}:{occurrence}')
+    return keys
+
+  def _generation_settings(self, kwargs: Mapping[str, Any]) -> str:
+    """Serializes everything besides the prompt that determines a response."""
+    model = self._model
+    schema = getattr(model, '_schema', None)
+    generation_kwargs = {
+        key: value
+        for key, value in model.merge_kwargs(kwargs).items()
+        if key not in _NON_GENERATION_KWARGS
+    }
+    try:
+      return json.dumps(
+          {
+              'provider': (
+                  f'{type(model).__module__}.{type(model).__qualname__}'
+              ),
+              'model_id': getattr(model, 'model_id', None) or getattr(
+                  model, '_model', None
+              ),
+              'temperature': getattr(model, 'temperature', None),
+              'format_type': str(getattr(model, 'format_type', None)),
+              'schema': (
+                  schema.to_provider_config() if schema is not None else None
+              ),
+              'kwargs': generation_kwargs,
+          },
+          sort_keys=True,
+          default=_json_default,
+      )
+    except TypeError as e:
+      raise exceptions.InferenceConfigError(
+          f'Generation settings cannot be used as a response cache key: {e}'
+      ) from e
@@ -0,0 +1,492 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Concurrency helpers shared by the provider implementations."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+import concurrent.futures
+import dataclasses
+import hashlib
+import math
+import threading
+import time
+from typing import TypeVar
+
+from absl import logging
+
+_T = TypeVar('_T')
+_R = TypeVar('_R')
+
+# Responses telling the client to send fewer requests.
+_OVERLOAD_STATUS_CODES = frozenset({429, 503})
+_DEFAULT_MAX_LIMIT = 256
+_DEFAULT_BACKOFF_FACTOR = 0.5
+_DEFAULT_LATENCY_TOLERANCE = 2.0
+# Weight of the latest request in the smoothed latency.
+_LATENCY_SMOOTHING = 0.1
+
+
+def run_in_pool(
+    executor: concurrent.futures.Executor,
+    fn: Callable[[_T], _R],
+    items: Sequence[_T],
+    ordered: bool = True,
+) -> Iterator[tuple[int, _R]]:
+  """Runs fn on every item in the executor and yields the results.
+
+  All items are submitted up front. Calls that have not started are cancelled
+  when a call raises or the caller stops iterating, so an executor shared
+  across batches is not left working on an abandoned batch.
+
+  Args:
+    executor: Executor running the calls.
+    fn: Function called with each item.
+    items: Items to process.
+    ordered: If True, results are yielded in item order, each as soon as it
+      and all earlier results are done. If False, they are yielded as they
+      complete.
+
+  Yields:
+    Tuples of (item index, result).
+  """
+  futures = [executor.submit(fn, item) for item in items]
+  try:
+    if ordered:
+      for index, future in enumerate(futures):
+        yield index, future.result()
+    else:
+      future_indices = {future: index for index, future in enumerate(futures)}
+      for future in concurrent.futures.as_completed(future_indices):
+        yield future_indices[future], future.result()
+  finally:
+    for future in futures:
+      future.cancel()
+
+
+class ReusableExecutor:
+  """A thread pool created on first use and reused across inference batches.
+
+  Providers send the prompts of every batch through the same worker threads
+  instead of starting and joining a pool per batch. The pool is replaced when
+  a different worker count is requested; tasks already submitted to the old
+  pool still run to completion.
+  """
+
+  def __init__(self, thread_name_prefix: str = ''):
+    """Initializes the executor.
+
+    Args:
+      thread_name_prefix: Prefix of the worker thread names.
+    """
+    self._thread_name_prefix = thread_name_prefix
+    self._lock = threading.Lock()
+    self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+    self._max_workers = 0
+
+  @property
+  def max_workers(self) -> int:
+    """Worker count of the current pool, or 0 if there is none."""
+    return self._max_workers if self._executor is not None else 0
+
+  def get(self, max_workers: int) -> concurrent.futures.ThreadPoolExecutor:
+    """Returns the pool, creating or resizing it to max_workers threads.
+
+    Args:
+      max_workers: Number of worker threads. Must be positive.
+
+    Returns:
+      A ThreadPoolExecutor with max_workers threads.
+    """
+    if max_workers < 1:
+      raise ValueError('max_workers must be a positive integer.')
+    with self._lock:
+      if self._executor is None or self._max_workers != max_workers:
+        if self._executor is not None:
+          self._executor.shutdown(wait=False)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=self._thread_name_prefix,
+        )
+        self._max_workers = max_workers
+      return self._executor
+
+  def close(self, wait: bool = True) -> None:
+    """Shuts the pool down; a later get() creates a new one.
+
+    Args:
+      wait: Whether to wait for submitted tasks to finish.
+    """
+    with self._lock:
+      executor, self._executor = self._executor, None
+    if executor is not None:
+      executor.shutdown(wait=wait)
+
+
+def error_chain(error: BaseException) -> Iterator[BaseException]:
+  """Yields an error and the errors it wraps, outermost first.
+
+  Follows InferenceRuntimeError.original and exception chaining.
+
+  Args:
+    error: The error raised by a request.
+
+  Yields:
+    error, then each wrapped error.
+  """
+  seen = set()
+  current: BaseException | None = error
+  while current is not None and id(current) not in seen:
+    seen.add(id(current))
+    yield current
+    current = getattr(current, 'original', None) or current.__cause__
+
+
+def status_codes(error: BaseException) -> Iterator[int]:
+  """Yields the HTTP status codes attached to an error and those it wraps.
+
+  Recognizes the status attributes of the provider SDK errors: `code`,
+  `status_code`, or a `response` with a `status_code`.
+
+  Args:
+    error: The error raised by a request.
+
+  Yields:
+    Status codes, outermost error first.
+  """
+  for current in error_chain(error):
+    for status in (
+        getattr(current, 'code', None),
+        getattr(current, 'status_code', None),
+        getattr(getattr(current, 'response', None), 'status_code', None),
+    ):
+      if isinstance(status, int):
+        yield status
+
+
+def is_overload_error(error: BaseException) -> bool:
+  """Whether an error, or an error it wraps, is a 429 or 503 response."""
+  return any(status in _OVERLOAD_STATUS_CODES for status in status_codes(error))
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class LimiterStats:
+  """Snapshot of an adaptive limiter.
+
+  Attributes:
+    limit: Current maximum number of concurrent requests.
+    in_flight: Number of requests currently running.
+    successes: Number of requests that succeeded.
+    overloads: Number of requests rejected with 429 or 503.
+  """
+
+  limit: int
+  in_flight: int = 0
+  successes: int = 0
+  overloads: int = 0
+
+
+class AdaptiveLimiter:
+  """Limits concurrent requests, adapting the limit with AIMD.
+
+  The limit grows additively, by one request per `limit` successful requests,
+  while requests use the whole limit and the smoothed latency stays within
+  `latency_tolerance` times the best smoothed latency seen. It shrinks
+  multiplicatively by `backoff_factor` when a request is rejected with 429 or
+  503. Rejections of requests started before the last decrease do not lower
+  it again, so a burst of rejections counts once.
+
+  Threads call run() and coroutines arun(); both draw from the same slots, so
+  sync and async requests of a quota are limited together.
+  """
+
+  def __init__(
+      self,
+      initial_limit: int,
+      min_limit: int = 1,
+      max_limit: int = _DEFAULT_MAX_LIMIT,
+      backoff_factor: float = _DEFAULT_BACKOFF_FACTOR,
+      latency_tolerance: float = _DEFAULT_LATENCY_TOLERANCE,
+      name: str = '',
+  ):
+    """Initializes the limiter.
+
+    Args:
+      initial_limit: Starting number of concurrent requests.
+      min_limit: Lower bound of the limit.
+      max_limit: Upper bound of the limit.
+      backoff_factor: Factor applied to the limit on a rejection, in (0, 1).
+      latency_tolerance: Ratio of smoothed to best latency above which the
+        limit stops growing.
+      name: Name used in log messages.
+    """
+    if not 1 <= min_limit <= max_limit:
+      raise ValueError('Limits must satisfy 1 <= min_limit <= max_limit.')
+    if not 0 < backoff_factor < 1:
+      raise ValueError('backoff_factor must be between 0 and 1.')
+    self._min_limit = min_limit
+    self._max_limit = max_limit
+    self._backoff_factor = backoff_factor
+    self._latency_tolerance = latency_tolerance
+    self._name = name
+    self._condition = threading.Condition()
+    self._limit = float(min(max(initial_limit, min_limit), max_limit))
+    self._in_flight = 0
+    self._successes = 0
+    self._overloads = 0
+    self._last_decrease = -math.inf
+    self._latency: float | None = None
+    self._best_latency = math.inf
+    # Coroutines waiting for a slot, woken on their loop when one frees up.
+    self._async_waiters: list[
+        tuple[asyncio.AbstractEventLoop, asyncio.Future]
+    ] = []
+
+  @property
+  def limit(self) -> int:
+    """Current maximum number of concurrent requests."""
+    return int(self._limit)
+
+  @property
+  def max_limit(self) -> int:
+    """Upper bound of the limit."""
+    return self._max_limit
+
+  @property
+  def stats(self) -> LimiterStats:
+    """Current limit and request counters."""
+    with self._condition:
+      return LimiterStats(
+          limit=self.limit,
+          in_flight=self._in_flight,
+          successes=self._successes,
+          overloads=self._overloads,
+      )
+
+  def run(self, fn: Callable[..., _R], *args, **kwargs) -> _R:
+    """Calls fn once a slot is free and adapts the limit to the outcome.
+
+    Args:
+      fn: The request to run.
+      *args: Positional arguments for fn.
+      **kwargs: Keyword arguments for fn.
+
+    Returns:
+      The result of fn.
+    """
+    with self._condition:
+      while (saturated := self._try_acquire()) is None:
+        self._condition.wait()
+    start = time.monotonic()
+    succeeded = False
+    overloaded = False
+    try:
+      result = fn(*args, **kwargs)
+      succeeded = True
+      return result
+    except Exception as e:
+      overloaded = is_overload_error(e)
+      raise
+    finally:
+      self._release(start, saturated, succeeded, overloaded)
+
+  async def arun(self, fn: Callable[..., Awaitable[_R]], *args, **kwargs) -> _R:
+    """Awaits fn once a slot is free and adapts the limit to the outcome.
+
+    Waiting for a slot does not block the event loop.
+
+    Args:
+      fn: The async request to run.
+      *args: Positional arguments for fn.
+      **kwargs: Keyword arguments for fn.
+
+    Returns:
+      The result of fn.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+      with self._condition:
+        saturated = self._try_acquire()
+        if saturated is not None:
+          break
+        waiter = loop.create_future()
+        self._async_waiters.append((loop, waiter))
+      try:
+        await waiter
+      finally:
+        with self._condition:
+          if (loop, waiter) in self._async_waiters:
+            self._async_waiters.remove((loop, waiter))
+    start = time.monotonic()
+    succeeded = False
+    overloaded = False
+    try:
+      result = await fn(*args, **kwargs)
+      succeeded = True
+      return result
+    except Exception as e:
+      overloaded = is_overload_error(e)
+      raise
+    finally:
+      self._release(start, saturated, succeeded, overloaded)
+
+  def raise_initial_limit(self, initial_limit: int) -> None:
+    """Raises the limit to initial_limit if no request was rejected yet.
+
+    Args:
+      initial_limit: Requested starting limit, capped by max_limit.
+    """
+    with self._condition:
+      if self._overloads == 0 and initial_limit > self._limit:
+        self._limit = float(min(initial_limit, self._max_limit))
+        self._notify_all()
+
+  def raise_max_limit(self, max_limit: int) -> None:
+    """Raises the upper bound of the limit to max_limit.
+
+    Args:
+      max_limit: Requested upper bound. Lower values are ignored.
+    """
+    with self._condition:
+      self._max_limit = max(self._max_limit, max_limit)
+
+  def _try_acquire(self) -> bool | None:
+    """Takes a slot if one is free; the caller holds the condition.
+
+    Returns:
+      None if no slot is free, else whether the request fills the limit.
+    """
+    if self._in_flight >= self.limit:
+      return None
+    self._in_flight += 1
+    return self._in_flight >= self.limit
+
+  def _release(
+      self, start: float, saturated: bool, succeeded: bool, overloaded: bool
+  ) -> None:
+    """Frees the slot of a finished request and adapts the limit."""
+    with self._condition:
+      self._in_flight -= 1
+      if succeeded:
+        self._on_success(time.monotonic() - start, saturated)
+      elif overloaded:
+        self._on_overload(start)
+      self._notify_all()
+
+  def _notify_all(self) -> None:
+    """Wakes every waiting thread and coroutine; the caller holds the lock."""
+    self._condition.notify_all()
+    waiters, self._async_waiters = self._async_waiters, []
+    for loop, waiter in waiters:
+      try:
+        loop.call_soon_threadsafe(_set_result, waiter)
+      except RuntimeError:
+        # The waiter's loop is closed; nothing is awaiting it any more.
+        pass
+
+  def _on_success(self, latency: float, saturated: bool) -> None:
+    self._successes += 1
+    if self._latency is None:
+      self._latency = latency
+    else:
+      self._latency += _LATENCY_SMOOTHING * (latency - self._latency)
+    self._best_latency = min(self._best_latency, self._latency)
+    if (
+        saturated
+        and self._latency <= self._latency_tolerance * self._best_latency
+    ):
+      self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+  def _on_overload(self, start: float) -> None:
+    self._overloads += 1
+    if start < self._last_decrease:
+      return
+    self._limit = max(self._min_limit, self._limit * self._backoff_factor)
+    self._last_decrease = time.monotonic()
+    logging.info(
+        'Server overloaded; concurrency limit %s lowered to %d.',
+        self._name,
+        self.limit,
+    )
+
+
+def limiter_key(*scope: str, credential: str | None = None) -> str:
+  """Returns the shared limiter key of a quota.
+
+  Quotas are per credential, so models using different API keys for the
+  same model do not throttle each other. The credential is included as a
+  truncated SHA-256 digest, keeping it out of the key, log messages and
+  limiter_stats().
+
+  Args:
+    *scope: Provider, endpoint and model ID identifying the quota.
+    credential: API key the requests are sent with, if any.
+
+  Returns:
+    The scope and credential digest joined with ':'.
+  """
+  parts = list(scope)
+  if credential:
+    parts.append(hashlib.sha256(credential.encode()).hexdigest()[:16])
+  return ':'.join(parts)
+
+
+def _set_result(future: asyncio.Future) -> None:
+  if not future.done():
+    future.set_result(None)
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def shared_limiter(
+    key: str, initial_limit: int, max_limit: int | None = None
+) -> AdaptiveLimiter:
+  """Returns the process-wide limiter for key, creating it on first use.
+
+  Models of the same provider, model ID and credential draw from one quota,
+  so their instances share a limiter. Its upper bound is the largest
+  max_limit requested. Until the server has rejected a request, the limit is
+  raised to the largest initial_limit requested.
+
+  Args:
+    key: Identifies the quota; see limiter_key().
+    initial_limit: Starting limit if the limiter is created by this call.
+    max_limit: Upper bound of the limit. Defaults to initial_limit, so the
+      limit only grows back after backing off.
+
+  Returns:
+    The AdaptiveLimiter for key.
+  """
+  max_limit = max(max_limit or initial_limit, initial_limit, 1)
+  with _limiters_lock:
+    limiter = _limiters.get(key)
+    if limiter is None:
+      limiter = _limiters[key] = AdaptiveLimiter(
+          initial_limit, max_limit=max_limit, name=key
+      )
+    else:
+      limiter.raise_max_limit(max_limit)
+      limiter.raise_initial_limit(initial_limit)
+    return limiter
+
+
+def limiter_stats() -> dict[str, LimiterStats]:
+  """Returns the stats of every shared limiter, by key."""
+  with _limiters_lock:
+    limiters = dict(_limiters)
+  return {key: limiter.stats for key, limiter in limiters.items()}
@@ -17,16 +17,22 @@
 
 from __future__ import annotations
 
-import concurrent.futures
+import asyncio
 import dataclasses
+import threading
+import time
 from typing import Any, Final, Iterator, Sequence
 
+from absl import logging
+
 from langextract.core import base_model
 from langextract.core import data
 from langextract.core import exceptions
 from langextract.core import schema
 from langextract.core import types as core_types
+from langextract.providers import concurrency
 from langextract.providers import patterns
+from langextract.providers import retry
 from langextract.providers import router
 from langextract.providers.schemas import gemini as gemini_schemas
 
@@ -40,6 +46,40 @@ _API_CONFIG_KEYS: Final[set[str]] = {
     'candidate_count',
 }
 
+# Request config keys that must live in the cached content itself and cannot
+# be combined with a cached_content reference.
+_CACHE_INCOMPATIBLE_KEYS: Final[frozenset[str]] = frozenset(
+    {'system_instruction', 'tools', 'cached_content'}
+)
+_PROMPT_CACHE_TTL_SECONDS: Final[int] = 3600
+# A prefix cache is extended once it has less than this left to live, so that
+# requests sent with it do not reach the API after it expired.
+_PROMPT_CACHE_REFRESH_SECONDS: Final[int] = 300
+# Statuses of a request referencing cached content that expired or was
+# deleted.
+_CACHE_NOT_FOUND_STATUS_CODES: Final[frozenset[int]] = frozenset({403, 404})
+
+
+@dataclasses.dataclass(slots=True)
+class _PrefixCache:
+  """Cached content holding a prompt prefix.
+
+  Attributes:
+    name: Resource name of the cached content.
+    expires_at: time.monotonic() value at which the cached content expires.
+  """
+
+  name: str
+  expires_at: float
+
+
+def _is_cache_not_found(error: BaseException) -> bool:
+  """Whether a request failed because its cached content no longer exists."""
+  return any(
+      status in _CACHE_NOT_FOUND_STATUS_CODES
+      for status in concurrency.status_codes(error)
+  )
+
 
 @router.register(
     *patterns.GEMINI_PATTERNS,
@@ -56,6 +96,11 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):
   temperature: float = 0.0
   max_workers: int = 10
   fence_output: bool = False
+  adaptive_concurrency: bool = True
+  max_concurrency: int | None = None
+  retry_policy: retry.RetryPolicy = dataclasses.field(
+      default_factory=retry.RetryPolicy
+  )
   _extra_kwargs: dict[str, Any] = dataclasses.field(
       default_factory=dict, repr=False, compare=False
   )
@@ -89,6 +134,9 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):
       temperature: float = 0.0,
       max_workers: int = 10,
       fence_output: bool = False,
+      adaptive_concurrency: bool = True,
+      max_concurrency: int | None = None,
+      retry_policy: retry.RetryPolicy | None = None,
       **kwargs,
   ) -> None:
     """Initialize the Gemini language model.
@@ -99,9 +147,22 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):
       gemini_schema: Optional schema for structured output.
       format_type: Output format (JSON or YAML).
       temperature: Sampling temperature.
-      max_workers: Maximum number of parallel API calls.
+      max_workers: Maximum number of parallel API calls, or their starting
+        number with adaptive_concurrency. The model keeps its worker threads
+        across calls; assigning max_workers resizes them.
       fence_output: Whether to wrap output in markdown fences (ignored,
         Gemini handles this based on schema).
+      adaptive_concurrency: Whether to send requests through the concurrency
+        limiter shared by all Gemini models with this model_id and API key.
+        Starting at max_workers, it lowers the number of parallel calls when
+        the API answers 429 or 503 and raises it, up to max_concurrency,
+        while requests succeed.
+      max_concurrency: Upper bound of the adaptive limit. Defaults to
+        max_workers, so the limit never exceeds max_workers; set it higher
+        to let the limit grow past max_workers while requests succeed.
+      retry_policy: How each prompt is retried on timeouts, rate limits,
+        transient server errors and connection errors, and what happens when
+        its retries are exhausted. Defaults to RetryPolicy().
       **kwargs: Additional Gemini API parameters. Only allowlisted keys are
         forwarded to the API (response_schema, response_mime_type, tools,
         safety_settings, stop_sequences, candidate_count, system_instruction).
@@ -121,7 +182,23 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):
     self.format_type = format_type
     self.temperature = temperature
     self.max_workers = max_workers
+    self._executor = concurrency.ReusableExecutor(
+        thread_name_prefix='langextract-gemini'
+    )
     self.fence_output = fence_output
+    self.adaptive_concurrency = adaptive_concurrency
+    self.max_concurrency = max_concurrency
+    self._limiter = (
+        concurrency.shared_limiter(
+            concurrency.limiter_key('gemini', model_id, credential=api_key),
+            max_workers,
+            max_concurrency,
+        )
+        if adaptive_concurrency
+        else None
+    )
+    self.retry_policy = retry_policy or retry.RetryPolicy()
+    self._failures: list[retry.PromptFailure] = []
 
     if not self.api_key:
       raise exceptions.InferenceConfigError('API key not provided.')
@@ -134,26 +211,126 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):
     self._extra_kwargs = {
         k: v for k, v in (kwargs or {}).items() if k in _API_CONFIG_KEYS
     }
+    self._prefix_cache_lock = threading.Lock()
+    self._prefix_caches: dict[str, _PrefixCache | None] = {}
+
+  def _prefix_cache_name(self, prefix: str) -> str | None:
+    """Returns the cached content holding a prompt prefix, creating it once.
+
+    The cached content lives for _PROMPT_CACHE_TTL_SECONDS and is extended
+    when it gets close to expiring, or created again if it can no longer be
+    extended. A failed creation (e.g. a prefix below the model's minimum
+    cacheable size) is remembered so that later requests send full prompts
+    without retrying.
+
+    Args:
+      prefix: The declared prompt prefix.
+
+    Returns:
+      The cached content name, or None if the prefix could not be cached.
+    """
+    ttl = f'{_PROMPT_CACHE_TTL_SECONDS}s'
+    with self._prefix_cache_lock:
+      if prefix in self._prefix_caches:
+        prefix_cache = self._prefix_caches[prefix]
+        if prefix_cache is None:
+          return None
+        now = time.monotonic()
+        if now < prefix_cache.expires_at - _PROMPT_CACHE_REFRESH_SECONDS:
+          return prefix_cache.name
+        try:
+          self._client.caches.update(
+              name=prefix_cache.name, config={'ttl': ttl}
+          )
+          prefix_cache.expires_at = now + _PROMPT_CACHE_TTL_SECONDS
+          return prefix_cache.name
+        except Exception as e:  # pylint: disable=broad-exception-caught
+          logging.info(
+              'Failed to extend Gemini cached content %s, recreating it: %s',
+              prefix_cache.name,
+              e,
+          )
+      now = time.monotonic()
+      try:
+        cached_content = self._client.caches.create(
+            model=self.model_id,
+            config={'contents': [prefix], 'ttl': ttl},
+        )
+        self._prefix_caches[prefix] = _PrefixCache(
+            name=cached_content.name,
+            expires_at=now + _PROMPT_CACHE_TTL_SECONDS,
+        )
+        return cached_content.name
+      except Exception as e:  # pylint: disable=broad-exception-caught
+        logging.warning(
+            'Gemini context caching unavailable, sending full prompts: %s',
+            e,
+        )
+        self._prefix_caches[prefix] = None
+        return None
+
+  def _drop_prefix_cache(
+      self, prefix: str, name: str, error: Exception
+  ) -> None:
+    """Forgets cached content the API no longer finds, so it is recreated."""
+    logging.warning(
+        'Gemini cached content %s not found, resending the full prompt: %s',
+        name,
+        error,
+    )
+    with self._prefix_cache_lock:
+      prefix_cache = self._prefix_caches.get(prefix)
+      if prefix_cache is not None and prefix_cache.name == name:
+        del self._prefix_caches[prefix]
+
+  def _cacheable_prefix(
+      self, prompt: str, config: dict
+  ) -> tuple[str | None, str]:
+    """Splits off the declared prefix if the request can use cached content."""
+    if _CACHE_INCOMPATIBLE_KEYS.intersection(config):
+      return None, prompt
+    return self._split_prompt_prefix(prompt)
+
+  def _apply_request_config(self, config: dict) -> dict:
+    """Completes a per-prompt request config with stored kwargs and schema."""
+    # Apply stored kwargs that weren't already set in config
+    for key, value in self._extra_kwargs.items():
+      if key not in config and value is not None:
+        config[key] = value
+
+    if self.gemini_schema:
+      # Structured output requires JSON format
+      if self.format_type != data.FormatType.JSON:
+        raise exceptions.InferenceConfigError(
+            'Gemini structured output only supports JSON format. '
+            'Set format_type=JSON or use_schema_constraints=False.'
+        )
+      config.setdefault('response_mime_type', 'application/json')
+      config.setdefault('response_schema', self.gemini_schema.schema_dict)
+    return config
 
   def _process_single_prompt(
       self, prompt: str, config: dict
   ) -> core_types.ScoredOutput:
     """Process a single prompt and return a ScoredOutput."""
     try:
-      # Apply stored kwargs that weren't already set in config
-      for key, value in self._extra_kwargs.items():
-        if key not in config and value is not None:
-          config[key] = value
-
-      if self.gemini_schema:
-        # Structured output requires JSON format
-        if self.format_type != data.FormatType.JSON:
-          raise exceptions.InferenceConfigError(
-              'Gemini structured output only supports JSON format. '
-              'Set format_type=JSON or use_schema_constraints=False.'
+      config = self._apply_request_config(config)
+      prefix, suffix = self._cacheable_prefix(prompt, config)
+      cache_name = None
+      if prefix is not None:
+        cache_name = self._prefix_cache_name(prefix)
+      if cache_name:
+        try:
+          response = self._client.models.generate_content(
+              model=self.model_id,
+              contents=suffix,
+              config={**config, 'cached_content': cache_name},
           )
-        config.setdefault('response_mime_type', 'application/json')
-        config.setdefault('response_schema', self.gemini_schema.schema_dict)
+          return core_types.ScoredOutput(score=1.0, output=response.text)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+          if not _is_cache_not_found(e):
+            raise
+          self._drop_prefix_cache(prefix, cache_name, e)
 
       response = self._client.models.generate_content(
           model=self.model_id, contents=prompt, config=config
@@ -166,18 +343,42 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):
           f'Gemini API error: {str(e)}', original=e
       ) from e
 
-  def infer(
-      self, batch_prompts: Sequence[str], **kwargs
-  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
-    """Runs inference on a list of prompts via Gemini's API.
+  async def _aprocess_single_prompt(
+      self, prompt: str, config: dict
+  ) -> core_types.ScoredOutput:
+    """Asynchronously process a single prompt and return a ScoredOutput."""
+    try:
+      config = self._apply_request_config(config)
+      prefix, suffix = self._cacheable_prefix(prompt, config)
+      cache_name = None
+      if prefix is not None:
+        cache_name = await asyncio.to_thread(self._prefix_cache_name, prefix)
+      if cache_name:
+        try:
+          response = await self._client.aio.models.generate_content(
+              model=self.model_id,
+              contents=suffix,
+              config={**config, 'cached_content': cache_name},
+          )
+          return core_types.ScoredOutput(score=1.0, output=response.text)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+          if not _is_cache_not_found(e):
+            raise
+          self._drop_prefix_cache(prefix, cache_name, e)
 
-    Args:
-      batch_prompts: A list of string prompts.
-      **kwargs: Additional generation params (temperature, top_p, top_k, etc.)
+      response = await self._client.aio.models.generate_content(
+          model=self.model_id, contents=prompt, config=config
+      )
 
-    Yields:
-      Lists of ScoredOutputs.
-    """
+      return core_types.ScoredOutput(score=1.0, output=response.text)
+
+    except Exception as e:
+      raise exceptions.InferenceRuntimeError(
+          f'Gemini API error: {str(e)}', original=e
+      ) from e
+
+  def _build_config(self, kwargs: dict[str, Any]) -> dict:
+    """Builds the generation config shared by all prompts of a batch."""
     merged_kwargs = self.merge_kwargs(kwargs)
 
     config = {
@@ -198,39 +399,157 @@ class GeminiLanguageModel(base_model.BaseLanguageModel):
           and value is not None
       ):
         config[key] = value
+    return config
+
+  def _pool_workers(self) -> int:
+    """Returns the worker threads of a batch.
+
+    With adaptive concurrency the pool is sized to the shared limiter's
+    current limit when it has grown past max_workers, so a raised limit is
+    used from the next batch on.
+    """
+    if self._limiter is None:
+      return self.max_workers
+    return max(self.max_workers, self._limiter.limit)
+
+  def _run_prompt(self, prompt: str, config: dict) -> core_types.ScoredOutput:
+    """Processes a prompt within the shared concurrency limit, if enabled."""
+    if self._limiter is None:
+      return self._process_single_prompt(prompt, config)
+    return self._limiter.run(self._process_single_prompt, prompt, config)
+
+  async def _arun_prompt(
+      self, prompt: str, config: dict
+  ) -> core_types.ScoredOutput:
+    """Awaits a prompt within the shared concurrency limit, if enabled."""
+    if self._limiter is None:
+      return await self._aprocess_single_prompt(prompt, config)
+    return await self._limiter.arun(
+        self._aprocess_single_prompt, prompt, config
+    )
+
+  def _iter_outputs(
+      self, batch_prompts: Sequence[str], kwargs: dict[str, Any], ordered: bool
+  ) -> Iterator[tuple[int, Sequence[core_types.ScoredOutput]]]:
+    """Yields (prompt index, outputs), running prompts in parallel if enabled.
+
+    Each prompt is retried on its own according to retry_policy.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      kwargs: Additional generation params.
+      ordered: Whether to yield in prompt order rather than as completed.
+
+    Yields:
+      Tuples of (index of the prompt, list of ScoredOutputs).
+
+    Raises:
+      BatchInferenceError: If a prompt fails after its retries and
+        retry_policy.on_exhausted is OnExhausted.RAISE.
+    """
+    config = self._build_config(kwargs)
 
     # Use parallel processing for batches larger than 1
-    if len(batch_prompts) > 1 and self.max_workers > 1:
-      with concurrent.futures.ThreadPoolExecutor(
-          max_workers=min(self.max_workers, len(batch_prompts))
-      ) as executor:
-        future_to_index = {
-            executor.submit(
-                self._process_single_prompt, prompt, config.copy()
-            ): i
-            for i, prompt in enumerate(batch_prompts)
-        }
-
-        results: list[core_types.ScoredOutput | None] = [None] * len(
-            batch_prompts
+    workers = self._pool_workers()
+    executor = (
+        self._executor.get(workers)
+        if len(batch_prompts) > 1 and workers > 1
+        else None
+    )
+    yield from retry.iter_batch(
+        lambda prompt: self._run_prompt(prompt, config.copy()),
+        batch_prompts,
+        self.retry_policy,
+        executor=executor,
+        ordered=ordered,
+        on_failure=self._failures.append,
+    )
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
+    """Runs inference on a list of prompts via Gemini's API.
+
+    Prompts of a batch run in parallel on up to max_workers threads, or as
+    many as the adaptive concurrency limit allows. Each result is yielded as
+    soon as it and all earlier results are ready.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, top_k, etc.)
+
+    Yields:
+      Lists of ScoredOutputs.
+    """
+    for _, outputs in self._iter_outputs(batch_prompts, kwargs, ordered=True):
+      yield outputs
+
+  def infer_unordered(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[tuple[int, Sequence[core_types.ScoredOutput]]]:
+    """Runs inference like infer(), yielding results as they complete.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, top_k, etc.)
+
+    Yields:
+      Tuples of (index of the prompt in batch_prompts, list of ScoredOutputs).
+    """
+    yield from self._iter_outputs(batch_prompts, kwargs, ordered=False)
+
+  @property
+  def failures(self) -> list[retry.PromptFailure]:
+    """Prompts that failed after their retries, oldest first."""
+    return list(self._failures)
+
+  def close(self) -> None:
+    """Deletes the prefix caches and shuts down the worker threads."""
+    with self._prefix_cache_lock:
+      prefix_caches = [c for c in self._prefix_caches.values() if c is not None]
+      self._prefix_caches.clear()
+    for prefix_cache in prefix_caches:
+      try:
+        self._client.caches.delete(name=prefix_cache.name)
+      except Exception as e:  # pylint: disable=broad-exception-caught
+        logging.warning(
+            'Failed to delete Gemini cached content %s: %s',
+            prefix_cache.name,
+            e,
         )
-        for future in concurrent.futures.as_completed(future_to_index):
-          index = future_to_index[future]
-          try:
-            results[index] = future.result()
-          except Exception as e:
-            raise exceptions.InferenceRuntimeError(
-                f'Parallel inference error: {str(e)}', original=e
-            ) from e
-
-        for result in results:
-          if result is None:
-            raise exceptions.InferenceRuntimeError(
-                'Failed to process one or more prompts'
-            )
-          yield [result]
-    else:
-      # Sequential processing for single prompt or worker
-      for prompt in batch_prompts:
-        result = self._process_single_prompt(prompt, config.copy())
-        yield [result]  # pylint: disable=duplicate-code
+    self._executor.close()
+
+  async def ainfer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[core_types.ScoredOutput]]:
+    """Asynchronously runs inference on a list of prompts via Gemini's API.
+
+    Uses the SDK's native async client. With adaptive_concurrency, requests
+    go through the limiter shared with infer(); otherwise at most max_workers
+    requests of the batch are awaited concurrently. Each prompt is retried
+    on its own according to retry_policy, backing off without blocking the
+    loop.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, top_k, etc.)
+
+    Returns:
+      Lists of ScoredOutputs, in prompt order.
+
+    Raises:
+      BatchInferenceError: If a prompt fails after its retries and
+        retry_policy.on_exhausted is OnExhausted.RAISE.
+    """
+    config = self._build_config(kwargs)
+    return await retry.arun_batch(
+        lambda prompt: self._arun_prompt(prompt, config.copy()),
+        batch_prompts,
+        self.retry_policy,
+        max_concurrency=(
+            self._limiter.max_limit
+            if self._limiter is not None
+            else self.max_workers
+        ),
+        on_failure=self._failures.append,
+    )
@@ -71,17 +71,26 @@ Prerequisites:
 
 from __future__ import annotations
 
+import asyncio
 import dataclasses
+import ipaddress
+import os
+import threading
 from typing import Any, Iterator, Mapping, Sequence
+from urllib import parse
 import warnings
 
+import aiohttp
 import requests
+from requests import adapters
+from urllib3.util import retry
 
 # Import from core modules directly
 from langextract.core import base_model
 from langextract.core import exceptions
 from langextract.core import schema
 from langextract.core import types as core_types
+from langextract.providers import concurrency
 from langextract.providers import patterns
 from langextract.providers import router
 
@@ -91,6 +100,75 @@ _DEFAULT_TEMPERATURE = 0.8
 _DEFAULT_TIMEOUT = 120
 _DEFAULT_KEEP_ALIVE = 5 * 60  # 5 minutes
 _DEFAULT_NUM_CTX = 2048
+_DEFAULT_MAX_WORKERS = 10
+_DEFAULT_MAX_RETRIES = 3
+_RETRY_BACKOFF_FACTOR = 0.5
+# Statuses returned while the server is starting or its queue is full.
+_RETRY_STATUSES = (502, 503, 504)
+# Server setting for the number of requests each model serves in parallel.
+_NUM_PARALLEL_ENV = 'OLLAMA_NUM_PARALLEL'
+
+
+def server_parallelism() -> int | None:
+  """Returns the OLLAMA_NUM_PARALLEL setting of the client's environment.
+
+  The Ollama API does not report how many requests a model serves in
+  parallel. The variable read here is the one of this process, which only
+  describes the server when it runs on the same host with the same
+  environment; pass num_parallel explicitly otherwise.
+
+  Returns:
+    The configured parallelism, or None if unset or left to the server.
+  """
+  value = os.environ.get(_NUM_PARALLEL_ENV, '').strip()
+  try:
+    num_parallel = int(value)
+  except ValueError:
+    return None
+  return num_parallel if num_parallel > 0 else None
+
+
+def _is_local_url(url: str) -> bool:
+  """Whether a server URL points to the loopback interface of this host."""
+  host = parse.urlsplit(url).hostname or ''
+  if host == 'localhost':
+    return True
+  try:
+    return ipaddress.ip_address(host).is_loopback
+  except ValueError:
+    return False
+
+
+def _new_session(pool_size: int, max_retries: int) -> requests.Session:
+  """Creates a keep-alive session with a pooled, retrying adapter.
+
+  Connection errors and the statuses in _RETRY_STATUSES are retried with
+  exponential backoff. Read errors are not, since the request may already be
+  generating on the server.
+
+  Args:
+    pool_size: Maximum number of connections kept open to the server.
+    max_retries: Maximum number of retries of a request.
+
+  Returns:
+    A requests.Session that can be shared across threads.
+  """
+  session = requests.Session()
+  adapter = adapters.HTTPAdapter(
+      pool_connections=1,
+      pool_maxsize=pool_size,
+      max_retries=retry.Retry(
+          total=max_retries,
+          read=0,
+          backoff_factor=_RETRY_BACKOFF_FACTOR,
+          status_forcelist=_RETRY_STATUSES,
+          allowed_methods=None,
+          raise_on_status=False,
+      ),
+  )
+  session.mount('http://', adapter)
+  session.mount('https://', adapter)
+  return session
 
 
 @router.register(
@@ -108,6 +186,8 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
   _model: str
   _model_url: str
   format_type: core_types.FormatType = core_types.FormatType.JSON
+  max_workers: int = _DEFAULT_MAX_WORKERS
+  num_parallel: int | None = None
   _constraint: schema.Constraint = dataclasses.field(
       default_factory=schema.Constraint, repr=False, compare=False
   )
@@ -133,6 +213,10 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       structured_output_format: str | None = None,  # Deprecated
       constraint: schema.Constraint = schema.Constraint(),
       timeout: int | None = None,
+      max_workers: int = _DEFAULT_MAX_WORKERS,
+      num_parallel: int | None = None,
+      pool_size: int | None = None,
+      max_retries: int = _DEFAULT_MAX_RETRIES,
       **kwargs,
   ) -> None:
     """Initialize the Ollama language model.
@@ -145,9 +229,37 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       structured_output_format: DEPRECATED - use format_type instead.
       constraint: Schema constraints.
       timeout: Request timeout in seconds. Defaults to 120.
+      max_workers: Maximum number of prompts of a batch sent concurrently.
+      num_parallel: Number of requests the Ollama server processes in
+        parallel. Concurrency is capped to it so requests do not time out
+        waiting in the server's queue. If None and the server URL is a
+        loopback address, falls back to the OLLAMA_NUM_PARALLEL variable of
+        this process, if set, since a local server usually shares it. Set it
+        explicitly for remote servers.
+      pool_size: Maximum number of keep-alive connections to the server,
+        shared by all threads and ainfer calls using this model. Concurrency,
+        including a per-call max_workers override, is capped to it. Defaults
+        to max_workers.
+      max_retries: Maximum number of retries of a request after a connection
+        error or a 502, 503 or 504 response.
       **kwargs: Additional parameters.
     """
-    self._requests = requests
+    # Support both model_url and base_url parameters
+    self._model_url = base_url or model_url or _OLLAMA_DEFAULT_MODEL_URL
+    self.max_workers = max_workers
+    if num_parallel is None and _is_local_url(self._model_url):
+      num_parallel = server_parallelism()
+    self.num_parallel = num_parallel
+    self._executor = concurrency.ReusableExecutor(
+        thread_name_prefix='langextract-ollama'
+    )
+    self._pool_size = max(pool_size or max_workers, 1)
+    self._session = _new_session(self._pool_size, max_retries)
+    # aiohttp sessions are bound to an event loop; one is kept per loop.
+    self._async_sessions_lock = threading.Lock()
+    self._async_sessions: dict[
+        int, tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]
+    ] = {}
 
     # Handle deprecated structured_output_format parameter
     if structured_output_format is not None:
@@ -178,8 +290,6 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       format_type = core_types.FormatType.JSON
 
     self._model = model_id
-    # Support both model_url and base_url parameters
-    self._model_url = base_url or model_url or _OLLAMA_DEFAULT_MODEL_URL
     self.format_type = format_type
     self._constraint = constraint
     super().__init__(constraint=constraint)
@@ -187,39 +297,230 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       kwargs['timeout'] = timeout
     self._extra_kwargs = kwargs or {}
 
+  def _num_workers(self, max_workers: int | None = None) -> int:
+    """Returns the number of concurrent requests.
+
+    Args:
+      max_workers: Per-call override of the model's max_workers.
+
+    Returns:
+      The requested workers, capped by num_parallel and by pool_size so that
+      every request holds one of the pooled connections.
+    """
+    workers = min(max_workers or self.max_workers, self._pool_size)
+    if self.num_parallel is not None:
+      workers = min(workers, self.num_parallel)
+    return max(workers, 1)
+
+  def _infer_prompt(
+      self, prompt: str, kwargs: Mapping[str, Any]
+  ) -> list[core_types.ScoredOutput]:
+    """Sends one prompt and returns its output."""
+    try:
+      response = self._ollama_query(
+          model=self._model,
+          structured_output_format='json'
+          if self.format_type == core_types.FormatType.JSON
+          else 'yaml',
+          model_url=self._model_url,
+          **self._with_prompt_fields(prompt, kwargs),
+      )
+      # No score for Ollama. Default to 1.0
+      return [core_types.ScoredOutput(score=1.0, output=response['response'])]
+    except Exception as e:
+      raise exceptions.InferenceRuntimeError(
+          f'Ollama API error: {str(e)}', original=e
+      ) from e
+
+  def _iter_outputs(
+      self, batch_prompts: Sequence[str], kwargs: dict[str, Any], ordered: bool
+  ) -> Iterator[tuple[int, Sequence[core_types.ScoredOutput]]]:
+    """Yields (prompt index, outputs), sending prompts concurrently.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      kwargs: Additional generation params.
+      ordered: Whether to yield in prompt order rather than as completed.
+
+    Yields:
+      Tuples of (index of the prompt, list of ScoredOutputs).
+    """
+    combined_kwargs = self.merge_kwargs(kwargs)
+    workers = self._num_workers(combined_kwargs.pop('max_workers', None))
+
+    if workers <= 1 or len(batch_prompts) <= 1:
+      for index, prompt in enumerate(batch_prompts):
+        yield index, self._infer_prompt(prompt, combined_kwargs)
+      return
+
+    yield from concurrency.run_in_pool(
+        self._executor.get(workers),
+        lambda prompt: self._infer_prompt(prompt, combined_kwargs),
+        batch_prompts,
+        ordered=ordered,
+    )
+
   def infer(
       self, batch_prompts: Sequence[str], **kwargs
   ) -> Iterator[Sequence[core_types.ScoredOutput]]:
     """Runs inference on a list of prompts via Ollama's API.
 
+    Prompts are sent concurrently by up to max_workers threads sharing the
+    model's connection pool, capped by num_parallel and pool_size. Results are
+    yielded in prompt order as soon as each one and its predecessors are done.
+
     Args:
       batch_prompts: A list of string prompts.
-      **kwargs: Additional generation params.
+      **kwargs: Additional generation params. max_workers overrides the
+        model's max_workers for this batch, up to pool_size.
 
     Yields:
       Lists of ScoredOutputs.
     """
+    for _, outputs in self._iter_outputs(batch_prompts, kwargs, ordered=True):
+      yield outputs
+
+  def infer_unordered(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[tuple[int, Sequence[core_types.ScoredOutput]]]:
+    """Runs inference like infer(), yielding results as they complete.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params.
+
+    Yields:
+      Tuples of (index of the prompt in batch_prompts, list of ScoredOutputs).
+    """
+    yield from self._iter_outputs(batch_prompts, kwargs, ordered=False)
+
+  def _async_session(self) -> aiohttp.ClientSession:
+    """Returns the aiohttp session of the running loop, creating it once.
+
+    The session keeps up to pool_size keep-alive connections, reused by every
+    ainfer call on the loop.
+    """
+    loop = asyncio.get_running_loop()
+    with self._async_sessions_lock:
+      for key, (other_loop, session) in list(self._async_sessions.items()):
+        if other_loop.is_closed():
+          # Its connections died with the loop; only the session remains.
+          session.detach()
+          del self._async_sessions[key]
+      entry = self._async_sessions.get(id(loop))
+      if entry is None or entry[0] is not loop or entry[1].closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self._pool_size)
+        )
+        entry = self._async_sessions[id(loop)] = (loop, session)
+      return entry[1]
+
+  def close(self) -> None:
+    """Closes the pooled connections and the worker threads.
+
+    aiohttp sessions of loops that are not running are closed here; those of
+    running loops are closed on their loop without waiting. Prefer aclose()
+    from async code.
+    """
+    self._executor.close()
+    self._session.close()
+    with self._async_sessions_lock:
+      entries = list(self._async_sessions.values())
+      self._async_sessions.clear()
+    for loop, session in entries:
+      if loop.is_closed():
+        session.detach()
+      elif loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+      else:
+        loop.run_until_complete(session.close())
+
+  async def aclose(self) -> None:
+    """Closes the aiohttp session of the running loop, then calls close()."""
+    loop = asyncio.get_running_loop()
+    with self._async_sessions_lock:
+      entry = self._async_sessions.pop(id(loop), None)
+    if entry is not None and entry[0] is loop:
+      await entry[1].close()
+    self.close()
+
+  async def ainfer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[core_types.ScoredOutput]]:
+    """Asynchronously runs inference on a list of prompts via Ollama's API.
+
+    Prompts of the batch are sent concurrently over the aiohttp session of
+    the running loop, which keeps its connections across calls, with at most
+    max_workers (capped by num_parallel and pool_size) requests in flight.
+    Call aclose() before the loop ends to close the session.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params.
+
+    Returns:
+      Lists of ScoredOutputs, in prompt order.
+    """
     combined_kwargs = self.merge_kwargs(kwargs)
+    semaphore = asyncio.Semaphore(
+        self._num_workers(combined_kwargs.pop('max_workers', None))
+    )
 
-    for prompt in batch_prompts:
+    async def process(
+        session: aiohttp.ClientSession, prompt: str
+    ) -> list[core_types.ScoredOutput]:
       try:
-        response = self._ollama_query(
-            prompt=prompt,
-            model=self._model,
-            structured_output_format='json'
-            if self.format_type == core_types.FormatType.JSON
-            else 'yaml',
-            model_url=self._model_url,
-            **combined_kwargs,
-        )
-        # No score for Ollama. Default to 1.0
-        yield [core_types.ScoredOutput(score=1.0, output=response['response'])]
+        async with semaphore:
+          response = await self._ollama_aquery(
+              session,
+              model=self._model,
+              structured_output_format='json'
+              if self.format_type == core_types.FormatType.JSON
+              else 'yaml',
+              model_url=self._model_url,
+              **self._with_prompt_fields(prompt, combined_kwargs),
+          )
+        return [core_types.ScoredOutput(score=1.0, output=response['response'])]
       except Exception as e:
         raise exceptions.InferenceRuntimeError(
             f'Ollama API error: {str(e)}', original=e
         ) from e
 
-  def _ollama_query(
+    session = self._async_session()
+    return list(
+        await asyncio.gather(*(process(session, p) for p in batch_prompts))
+    )
+
+  def _with_prompt_fields(
+      self, prompt: str, kwargs: Mapping[str, Any]
+  ) -> dict[str, Any]:
+    """Adds the prompt to the request kwargs.
+
+    A declared prompt prefix is sent as the system prompt, which stays
+    identical across requests so the server can reuse its evaluated context.
+    An explicitly configured system prompt takes precedence.
+
+    Args:
+      prompt: The full prompt.
+      kwargs: Merged request kwargs.
+
+    Returns:
+      A copy of kwargs with the prompt (and system prompt) set.
+    """
+    fields = dict(kwargs)
+    prefix, suffix = (
+        (None, prompt)
+        if kwargs.get('system')
+        else self._split_prompt_prefix(prompt)
+    )
+    if prefix is None:
+      fields['prompt'] = prompt
+    else:
+      fields['prompt'] = suffix
+      fields['system'] = prefix
+    return fields
+
+  def _build_generate_request(
       self,
       prompt: str,
       model: str | None = None,
@@ -238,51 +539,13 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       num_ctx: int | None = None,
       stop: str | list[str] | None = None,
       **kwargs,  # pylint: disable=unused-argument
-  ) -> Mapping[str, Any]:
-    """Sends a prompt to an Ollama model and returns the generated response.
+  ) -> tuple[str, dict[str, Any], int]:
+    """Builds the URL, JSON payload and timeout of a `/api/generate` request.
 
-    Note: This is a low-level method. Constructor timeout is only used when
-    calling through infer(). Direct calls use the timeout parameter here.
-
-    This function makes an HTTP POST request to the `/api/generate` endpoint of
-    an Ollama server. It can optionally load the specified model first, generate
-    a response (with or without streaming), then return a parsed JSON response.
-
-    Args:
-      prompt: The text prompt to send to the model.
-      model: The name of the model to use. Defaults to self._model.
-      temperature: Sampling temperature. Higher values produce more diverse
-        output.
-      seed: Seed for reproducible generation. If None, random seed is used.
-      top_k: The top-K parameter for sampling.
-      top_p: The top-P (nucleus) sampling parameter.
-      max_output_tokens: Maximum tokens to generate. If None, the model's
-        default is used.
-      structured_output_format: If set to "json" or a JSON schema dict, requests
-        structured outputs from the model. See Ollama documentation for details.
-      system: A system prompt to override any system-level instructions.
-      raw: If True, bypasses any internal prompt templating; you provide the
-        entire raw prompt.
-      model_url: The base URL for the Ollama server. Defaults to self._model_url.
-      timeout: Timeout (in seconds) for the HTTP request. Defaults to 120.
-      keep_alive: How long (in seconds) the model remains loaded after
-        generation completes.
-      num_threads: Number of CPU threads to use. If None, Ollama uses a default
-        heuristic.
-      num_ctx: Number of context tokens allowed. If None, uses model's default
-        or config.
-      stop: Stop sequences to halt generation. Can be a string or list of strings.
-      **kwargs: Additional parameters passed through.
+    See _ollama_query for a description of the arguments.
 
     Returns:
-      A mapping (dictionary-like) containing the server's JSON response. For
-      non-streaming calls, the `"response"` key typically contains the entire
-      generated text.
-
-    Raises:
-      InferenceConfigError: If the server returns a 404 (model not found).
-      InferenceRuntimeError: For any other HTTP errors, timeouts, or request
-        exceptions.
+      Tuple of (api_url, payload, request_timeout).
     """
     model = model or self._model
     model_url = model_url or self._model_url
@@ -333,9 +596,94 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
       payload['stop'] = stop
 
     request_timeout = timeout if timeout is not None else _DEFAULT_TIMEOUT
+    return api_url, payload, request_timeout
+
+  def _ollama_query(
+      self,
+      prompt: str,
+      model: str | None = None,
+      temperature: float | None = None,
+      seed: int | None = None,
+      top_k: int | None = None,
+      top_p: float | None = None,
+      max_output_tokens: int | None = None,
+      structured_output_format: str | None = None,
+      system: str = '',
+      raw: bool = False,
+      model_url: str | None = None,
+      timeout: int | None = None,
+      keep_alive: int | None = None,
+      num_threads: int | None = None,
+      num_ctx: int | None = None,
+      stop: str | list[str] | None = None,
+      **kwargs,  # pylint: disable=unused-argument
+  ) -> Mapping[str, Any]:
+    """Sends a prompt to an Ollama model and returns the generated response.
+
+    Note: This is a low-level method. Constructor timeout is only used when
+    calling through infer(). Direct calls use the timeout parameter here.
+
+    This function makes an HTTP POST request to the `/api/generate` endpoint of
+    an Ollama server. It can optionally load the specified model first, generate
+    a response (with or without streaming), then return a parsed JSON response.
+
+    Args:
+      prompt: The text prompt to send to the model.
+      model: The name of the model to use. Defaults to self._model.
+      temperature: Sampling temperature. Higher values produce more diverse
+        output.
+      seed: Seed for reproducible generation. If None, random seed is used.
+      top_k: The top-K parameter for sampling.
+      top_p: The top-P (nucleus) sampling parameter.
+      max_output_tokens: Maximum tokens to generate. If None, the model's
+        default is used.
+      structured_output_format: If set to "json" or a JSON schema dict, requests
+        structured outputs from the model. See Ollama documentation for details.
+      system: A system prompt to override any system-level instructions.
+      raw: If True, bypasses any internal prompt templating; you provide the
+        entire raw prompt.
+      model_url: The base URL for the Ollama server. Defaults to self._model_url.
+      timeout: Timeout (in seconds) for the HTTP request. Defaults to 120.
+      keep_alive: How long (in seconds) the model remains loaded after
+        generation completes.
+      num_threads: Number of CPU threads to use. If None, Ollama uses a default
+        heuristic.
+      num_ctx: Number of context tokens allowed. If None, uses model's default
+        or config.
+      stop: Stop sequences to halt generation. Can be a string or list of strings.
+      **kwargs: Additional parameters passed through.
+
+    Returns:
+      A mapping (dictionary-like) containing the server's JSON response. For
+      non-streaming calls, the `"response"` key typically contains the entire
+      generated text.
+
+    Raises:
+      InferenceConfigError: If the server returns a 404 (model not found).
+      InferenceRuntimeError: For any other HTTP errors, timeouts, or request
+        exceptions.
+    """
+    api_url, payload, request_timeout = self._build_generate_request(
+        prompt=prompt,
+        model=model,
+        temperature=temperature,
+        seed=seed,
+        top_k=top_k,
+        top_p=top_p,
+        max_output_tokens=max_output_tokens,
+        structured_output_format=structured_output_format,
+        system=system,
+        raw=raw,
+        model_url=model_url,
+        timeout=timeout,
+        keep_alive=keep_alive,
+        num_threads=num_threads,
+        num_ctx=num_ctx,
+        stop=stop,
+    )
 
     try:
-      response = self._requests.post(
+      response = self._session.post(
           api_url,
           headers={
               'Content-Type': 'application/json',
@@ -344,8 +692,8 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
           json=payload,
           timeout=request_timeout,
       )
-    except self._requests.exceptions.RequestException as e:
-      if isinstance(e, self._requests.exceptions.ReadTimeout):
+    except requests.exceptions.RequestException as e:
+      if isinstance(e, requests.exceptions.ReadTimeout):
         msg = (
             f'Ollama Model timed out (timeout={request_timeout},'
             f' num_threads={num_threads})'
@@ -367,3 +715,64 @@ class OllamaLanguageModel(base_model.BaseLanguageModel):
     else:
       msg = f'Bad status code from Ollama: {response.status_code}'
       raise exceptions.InferenceRuntimeError(msg, provider='Ollama')
+
+  async def _ollama_aquery(
+      self,
+      session: aiohttp.ClientSession,
+      prompt: str,
+      num_threads: int | None = None,
+      **kwargs,
+  ) -> Mapping[str, Any]:
+    """Asynchronous counterpart of _ollama_query using an aiohttp session.
+
+    Args:
+      session: The aiohttp.ClientSession used to send the request.
+      prompt: The text prompt to send to the model.
+      num_threads: Number of CPU threads to use.
+      **kwargs: Remaining _ollama_query parameters.
+
+    Returns:
+      A mapping containing the server's JSON response.
+
+    Raises:
+      InferenceConfigError: If the server returns a 404 (model not found).
+      InferenceRuntimeError: For any other HTTP errors, timeouts, or request
+        exceptions.
+    """
+    api_url, payload, request_timeout = self._build_generate_request(
+        prompt=prompt, num_threads=num_threads, **kwargs
+    )
+    model = payload['model']
+
+    try:
+      async with session.post(
+          api_url,
+          headers={
+              'Content-Type': 'application/json',
+              'Accept': 'application/json',
+          },
+          json=payload,
+          timeout=aiohttp.ClientTimeout(total=request_timeout),
+      ) as response:
+        if response.status == 200:
+          return await response.json(content_type=None, encoding='utf-8')
+        status = response.status
+    except asyncio.TimeoutError as e:
+      msg = (
+          f'Ollama Model timed out (timeout={request_timeout},'
+          f' num_threads={num_threads})'
+      )
+      raise exceptions.InferenceRuntimeError(
+          msg, original=e, provider='Ollama'
+      ) from e
+    except aiohttp.ClientError as e:
+      raise exceptions.InferenceRuntimeError(
+          f'Ollama request failed: {str(e)}', original=e, provider='Ollama'
+      ) from e
+
+    if status == 404:
+      raise exceptions.InferenceConfigError(
+          f"Can't find Ollama {model}. Try: ollama run {model}"
+      )
+    msg = f'Bad status code from Ollama: {status}'
+    raise exceptions.InferenceRuntimeError(msg, provider='Ollama')
@@ -17,8 +17,9 @@
 
 from __future__ import annotations
 
-import concurrent.futures
+import asyncio
 import dataclasses
+import threading
 from typing import Any, Iterator, Sequence
 
 from langextract.core import base_model
@@ -26,7 +27,9 @@ from langextract.core import data
 from langextract.core import exceptions
 from langextract.core import schema
 from langextract.core import types as core_types
+from langextract.providers import concurrency
 from langextract.providers import patterns
+from langextract.providers import retry
 from langextract.providers import router
 
 
@@ -45,7 +48,15 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
   format_type: data.FormatType = data.FormatType.JSON
   temperature: float | None = None
   max_workers: int = 10
+  adaptive_concurrency: bool = True
+  max_concurrency: int | None = None
+  retry_policy: retry.RetryPolicy = dataclasses.field(
+      default_factory=retry.RetryPolicy
+  )
   _client: Any = dataclasses.field(default=None, repr=False, compare=False)
+  _async_clients: dict[int, tuple[asyncio.AbstractEventLoop, Any]] = (
+      dataclasses.field(default_factory=dict, repr=False, compare=False)
+  )
   _extra_kwargs: dict[str, Any] = dataclasses.field(
       default_factory=dict, repr=False, compare=False
   )
@@ -66,6 +77,9 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
       format_type: data.FormatType = data.FormatType.JSON,
       temperature: float | None = None,
       max_workers: int = 10,
+      adaptive_concurrency: bool = True,
+      max_concurrency: int | None = None,
+      retry_policy: retry.RetryPolicy | None = None,
       **kwargs,
   ) -> None:
     """Initialize the OpenAI language model.
@@ -77,7 +91,20 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
       organization: Optional OpenAI organization ID.
       format_type: Output format (JSON or YAML).
       temperature: Sampling temperature.
-      max_workers: Maximum number of parallel API calls.
+      max_workers: Maximum number of parallel API calls, or their starting
+        number with adaptive_concurrency. The model keeps its worker threads
+        across calls; assigning max_workers resizes them.
+      adaptive_concurrency: Whether to send requests through the concurrency
+        limiter shared by all OpenAI models with this base_url, organization,
+        model_id and API key. Starting at max_workers, it lowers the number
+        of parallel calls when the API answers 429 or 503 and raises it, up
+        to max_concurrency, while requests succeed.
+      max_concurrency: Upper bound of the adaptive limit. Defaults to
+        max_workers, so the limit never exceeds max_workers; set it higher
+        to let the limit grow past max_workers while requests succeed.
+      retry_policy: How each prompt is retried on timeouts, rate limits,
+        transient server errors and connection errors, and what happens when
+        its retries are exhausted. Defaults to RetryPolicy().
       **kwargs: Ignored extra parameters so callers can pass a superset of
         arguments shared across back-ends without raising ``TypeError``.
     """
@@ -98,72 +125,98 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
     self.format_type = format_type
     self.temperature = temperature
     self.max_workers = max_workers
+    self._executor = concurrency.ReusableExecutor(
+        thread_name_prefix='langextract-openai'
+    )
+    self.adaptive_concurrency = adaptive_concurrency
+    self.max_concurrency = max_concurrency
+    self._limiter = (
+        concurrency.shared_limiter(
+            concurrency.limiter_key(
+                'openai',
+                base_url or '',
+                organization or '',
+                model_id,
+                credential=api_key,
+            ),
+            max_workers,
+            max_concurrency,
+        )
+        if adaptive_concurrency
+        else None
+    )
+    self.retry_policy = retry_policy or retry.RetryPolicy()
+    self._failures: list[retry.PromptFailure] = []
+    self._retryable_types = (openai.APIConnectionError,)
 
     if not self.api_key:
       raise exceptions.InferenceConfigError('API key not provided.')
 
-    # Initialize the OpenAI client
-    self._client = openai.OpenAI(
-        api_key=self.api_key,
-        base_url=self.base_url,
-        organization=self.organization,
-    )
+    self._clients_lock = threading.Lock()
+    self._client = self._new_client(openai.OpenAI)
+    # Async clients are bound to an event loop; one is kept per loop.
+    self._async_clients = {}
 
     super().__init__(
         constraint=schema.Constraint(constraint_type=schema.ConstraintType.NONE)
     )
     self._extra_kwargs = kwargs or {}
 
+  def _build_api_params(self, prompt: str, config: dict) -> dict[str, Any]:
+    """Builds the chat completion request parameters for a single prompt."""
+    system_message = ''
+    if self.format_type == data.FormatType.JSON:
+      system_message = (
+          'You are a helpful assistant that responds in JSON format.'
+      )
+    elif self.format_type == data.FormatType.YAML:
+      system_message = (
+          'You are a helpful assistant that responds in YAML format.'
+      )
+
+    messages = [{'role': 'user', 'content': prompt}]
+    if system_message:
+      messages.insert(0, {'role': 'system', 'content': system_message})
+
+    api_params = {
+        'model': self.model_id,
+        'messages': messages,
+        'n': 1,
+    }
+
+    # Only set temperature if explicitly provided
+    temp = config.get('temperature', self.temperature)
+    if temp is not None:
+      api_params['temperature'] = temp
+
+    if self.format_type == data.FormatType.JSON:
+      # Enables structured JSON output for compatible models
+      api_params['response_format'] = {'type': 'json_object'}
+
+    if (v := config.get('max_output_tokens')) is not None:
+      api_params['max_tokens'] = v
+    if (v := config.get('top_p')) is not None:
+      api_params['top_p'] = v
+    for key in [
+        'frequency_penalty',
+        'presence_penalty',
+        'seed',
+        'stop',
+        'logprobs',
+        'top_logprobs',
+    ]:
+      if (v := config.get(key)) is not None:
+        api_params[key] = v
+    return api_params
+
   def _process_single_prompt(
       self, prompt: str, config: dict
   ) -> core_types.ScoredOutput:
     """Process a single prompt and return a ScoredOutput."""
     try:
-      system_message = ''
-      if self.format_type == data.FormatType.JSON:
-        system_message = (
-            'You are a helpful assistant that responds in JSON format.'
-        )
-      elif self.format_type == data.FormatType.YAML:
-        system_message = (
-            'You are a helpful assistant that responds in YAML format.'
-        )
+      api_params = self._build_api_params(prompt, config)
 
-      messages = [{'role': 'user', 'content': prompt}]
-      if system_message:
-        messages.insert(0, {'role': 'system', 'content': system_message})
-
-      api_params = {
-          'model': self.model_id,
-          'messages': messages,
-          'n': 1,
-      }
-
-      # Only set temperature if explicitly provided
-      temp = config.get('temperature', self.temperature)
-      if temp is not None:
-        api_params['temperature'] = temp
-
-      if self.format_type == data.FormatType.JSON:
-        # Enables structured JSON output for compatible models
-        api_params['response_format'] = {'type': 'json_object'}
-
-      if (v := config.get('max_output_tokens')) is not None:
-        api_params['max_tokens'] = v
-      if (v := config.get('top_p')) is not None:
-        api_params['top_p'] = v
-      for key in [
-          'frequency_penalty',
-          'presence_penalty',
-          'seed',
-          'stop',
-          'logprobs',
-          'top_logprobs',
-      ]:
-        if (v := config.get(key)) is not None:
-          api_params[key] = v
-
-      response = self._client.chat.completions.create(**api_params)
+      response = self._get_client().chat.completions.create(**api_params)
 
       # Extract the response text using the v1.x response format
       output_text = response.choices[0].message.content
@@ -175,18 +228,71 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
           f'OpenAI API error: {str(e)}', original=e
       ) from e
 
-  def infer(
-      self, batch_prompts: Sequence[str], **kwargs
-  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
-    """Runs inference on a list of prompts via OpenAI's API.
+  async def _aprocess_single_prompt(
+      self, prompt: str, config: dict
+  ) -> core_types.ScoredOutput:
+    """Asynchronously process a single prompt and return a ScoredOutput."""
+    try:
+      api_params = self._build_api_params(prompt, config)
 
-    Args:
-      batch_prompts: A list of string prompts.
-      **kwargs: Additional generation params (temperature, top_p, etc.)
+      response = await self._get_async_client().chat.completions.create(
+          **api_params
+      )
 
-    Yields:
-      Lists of ScoredOutputs.
+      output_text = response.choices[0].message.content
+
+      return core_types.ScoredOutput(score=1.0, output=output_text)
+
+    except Exception as e:
+      raise exceptions.InferenceRuntimeError(
+          f'OpenAI API error: {str(e)}', original=e
+      ) from e
+
+  def _new_client(self, client_class: type[Any]) -> Any:
+    """Creates an OpenAI or AsyncOpenAI client for this model.
+
+    Requests are retried per prompt by retry_policy rather than by the client.
+    """
+    return client_class(
+        api_key=self.api_key,
+        base_url=self.base_url,
+        organization=self.organization,
+        max_retries=0,
+    )
+
+  def _get_client(self) -> Any:
+    """Returns the sync OpenAI client, recreating it after close()."""
+    with self._clients_lock:
+      if self._client is None:
+        # pylint: disable=import-outside-toplevel
+        import openai
+
+        self._client = self._new_client(openai.OpenAI)
+      return self._client
+
+  def _get_async_client(self) -> Any:
+    """Returns the async OpenAI client of the running loop, creating it once.
+
+    The client's connections belong to the loop that opened them, so each
+    running loop gets its own client. Clients of loops that have closed are
+    dropped, since their connections died with the loop.
     """
+    loop = asyncio.get_running_loop()
+    with self._clients_lock:
+      for key, (other_loop, _) in list(self._async_clients.items()):
+        if other_loop.is_closed():
+          del self._async_clients[key]
+      entry = self._async_clients.get(id(loop))
+      if entry is None or entry[0] is not loop:
+        # pylint: disable=import-outside-toplevel
+        import openai
+
+        client = self._new_client(openai.AsyncOpenAI)
+        entry = self._async_clients[id(loop)] = (loop, client)
+      return entry[1]
+
+  def _build_config(self, kwargs: dict[str, Any]) -> dict:
+    """Builds the generation config shared by all prompts of a batch."""
     merged_kwargs = self.merge_kwargs(kwargs)
 
     config = {}
@@ -211,39 +317,175 @@ class OpenAILanguageModel(base_model.BaseLanguageModel):
     ]:
       if key in merged_kwargs:
         config[key] = merged_kwargs[key]
+    return config
+
+  def _pool_workers(self) -> int:
+    """Returns the worker threads of a batch.
+
+    With adaptive concurrency the pool is sized to the shared limiter's
+    current limit when it has grown past max_workers, so a raised limit is
+    used from the next batch on.
+    """
+    if self._limiter is None:
+      return self.max_workers
+    return max(self.max_workers, self._limiter.limit)
+
+  def _run_prompt(self, prompt: str, config: dict) -> core_types.ScoredOutput:
+    """Processes a prompt within the shared concurrency limit, if enabled."""
+    if self._limiter is None:
+      return self._process_single_prompt(prompt, config)
+    return self._limiter.run(self._process_single_prompt, prompt, config)
+
+  async def _arun_prompt(
+      self, prompt: str, config: dict
+  ) -> core_types.ScoredOutput:
+    """Awaits a prompt within the shared concurrency limit, if enabled."""
+    if self._limiter is None:
+      return await self._aprocess_single_prompt(prompt, config)
+    return await self._limiter.arun(
+        self._aprocess_single_prompt, prompt, config
+    )
+
+  def _iter_outputs(
+      self, batch_prompts: Sequence[str], kwargs: dict[str, Any], ordered: bool
+  ) -> Iterator[tuple[int, Sequence[core_types.ScoredOutput]]]:
+    """Yields (prompt index, outputs), running prompts in parallel if enabled.
+
+    Each prompt is retried on its own according to retry_policy.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      kwargs: Additional generation params.
+      ordered: Whether to yield in prompt order rather than as completed.
+
+    Yields:
+      Tuples of (index of the prompt, list of ScoredOutputs).
+
+    Raises:
+      BatchInferenceError: If a prompt fails after its retries and
+        retry_policy.on_exhausted is OnExhausted.RAISE.
+    """
+    config = self._build_config(kwargs)
 
     # Use parallel processing for batches larger than 1
-    if len(batch_prompts) > 1 and self.max_workers > 1:
-      with concurrent.futures.ThreadPoolExecutor(
-          max_workers=min(self.max_workers, len(batch_prompts))
-      ) as executor:
-        future_to_index = {
-            executor.submit(
-                self._process_single_prompt, prompt, config.copy()
-            ): i
-            for i, prompt in enumerate(batch_prompts)
-        }
-
-        results: list[core_types.ScoredOutput | None] = [None] * len(
-            batch_prompts
-        )
-        for future in concurrent.futures.as_completed(future_to_index):
-          index = future_to_index[future]
-          try:
-            results[index] = future.result()
-          except Exception as e:
-            raise exceptions.InferenceRuntimeError(
-                f'Parallel inference error: {str(e)}', original=e
-            ) from e
-
-        for result in results:
-          if result is None:
-            raise exceptions.InferenceRuntimeError(
-                'Failed to process one or more prompts'
-            )
-          yield [result]
-    else:
-      # Sequential processing for single prompt or worker
-      for prompt in batch_prompts:
-        result = self._process_single_prompt(prompt, config.copy())
-        yield [result]  # pylint: disable=duplicate-code
+    workers = self._pool_workers()
+    executor = (
+        self._executor.get(workers)
+        if len(batch_prompts) > 1 and workers > 1
+        else None
+    )
+    yield from retry.iter_batch(
+        lambda prompt: self._run_prompt(prompt, config.copy()),
+        batch_prompts,
+        self.retry_policy,
+        executor=executor,
+        ordered=ordered,
+        retryable_types=self._retryable_types,
+        on_failure=self._failures.append,
+    )
+
+  def infer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[Sequence[core_types.ScoredOutput]]:
+    """Runs inference on a list of prompts via OpenAI's API.
+
+    Prompts of a batch run in parallel on up to max_workers threads, or as
+    many as the adaptive concurrency limit allows. Each result is yielded as
+    soon as it and all earlier results are ready.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, etc.)
+
+    Yields:
+      Lists of ScoredOutputs.
+    """
+    for _, outputs in self._iter_outputs(batch_prompts, kwargs, ordered=True):
+      yield outputs
+
+  def infer_unordered(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> Iterator[tuple[int, Sequence[core_types.ScoredOutput]]]:
+    """Runs inference like infer(), yielding results as they complete.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, etc.)
+
+    Yields:
+      Tuples of (index of the prompt in batch_prompts, list of ScoredOutputs).
+    """
+    yield from self._iter_outputs(batch_prompts, kwargs, ordered=False)
+
+  @property
+  def failures(self) -> list[retry.PromptFailure]:
+    """Prompts that failed after their retries, oldest first."""
+    return list(self._failures)
+
+  def close(self) -> None:
+    """Closes the clients and the worker threads shared by infer calls.
+
+    Async clients of loops that are not running are closed here; those of
+    running loops are closed on their loop without waiting. Prefer aclose()
+    from async code. Clients are created again on the next request.
+    """
+    self._executor.close()
+    with self._clients_lock:
+      client, self._client = self._client, None
+      entries = list(self._async_clients.values())
+      self._async_clients.clear()
+    if client is not None:
+      client.close()
+    for loop, async_client in entries:
+      if loop.is_closed():
+        continue
+      if loop.is_running():
+        asyncio.run_coroutine_threadsafe(async_client.close(), loop)
+      else:
+        loop.run_until_complete(async_client.close())
+
+  async def aclose(self) -> None:
+    """Closes the async client of the running loop, then calls close()."""
+    loop = asyncio.get_running_loop()
+    with self._clients_lock:
+      entry = self._async_clients.pop(id(loop), None)
+    if entry is not None and entry[0] is loop:
+      await entry[1].close()
+    self.close()
+
+  async def ainfer(
+      self, batch_prompts: Sequence[str], **kwargs
+  ) -> list[Sequence[core_types.ScoredOutput]]:
+    """Asynchronously runs inference on a list of prompts via OpenAI's API.
+
+    Uses an openai.AsyncOpenAI client per running loop, kept across calls,
+    whose own retries are disabled. Call aclose() before the loop ends to
+    close it. With adaptive_concurrency, requests go through the limiter
+    shared with infer(); otherwise at most max_workers requests of the batch
+    are awaited concurrently. Each prompt is retried on its own according to
+    retry_policy, backing off without blocking the loop.
+
+    Args:
+      batch_prompts: A list of string prompts.
+      **kwargs: Additional generation params (temperature, top_p, etc.)
+
+    Returns:
+      Lists of ScoredOutputs, in prompt order.
+
+    Raises:
+      BatchInferenceError: If a prompt fails after its retries and
+        retry_policy.on_exhausted is OnExhausted.RAISE.
+    """
+    config = self._build_config(kwargs)
+    return await retry.arun_batch(
+        lambda prompt: self._arun_prompt(prompt, config.copy()),
+        batch_prompts,
+        self.retry_policy,
+        max_concurrency=(
+            self._limiter.max_limit
+            if self._limiter is not None
+            else self.max_workers
+        ),
+        retryable_types=self._retryable_types,
+        on_failure=self._failures.append,
+    )
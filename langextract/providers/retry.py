@@ -0,0 +1,458 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-prompt retries and partial-batch recovery for provider inference.
+
+Each prompt of a batch is retried on its own with exponential backoff and
+jitter, honoring the server's Retry-After header. A prompt that still fails
+does not discard the results of the other prompts: with OnExhausted.EMPTY it
+yields an output of None and the batch continues, and with OnExhausted.RAISE
+the other results that completed are attached to the BatchInferenceError.
+iter_batch runs a batch on worker threads and arun_batch on the running event
+loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+import concurrent.futures
+import dataclasses
+import datetime
+import email.utils
+import enum
+import random
+import threading
+from typing import Final
+
+from absl import logging
+
+from langextract.core import exceptions
+from langextract.core import types as core_types
+from langextract.providers import concurrency
+
+# Request timeouts, rate limits and transient server errors.
+_RETRYABLE_STATUS_CODES: Final[frozenset[int]] = frozenset(
+    {408, 429, 500, 502, 503, 504}
+)
+
+
+class OnExhausted(enum.Enum):
+  """What to do with a prompt that still fails after its retries."""
+
+  RAISE = 'raise'
+  EMPTY = 'empty'
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class RetryPolicy:
+  """Retry behavior for the prompts of a batch.
+
+  Attributes:
+    max_attempts: Attempts per prompt, including the first. 1 disables
+      retries.
+    initial_delay: Backoff before the first retry, in seconds.
+    max_delay: Upper bound of a backoff, including one requested by the
+      server through Retry-After.
+    multiplier: Growth factor of the backoff after each retry.
+    jitter: Whether to draw each backoff uniformly between 0 and its
+      exponential value, so that throttled clients do not retry in lockstep.
+    on_exhausted: Whether a prompt failing after max_attempts raises a
+      BatchInferenceError or yields an empty result and is recorded as a
+      PromptFailure.
+  """
+
+  max_attempts: int = 3
+  initial_delay: float = 1.0
+  max_delay: float = 60.0
+  multiplier: float = 2.0
+  jitter: bool = True
+  on_exhausted: OnExhausted = OnExhausted.RAISE
+
+  def __post_init__(self):
+    if self.max_attempts < 1:
+      raise ValueError('max_attempts must be a positive integer.')
+
+  def backoff(self, retry: int, retry_after: float | None = None) -> float:
+    """Returns the delay before a retry.
+
+    Args:
+      retry: Number of the retry, starting at 1.
+      retry_after: Delay requested by the server, if any.
+
+    Returns:
+      The delay in seconds.
+    """
+    delay = min(
+        self.max_delay, self.initial_delay * self.multiplier ** (retry - 1)
+    )
+    if self.jitter:
+      delay = random.uniform(0, delay)
+    if retry_after is not None:
+      delay = max(delay, min(retry_after, self.max_delay))
+    return delay
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class PromptFailure:
+  """A prompt that failed after all its attempts.
+
+  Attributes:
+    index: Index of the prompt in its batch.
+    prompt: The prompt.
+    error: The error of the last attempt.
+    attempts: Number of attempts made.
+  """
+
+  index: int
+  prompt: str
+  error: Exception
+  attempts: int
+
+
+def is_retryable_error(
+    error: BaseException,
+    retryable_types: tuple[type[BaseException], ...] = (),
+) -> bool:
+  """Whether a failed request may succeed if sent again.
+
+  Args:
+    error: The error raised by a request.
+    retryable_types: Additional error types to retry, such as the connection
+      errors of a provider SDK.
+
+  Returns:
+    True for timeouts, rate limits, transient server errors and connection
+    errors, including when wrapped by another error.
+  """
+  retryable_types += (ConnectionError, TimeoutError)
+  if any(
+      isinstance(current, retryable_types)
+      for current in concurrency.error_chain(error)
+  ):
+    return True
+  return any(
+      status in _RETRYABLE_STATUS_CODES
+      for status in concurrency.status_codes(error)
+  )
+
+
+def _parse_retry_after(value: str) -> float | None:
+  try:
+    return max(0.0, float(value))
+  except ValueError:
+    pass
+  try:
+    date = email.utils.parsedate_to_datetime(value)
+  except (TypeError, ValueError):
+    return None
+  if date.tzinfo is None:
+    date = date.replace(tzinfo=datetime.timezone.utc)
+  now = datetime.datetime.now(tz=datetime.timezone.utc)
+  return max(0.0, (date - now).total_seconds())
+
+
+def retry_after(error: BaseException) -> float | None:
+  """Returns the delay requested by the server through Retry-After.
+
+  Reads the `retry-after-ms` and `retry-after` headers of the HTTP response
+  attached to the error or an error it wraps. Retry-After may be a number of
+  seconds or an HTTP date.
+
+  Args:
+    error: The error raised by a request.
+
+  Returns:
+    The delay in seconds, or None if the server did not request one.
+  """
+  for current in concurrency.error_chain(error):
+    headers = getattr(getattr(current, 'response', None), 'headers', None)
+    if not headers:
+      continue
+    try:
+      milliseconds = headers.get('retry-after-ms')
+      seconds = headers.get('retry-after')
+    except AttributeError:
+      continue
+    if milliseconds is not None:
+      try:
+        return max(0.0, float(milliseconds) / 1000)
+      except (TypeError, ValueError):
+        pass
+    if seconds is not None:
+      return _parse_retry_after(str(seconds))
+  return None
+
+
+@dataclasses.dataclass(slots=True)
+class _Outcome:
+  output: core_types.ScoredOutput | None = None
+  error: Exception | None = None
+  attempts: int = 0
+
+
+def _call_with_retries(
+    fn: Callable[[], core_types.ScoredOutput],
+    policy: RetryPolicy,
+    retryable_types: tuple[type[BaseException], ...],
+    cancelled: threading.Event,
+) -> _Outcome:
+  """Calls fn, retrying retryable errors with backoff until cancelled."""
+  attempt = 0
+  while True:
+    attempt += 1
+    try:
+      return _Outcome(output=fn(), attempts=attempt)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      if attempt >= policy.max_attempts or not is_retryable_error(
+          e, retryable_types
+      ):
+        return _Outcome(error=e, attempts=attempt)
+      delay = policy.backoff(attempt, retry_after(e))
+      logging.warning(
+          'Attempt %d of %d failed (%s); retrying in %.1fs.',
+          attempt,
+          policy.max_attempts,
+          e,
+          delay,
+      )
+      if cancelled.wait(delay):
+        return _Outcome(error=e, attempts=attempt)
+
+
+async def _acall_with_retries(
+    fn: Callable[[], Awaitable[core_types.ScoredOutput]],
+    policy: RetryPolicy,
+    retryable_types: tuple[type[BaseException], ...],
+    cancelled: asyncio.Event,
+    semaphore: asyncio.Semaphore,
+) -> _Outcome:
+  """Awaits fn, retrying retryable errors with backoff until cancelled.
+
+  Each attempt holds a slot of semaphore; backoffs do not.
+  """
+  attempt = 0
+  while True:
+    attempt += 1
+    try:
+      async with semaphore:
+        return _Outcome(output=await fn(), attempts=attempt)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+      if attempt >= policy.max_attempts or not is_retryable_error(
+          e, retryable_types
+      ):
+        return _Outcome(error=e, attempts=attempt)
+      delay = policy.backoff(attempt, retry_after(e))
+      logging.warning(
+          'Attempt %d of %d failed (%s); retrying in %.1fs.',
+          attempt,
+          policy.max_attempts,
+          e,
+          delay,
+      )
+      await asyncio.sleep(delay)
+      if cancelled.is_set():
+        return _Outcome(error=e, attempts=attempt)
+
+
+def iter_batch(
+    fn: Callable[[str], core_types.ScoredOutput],
+    batch_prompts: Sequence[str],
+    policy: RetryPolicy,
+    executor: concurrent.futures.Executor | None = None,
+    ordered: bool = True,
+    retryable_types: tuple[type[BaseException], ...] = (),
+    on_failure: Callable[[PromptFailure], None] | None = None,
+) -> Iterator[tuple[int, list[core_types.ScoredOutput]]]:
+  """Runs fn on each prompt with retries, yielding every successful result.
+
+  When a prompt fails after its retries, it is passed to on_failure. With
+  OnExhausted.EMPTY it yields [ScoredOutput()] and the batch continues. With
+  OnExhausted.RAISE prompts that have not started are skipped, those in
+  flight are awaited, and their results are attached to the raised error
+  together with any others not yet yielded.
+
+  Args:
+    fn: Makes one attempt for a prompt.
+    batch_prompts: The prompts.
+    policy: Retry policy of each prompt.
+    executor: Runs the prompts in parallel if given, else they run in the
+      calling thread.
+    ordered: If True, yields in prompt order rather than as completed.
+    retryable_types: Additional error types to retry.
+    on_failure: Called with each prompt that failed after its retries.
+
+  Yields:
+    Tuples of (prompt index, list of ScoredOutputs).
+
+  Raises:
+    BatchInferenceError: With OnExhausted.RAISE, when a prompt failed.
+  """
+  stop = threading.Event()
+
+  def run(prompt: str) -> _Outcome:
+    if stop.is_set():
+      return _Outcome()
+    return _call_with_retries(lambda: fn(prompt), policy, retryable_types, stop)
+
+  def record(index: int, outcome: _Outcome) -> None:
+    if on_failure is not None:
+      on_failure(
+          PromptFailure(
+              index=index,
+              prompt=batch_prompts[index],
+              error=outcome.error,
+              attempts=outcome.attempts,
+          )
+      )
+
+  if executor is None:
+    outcomes: Iterable[tuple[int, _Outcome]] = (
+        (index, run(prompt)) for index, prompt in enumerate(batch_prompts)
+    )
+  else:
+    outcomes = concurrency.run_in_pool(
+        executor, run, batch_prompts, ordered=ordered
+    )
+
+  for index, outcome in outcomes:
+    if outcome.error is None:
+      yield index, [outcome.output]
+      continue
+    record(index, outcome)
+    if policy.on_exhausted is OnExhausted.EMPTY:
+      logging.error(
+          'Prompt %d failed after %d attempts; yielding an empty result: %s',
+          index,
+          outcome.attempts,
+          outcome.error,
+      )
+      yield index, [core_types.ScoredOutput()]
+      continue
+    stop.set()
+    # Completed results of the remaining prompts, kept for the caller.
+    results = {}
+    for other_index, other in outcomes:
+      if other.error is not None:
+        record(other_index, other)
+      elif other.output is not None:
+        results[other_index] = [other.output]
+    raise exceptions.BatchInferenceError(
+        f'Inference failed for prompt {index} after {outcome.attempts}'
+        f' attempts: {outcome.error}',
+        original=outcome.error,
+        index=index,
+        results=results,
+    ) from outcome.error
+
+
+async def arun_batch(
+    fn: Callable[[str], Awaitable[core_types.ScoredOutput]],
+    batch_prompts: Sequence[str],
+    policy: RetryPolicy,
+    max_concurrency: int,
+    retryable_types: tuple[type[BaseException], ...] = (),
+    on_failure: Callable[[PromptFailure], None] | None = None,
+) -> list[list[core_types.ScoredOutput]]:
+  """Awaits fn on each prompt with retries; the async version of iter_batch.
+
+  Prompts run concurrently on the running loop, with at most max_concurrency
+  attempts in flight, and back off with asyncio.sleep. Failed prompts are
+  passed to on_failure in prompt order once the batch settles. With
+  OnExhausted.EMPTY their result is [ScoredOutput()]. With OnExhausted.RAISE
+  prompts that have not started are skipped, and the results of the others
+  are attached to the raised error.
+
+  Args:
+    fn: Makes one attempt for a prompt.
+    batch_prompts: The prompts.
+    policy: Retry policy of each prompt.
+    max_concurrency: Maximum number of attempts awaited at once.
+    retryable_types: Additional error types to retry.
+    on_failure: Called with each prompt that failed after its retries.
+
+  Returns:
+    One list of ScoredOutputs per prompt, in prompt order.
+
+  Raises:
+    BatchInferenceError: With OnExhausted.RAISE, for the first prompt that
+      failed.
+  """
+  stop = asyncio.Event()
+  semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+  async def run(prompt: str) -> _Outcome:
+    if stop.is_set():
+      return _Outcome()
+    outcome = await _acall_with_retries(
+        lambda: fn(prompt), policy, retryable_types, stop, semaphore
+    )
+    if outcome.error is not None and policy.on_exhausted is OnExhausted.RAISE:
+      stop.set()
+    return outcome
+
+  settled = await asyncio.gather(
+      *(run(prompt) for prompt in batch_prompts), return_exceptions=True
+  )
+  outcomes = []
+  for outcome in settled:
+    if isinstance(outcome, BaseException):
+      # Raised outside of fn, e.g. the prompt's task was cancelled.
+      outcome = _Outcome(error=outcome, attempts=1)
+    outcomes.append(outcome)
+
+  failed = []
+  for index, outcome in enumerate(outcomes):
+    if outcome.error is None:
+      continue
+    failed.append(index)
+    if on_failure is not None:
+      on_failure(
+          PromptFailure(
+              index=index,
+              prompt=batch_prompts[index],
+              error=outcome.error,
+              attempts=outcome.attempts,
+          )
+      )
+  if not failed:
+    return [[outcome.output] for outcome in outcomes]
+
+  if policy.on_exhausted is OnExhausted.EMPTY:
+    for index in failed:
+      logging.error(
+          'Prompt %d failed after %d attempts; yielding an empty result: %s',
+          index,
+          outcomes[index].attempts,
+          outcomes[index].error,
+      )
+    return [
+        [core_types.ScoredOutput()]
+        if outcome.error is not None
+        else [outcome.output]
+        for outcome in outcomes
+    ]
+
+  first = outcomes[failed[0]]
+  raise exceptions.BatchInferenceError(
+      f'Inference failed for prompt {failed[0]} after {first.attempts}'
+      f' attempts: {first.error}',
+      original=first.error,
+      index=failed[0],
+      results={
+          index: [outcome.output]
+          for index, outcome in enumerate(outcomes)
+          if outcome.error is None and outcome.output is not None
+      },
+  ) from first.error
@@ -21,6 +21,7 @@ transform the textual output of an LLM into structured data.
 import abc
 import collections
 from collections.abc import Iterator, Mapping, Sequence
+import copy
 import difflib
 import functools
 import itertools
@@ -28,6 +29,7 @@ import json
 import operator
 
 from absl import logging
+import numpy as np
 import yaml
 
 from langextract.core import data
@@ -36,6 +38,9 @@ from langextract.core import schema
 from langextract.core import tokenizer
 
 _FUZZY_ALIGNMENT_MIN_THRESHOLD = 0.75
+# Indexed fuzzy alignment only scores windows of up to this many times the
+# extraction's token count.
+_FUZZY_ALIGNMENT_WINDOW_FACTOR = 2
 
 
 class AbstractResolver(abc.ABC):
@@ -117,6 +122,7 @@ class AbstractResolver(abc.ABC):
       enable_fuzzy_alignment: bool = True,
       fuzzy_alignment_threshold: float = _FUZZY_ALIGNMENT_MIN_THRESHOLD,
       accept_match_lesser: bool = True,
+      tokenized_text: tokenizer.TokenizedText | None = None,
       **kwargs,
   ) -> Iterator[data.Extraction]:
     """Aligns extractions with source text, setting token/char intervals and alignment status.
@@ -144,6 +150,10 @@ class AbstractResolver(abc.ABC):
         (0-1).
       accept_match_lesser: Whether to accept partial exact matches (MATCH_LESSER
         status).
+      tokenized_text: Optional existing tokenization of `source_text`, such as
+        a TokenizedText.slice() of the document for the chunk, whose first
+        token starts at the beginning of `source_text`. Avoids tokenizing the
+        source text again.
       **kwargs: Additional keyword arguments for provider-specific alignment.
 
     Yields:
@@ -158,6 +168,97 @@ class ResolverParsingError(exceptions.LangExtractError):
   """Error raised when content cannot be parsed as the given format."""
 
 
+class AlignmentCache:
+  """Alignment results shared by the extraction passes over the same chunks.
+
+  Extraction passes over a chunk often return the same extraction texts. The
+  result of aligning each one is keyed by the chunk, the extraction text with
+  case and whitespace normalized, and the occurrence of that text among the
+  extractions aligned together, so that repeated mentions in one output still
+  align to successive positions in the chunk.
+  """
+
+  def __init__(self):
+    self._results: dict[
+        tuple[tuple[int, int, str], str, int],
+        tuple[
+            tokenizer.TokenInterval | None,
+            data.CharInterval | None,
+            data.AlignmentStatus,
+        ]
+        | None,
+    ] = {}
+    self.hits = 0
+    self.misses = 0
+
+  def __len__(self) -> int:
+    return len(self._results)
+
+  @property
+  def hit_rate(self) -> float:
+    """Fraction of lookups answered from the cache."""
+    lookups = self.hits + self.misses
+    return self.hits / lookups if lookups else 0.0
+
+  def keys(
+      self,
+      extractions: Sequence[data.Extraction],
+      source_text: str,
+      token_offset: int,
+      char_offset: int,
+  ) -> list[tuple[tuple[int, int, str], str, int]]:
+    """Returns the cache key of each extraction aligned to the chunk."""
+    chunk_key = (token_offset, char_offset, source_text)
+    occurrences: collections.Counter[str] = collections.Counter()
+    keys = []
+    for extraction in extractions:
+      text = " ".join(extraction.extraction_text.lower().split())
+      keys.append((chunk_key, text, occurrences[text]))
+      occurrences[text] += 1
+    return keys
+
+  def apply(
+      self,
+      key: tuple[tuple[int, int, str], str, int],
+      extraction: data.Extraction,
+  ) -> bool:
+    """Sets the cached alignment on the extraction.
+
+    Args:
+      key: Cache key of the extraction.
+      extraction: The extraction to update.
+
+    Returns:
+      Whether the key was cached.
+    """
+    if key not in self._results:
+      self.misses += 1
+      return False
+    self.hits += 1
+    result = self._results[key]
+    if result is not None:
+      token_interval, char_interval, alignment_status = result
+      extraction.token_interval = copy.copy(token_interval)
+      extraction.char_interval = copy.copy(char_interval)
+      extraction.alignment_status = alignment_status
+    return True
+
+  def store(
+      self,
+      key: tuple[tuple[int, int, str], str, int],
+      extraction: data.Extraction,
+  ) -> None:
+    """Caches the alignment of an extraction; unaligned ones are kept as is."""
+    if extraction.alignment_status is None:
+      self._results[key] = None
+    else:
+      self._results[key] = (
+          copy.copy(extraction.token_interval),
+          copy.copy(extraction.char_interval),
+          extraction.alignment_status,
+      )
+
+
 class Resolver(AbstractResolver):
   """Resolver for YAML/JSON-based information extraction.
 
@@ -247,6 +348,9 @@ class Resolver(AbstractResolver):
       enable_fuzzy_alignment: bool = True,
       fuzzy_alignment_threshold: float = _FUZZY_ALIGNMENT_MIN_THRESHOLD,
       accept_match_lesser: bool = True,
+      tokenized_text: tokenizer.TokenizedText | None = None,
+      exhaustive_fuzzy_alignment: bool = False,
+      alignment_cache: AlignmentCache | None = None,
       **kwargs,
   ) -> Iterator[data.Extraction]:
     """Aligns annotated extractions with source text.
@@ -267,6 +371,15 @@ class Resolver(AbstractResolver):
         alignment.
       accept_match_lesser: Whether to accept partial exact matches (MATCH_LESSER
         status).
+      tokenized_text: Optional existing tokenization of `source_text` whose
+        first token starts at the beginning of `source_text`, e.g. a
+        TokenizedText.slice() of the document for the chunk.
+      exhaustive_fuzzy_alignment: Score windows of every size during fuzzy
+        alignment instead of only windows of up to twice the extraction's
+        token count. Slower; kept for comparing results.
+      alignment_cache: Optional cache of alignment results shared with other
+        calls for the same chunk, e.g. by the passes of a multi-pass
+        extraction. Extractions found in it are not aligned again.
       **kwargs: Additional parameters.
 
     Yields:
@@ -280,25 +393,42 @@ class Resolver(AbstractResolver):
           " process."
       )
       return
-    else:
-      extractions_group = [extractions]
-
-    aligner = WordAligner()
-    aligned_yaml_extractions = aligner.align_extractions(
-        extractions_group,
-        source_text,
-        token_offset,
-        char_offset or 0,
-        enable_fuzzy_alignment=enable_fuzzy_alignment,
-        fuzzy_alignment_threshold=fuzzy_alignment_threshold,
-        accept_match_lesser=accept_match_lesser,
-    )
-    logging.debug(
-        "Aligned extractions count: %d",
-        sum(len(group) for group in aligned_yaml_extractions),
-    )
 
-    for extraction in itertools.chain(*aligned_yaml_extractions):
+    unaligned = list(extractions)
+    if alignment_cache is not None:
+      cache_keys = alignment_cache.keys(
+          extractions, source_text, token_offset, char_offset or 0
+      )
+      unaligned_keys = []
+      unaligned = []
+      for key, extraction in zip(cache_keys, extractions):
+        if not alignment_cache.apply(key, extraction):
+          unaligned_keys.append(key)
+          unaligned.append(extraction)
+
+    if unaligned:
+      aligner = WordAligner()
+      aligned_yaml_extractions = aligner.align_extractions(
+          [unaligned],
+          source_text,
+          token_offset,
+          char_offset or 0,
+          enable_fuzzy_alignment=enable_fuzzy_alignment,
+          fuzzy_alignment_threshold=fuzzy_alignment_threshold,
+          accept_match_lesser=accept_match_lesser,
+          tokenized_text=tokenized_text,
+          exhaustive_fuzzy_alignment=exhaustive_fuzzy_alignment,
+      )
+      logging.debug(
+          "Aligned extractions count: %d",
+          sum(len(group) for group in aligned_yaml_extractions),
+      )
+      if alignment_cache is not None:
+        # The aligner updates the extractions in place.
+        for key, extraction in zip(unaligned_keys, unaligned):
+          alignment_cache.store(key, extraction)
+
+    for extraction in extractions:
       logging.debug("Yielding aligned extraction: %s", extraction)
       yield extraction
 
@@ -521,6 +651,25 @@ class Resolver(AbstractResolver):
     return processed_extractions
 
 
+class _SourceTokenIndex:
+  """Normalized source tokens of a chunk, interned to integer ids."""
+
+  def __init__(self, source_tokens: Sequence[str]):
+    self.vocabulary: dict[str, int] = {}
+    token_ids = [
+        self.vocabulary.setdefault(
+            _normalize_token(token), len(self.vocabulary)
+        )
+        for token in source_tokens
+    ]
+    self.token_id_list = token_ids
+    self.token_ids = np.array(token_ids, dtype=np.intp)
+
+  def intern(self, tokens_norm: Sequence[str]) -> list[int]:
+    """Maps normalized tokens to ids; tokens absent from the chunk get -1."""
+    return [self.vocabulary.get(token, -1) for token in tokens_norm]
+
+
 class WordAligner:
   """Aligns words between two sequences of tokens using Python's difflib."""
 
@@ -581,15 +730,24 @@ class WordAligner:
       token_offset: int,
       char_offset: int,
       fuzzy_alignment_threshold: float = _FUZZY_ALIGNMENT_MIN_THRESHOLD,
+      extraction_tokens: list[str] | None = None,
+      source_index: _SourceTokenIndex | None = None,
+      exhaustive: bool = False,
   ) -> data.Extraction | None:
     """Fuzzy-align an extraction using difflib.SequenceMatcher on tokens.
 
-    The algorithm scans every candidate window in `source_tokens` and selects
-    the window with the highest SequenceMatcher `ratio`. It uses an efficient
-    token-count intersection as a fast pre-check to discard windows that cannot
-    meet the alignment threshold. A match is accepted when the ratio is ≥
-    `fuzzy_alignment_threshold`. This only runs on unmatched extractions, which
-    is usually a small subset of the total extractions.
+    The algorithm scores candidate windows in `source_tokens` and selects the
+    smallest, earliest window with the highest SequenceMatcher match ratio.
+    Candidate windows span at most _FUZZY_ALIGNMENT_WINDOW_FACTOR times the
+    extraction's token count. The source tokens are interned to integer ids,
+    and the token-count overlap of every window of a size with the extraction
+    comes from cumulative histograms of the extraction's ids over the chunk;
+    only windows whose overlap meets the alignment threshold and can beat the
+    best ratio so far are scored. With `exhaustive`, every window of every
+    size is scanned instead, with a token-count intersection as the
+    pre-check. A match is accepted when the ratio is ≥
+    `fuzzy_alignment_threshold`. This only runs on unmatched extractions,
+    which is usually a small subset of the total extractions.
 
     Args:
       extraction: The extraction to align.
@@ -598,14 +756,21 @@ class WordAligner:
       token_offset: The token offset of the current chunk.
       char_offset: The character offset of the current chunk.
       fuzzy_alignment_threshold: The minimum ratio for a fuzzy match.
+      extraction_tokens: Lowercased tokens of the extraction text, if already
+        computed.
+      source_index: Index of `source_tokens`, shared across the extractions of
+        a chunk. Built on demand if not given.
+      exhaustive: Whether to scan all windows of every size instead of the
+        bounded candidate windows.
 
     Returns:
       The aligned data.Extraction if successful, None otherwise.
     """
 
-    extraction_tokens = list(
-        _tokenize_with_lowercase(extraction.extraction_text)
-    )
+    if extraction_tokens is None:
+      extraction_tokens = list(
+          _tokenize_with_lowercase(extraction.extraction_text)
+      )
     # Work with lightly stemmed tokens so pluralisation doesn't block alignment
     extraction_tokens_norm = [_normalize_token(t) for t in extraction_tokens]
 
@@ -618,56 +783,17 @@ class WordAligner:
         len(extraction_tokens),
     )
 
-    best_ratio = 0.0
-    best_span: tuple[int, int] | None = None  # (start_idx, window_size)
-
-    len_e = len(extraction_tokens)
-    max_window = len(source_tokens)
-
-    extraction_counts = collections.Counter(extraction_tokens_norm)
-    min_overlap = int(len_e * fuzzy_alignment_threshold)
-
-    matcher = difflib.SequenceMatcher(autojunk=False, b=extraction_tokens_norm)
-
-    for window_size in range(len_e, max_window + 1):
-      if window_size > len(source_tokens):
-        break
-
-      # Initialize for sliding window
-      window_deque = collections.deque(source_tokens[0:window_size])
-      window_counts = collections.Counter(
-          [_normalize_token(t) for t in window_deque]
+    min_overlap = int(len(extraction_tokens) * fuzzy_alignment_threshold)
+    if exhaustive:
+      best_ratio, best_span = _exhaustive_fuzzy_window(
+          source_tokens, extraction_tokens_norm, min_overlap
+      )
+    else:
+      if source_index is None:
+        source_index = _SourceTokenIndex(source_tokens)
+      best_ratio, best_span = _indexed_fuzzy_window(
+          source_index, extraction_tokens_norm, min_overlap
       )
-
-      for start_idx in range(len(source_tokens) - window_size + 1):
-        # Optimization: check if enough overlapping tokens exist before expensive
-        # sequence matching. This is an upper bound on the match count.
-        if (extraction_counts & window_counts).total() >= min_overlap:
-          window_tokens_norm = [_normalize_token(t) for t in window_deque]
-          matcher.set_seq1(window_tokens_norm)
-          matches = sum(size for _, _, size in matcher.get_matching_blocks())
-          if len_e > 0:
-            ratio = matches / len_e
-          else:
-            ratio = 0.0
-          if ratio > best_ratio:
-            best_ratio = ratio
-            best_span = (start_idx, window_size)
-
-        # Slide the window to the right
-        if start_idx + window_size < len(source_tokens):
-          # Remove the leftmost token from the count
-          old_token = window_deque.popleft()
-          old_token_norm = _normalize_token(old_token)
-          window_counts[old_token_norm] -= 1
-          if window_counts[old_token_norm] == 0:
-            del window_counts[old_token_norm]
-
-          # Add the new rightmost token to the deque and count
-          new_token = source_tokens[start_idx + window_size]
-          window_deque.append(new_token)
-          new_token_norm = _normalize_token(new_token)
-          window_counts[new_token_norm] += 1
 
     if best_span and best_ratio >= fuzzy_alignment_threshold:
       start_idx, window_size = best_span
@@ -678,11 +804,10 @@ class WordAligner:
             end_index=start_idx + window_size + token_offset,
         )
 
-        start_token = tokenized_text.tokens[start_idx]
-        end_token = tokenized_text.tokens[start_idx + window_size - 1]
         extraction.char_interval = data.CharInterval(
-            start_pos=char_offset + start_token.char_interval.start_pos,
-            end_pos=char_offset + end_token.char_interval.end_pos,
+            start_pos=char_offset + tokenized_text.starts[start_idx],
+            end_pos=char_offset
+            + tokenized_text.ends[start_idx + window_size - 1],
         )
 
         extraction.alignment_status = data.AlignmentStatus.MATCH_FUZZY
@@ -705,6 +830,8 @@ class WordAligner:
       enable_fuzzy_alignment: bool = True,
       fuzzy_alignment_threshold: float = _FUZZY_ALIGNMENT_MIN_THRESHOLD,
       accept_match_lesser: bool = False,
+      tokenized_text: tokenizer.TokenizedText | None = None,
+      exhaustive_fuzzy_alignment: bool = False,
   ) -> Sequence[Sequence[data.Extraction]]:
     """Aligns extractions with their positions in the source text.
 
@@ -731,6 +858,12 @@ class WordAligner:
         (0-1).
       accept_match_lesser: Whether to accept partial exact matches (MATCH_LESSER
         status).
+      tokenized_text: Optional existing tokenization of `source_text`, e.g. a
+        zero-copy TokenizedText.slice() of the document. Its first token must
+        start at the beginning of `source_text`; positions are taken relative
+        to it. When None, `source_text` is tokenized.
+      exhaustive_fuzzy_alignment: Whether fuzzy alignment scans every window
+        instead of the bounded candidate windows.
 
     Returns:
       A sequence of extractions aligned with the source text, including token
@@ -745,20 +878,36 @@ class WordAligner:
       logging.info("No extraction groups provided; returning empty list.")
       return []
 
-    source_tokens = list(_tokenize_with_lowercase(source_text))
+    if tokenized_text is None:
+      tokenized_text = tokenizer.tokenize(source_text)
+    elif tokenized_text.num_tokens:
+      # Positions in a document slice are relative to the document text.
+      char_offset -= tokenized_text.starts[0]
+    source_tokens = _lowercase_tokens(tokenized_text)
 
-    delim_len = len(list(_tokenize_with_lowercase(delim)))
+    delim_tokens = list(_tokenize_with_lowercase(delim))
+    delim_len = len(delim_tokens)
     if delim_len != 1:
       raise ValueError(f"Delimiter {delim!r} must be a single token.")
 
     logging.debug("Using delimiter %r for extraction alignment", delim)
 
-    extraction_tokens = _tokenize_with_lowercase(
-        f" {delim} ".join(
-            extraction.extraction_text
-            for extraction in itertools.chain(*extraction_groups)
-        )
-    )
+    # Each extraction text is tokenized once per call; the delimiter is
+    # surrounded by spaces, so joining the token lists with the delimiter
+    # token equals tokenizing the delimited concatenation.
+    extraction_token_cache: dict[str, list[str]] = {}
+
+    def extraction_text_tokens(extraction: data.Extraction) -> list[str]:
+      text = extraction.extraction_text
+      if text not in extraction_token_cache:
+        extraction_token_cache[text] = list(_tokenize_with_lowercase(text))
+      return extraction_token_cache[text]
+
+    extraction_tokens = []
+    for i, extraction in enumerate(itertools.chain(*extraction_groups)):
+      if i:
+        extraction_tokens.extend(delim_tokens)
+      extraction_tokens.extend(extraction_text_tokens(extraction))
 
     self._set_seqs(source_tokens, extraction_tokens)
 
@@ -780,15 +929,11 @@ class WordAligner:
           )
 
         index_to_extraction_group[extraction_index] = (extraction, group_index)
-        extraction_text_tokens = list(
-            _tokenize_with_lowercase(extraction.extraction_text)
-        )
-        extraction_index += len(extraction_text_tokens) + delim_len
+        extraction_index += len(extraction_text_tokens(extraction)) + delim_len
 
     aligned_extraction_groups: list[list[data.Extraction]] = [
         [] for _ in extraction_groups
     ]
-    tokenized_text = tokenizer.tokenize(source_text)
 
     # Track which extractions were aligned in the exact matching phase
     aligned_extractions = []
@@ -812,22 +957,18 @@ class WordAligner:
       )
 
       try:
-        start_token = tokenized_text.tokens[i]
-        end_token = tokenized_text.tokens[i + n - 1]
         extraction.char_interval = data.CharInterval(
-            start_pos=char_offset + start_token.char_interval.start_pos,
-            end_pos=char_offset + end_token.char_interval.end_pos,
+            start_pos=char_offset + tokenized_text.starts[i],
+            end_pos=char_offset + tokenized_text.ends[i + n - 1],
         )
       except IndexError as e:
         raise IndexError(
             "Failed to align extraction with source text. Extraction token"
-            f" interval {extraction.token_interval} does not match source text"
-            f" tokens {tokenized_text.tokens}."
+            f" interval {extraction.token_interval} does not match the"
+            f" {tokenized_text.num_tokens} source text tokens."
         ) from e
 
-      extraction_text_len = len(
-          list(_tokenize_with_lowercase(extraction.extraction_text))
-      )
+      extraction_text_len = len(extraction_text_tokens(extraction))
       if extraction_text_len < n:
         raise ValueError(
             "Delimiter prevents blocks greater than extraction length: "
@@ -861,6 +1002,11 @@ class WordAligner:
           "Starting fuzzy alignment for %d unaligned extractions",
           len(unaligned_extractions),
       )
+      source_index = (
+          None
+          if exhaustive_fuzzy_alignment
+          else _SourceTokenIndex(source_tokens)
+      )
       for extraction in unaligned_extractions:
         aligned_extraction = self._fuzzy_align_extraction(
             extraction,
@@ -869,6 +1015,9 @@ class WordAligner:
             token_offset,
             char_offset,
             fuzzy_alignment_threshold,
+            extraction_text_tokens(extraction),
+            source_index=source_index,
+            exhaustive=exhaustive_fuzzy_alignment,
         )
         if aligned_extraction:
           aligned_extractions.append(aligned_extraction)
@@ -886,6 +1035,148 @@ class WordAligner:
     return aligned_extraction_groups
 
 
+def _window_match_ratio(
+    matcher: difflib.SequenceMatcher,
+    window_tokens: list[str] | list[int],
+    len_e: int,
+) -> float:
+  """Fraction of the matcher's extraction tokens matched by the window."""
+  matcher.set_seq1(window_tokens)
+  matches = sum(size for _, _, size in matcher.get_matching_blocks())
+  return matches / len_e if len_e > 0 else 0.0
+
+
+def _exhaustive_fuzzy_window(
+    source_tokens: Sequence[str],
+    extraction_tokens_norm: list[str],
+    min_overlap: int,
+) -> tuple[float, tuple[int, int] | None]:
+  """Finds the best fuzzy window by scanning every window size and start.
+
+  Args:
+    source_tokens: Lowercased source tokens.
+    extraction_tokens_norm: Normalized extraction tokens.
+    min_overlap: Minimum token-count overlap for a window to be scored.
+
+  Returns:
+    Tuple of (best ratio, (start index, window size) or None).
+  """
+  best_ratio = 0.0
+  best_span: tuple[int, int] | None = None  # (start_idx, window_size)
+
+  len_e = len(extraction_tokens_norm)
+  max_window = len(source_tokens)
+
+  extraction_counts = collections.Counter(extraction_tokens_norm)
+  matcher = difflib.SequenceMatcher(autojunk=False, b=extraction_tokens_norm)
+
+  for window_size in range(len_e, max_window + 1):
+    if window_size > len(source_tokens):
+      break
+
+    # Initialize for sliding window
+    window_deque = collections.deque(source_tokens[0:window_size])
+    window_counts = collections.Counter(
+        [_normalize_token(t) for t in window_deque]
+    )
+
+    for start_idx in range(len(source_tokens) - window_size + 1):
+      # Optimization: check if enough overlapping tokens exist before expensive
+      # sequence matching. This is an upper bound on the match count.
+      if (extraction_counts & window_counts).total() >= min_overlap:
+        window_tokens_norm = [_normalize_token(t) for t in window_deque]
+        ratio = _window_match_ratio(matcher, window_tokens_norm, len_e)
+        if ratio > best_ratio:
+          best_ratio = ratio
+          best_span = (start_idx, window_size)
+
+      # Slide the window to the right
+      if start_idx + window_size < len(source_tokens):
+        # Remove the leftmost token from the count
+        old_token = window_deque.popleft()
+        old_token_norm = _normalize_token(old_token)
+        window_counts[old_token_norm] -= 1
+        if window_counts[old_token_norm] == 0:
+          del window_counts[old_token_norm]
+
+        # Add the new rightmost token to the deque and count
+        new_token = source_tokens[start_idx + window_size]
+        window_deque.append(new_token)
+        new_token_norm = _normalize_token(new_token)
+        window_counts[new_token_norm] += 1
+
+  return best_ratio, best_span
+
+
+def _indexed_fuzzy_window(
+    source_index: _SourceTokenIndex,
+    extraction_tokens_norm: list[str],
+    min_overlap: int,
+) -> tuple[float, tuple[int, int] | None]:
+  """Finds the best fuzzy window, scoring candidate windows in bulk.
+
+  For each window size up to _FUZZY_ALIGNMENT_WINDOW_FACTOR times the
+  extraction's token count, the token-count overlap of every window with the
+  extraction is computed at once from cumulative histograms of the
+  extraction's token ids over the chunk. The overlap bounds the number of
+  matched tokens, so only windows whose overlap can beat the best ratio so far
+  are scored with SequenceMatcher. Windows are visited in the same order as
+  the exhaustive scan, so ties resolve identically.
+
+  Args:
+    source_index: Interned tokens of the chunk.
+    extraction_tokens_norm: Normalized extraction tokens.
+    min_overlap: Minimum token-count overlap for a window to be scored.
+
+  Returns:
+    Tuple of (best ratio, (start index, window size) or None).
+  """
+  best_ratio = 0.0
+  best_span: tuple[int, int] | None = None
+
+  len_e = len(extraction_tokens_norm)
+  extraction_ids = source_index.intern(extraction_tokens_norm)
+  shared_ids, shared_counts = np.unique(
+      [token_id for token_id in extraction_ids if token_id >= 0],
+      return_counts=True,
+  )
+  # Windows without a shared token have a ratio of zero and never win.
+  min_overlap = max(min_overlap, 1)
+  if shared_counts.sum() < min_overlap:
+    return best_ratio, best_span
+
+  source_ids = source_index.token_ids
+  num_tokens = len(source_ids)
+  # cumulative[k, i] counts occurrences of shared_ids[k] in source_ids[:i].
+  cumulative = np.zeros((len(shared_ids), num_tokens + 1), dtype=np.intp)
+  np.cumsum(source_ids == shared_ids[:, None], axis=1, out=cumulative[:, 1:])
+
+  matcher = difflib.SequenceMatcher(autojunk=False, b=extraction_ids)
+  max_window = min(num_tokens, len_e * _FUZZY_ALIGNMENT_WINDOW_FACTOR)
+
+  for window_size in range(len_e, max_window + 1):
+    if best_ratio >= 1.0:
+      # A larger window can not be strictly better.
+      break
+    window_counts = (
+        cumulative[:, window_size:]
+        - cumulative[:, : num_tokens - window_size + 1]
+    )
+    overlaps = np.minimum(window_counts, shared_counts[:, None]).sum(axis=0)
+    for start_idx in np.flatnonzero(overlaps >= min_overlap).tolist():
+      if overlaps[start_idx] / len_e <= best_ratio:
+        continue
+      window_ids = source_index.token_id_list[
+          start_idx : start_idx + window_size
+      ]
+      ratio = _window_match_ratio(matcher, window_ids, len_e)
+      if ratio > best_ratio:
+        best_ratio = ratio
+        best_span = (start_idx, window_size)
+
+  return best_ratio, best_span
+
+
 def _tokenize_with_lowercase(text: str) -> Iterator[str]:
   """Extract and lowercase tokens from the input text into words.
 
@@ -898,14 +1189,16 @@ def _tokenize_with_lowercase(text: str) -> Iterator[str]:
   Yields:
     Iterator[str]: An iterator over tokenized words.
   """
-  tokenized_pb2 = tokenizer.tokenize(text)
-  original_text = tokenized_pb2.text
-  for token in tokenized_pb2.tokens:
-    start = token.char_interval.start_pos
-    end = token.char_interval.end_pos
-    token_str = original_text[start:end]
-    token_str = token_str.lower()
-    yield token_str
+  yield from _lowercase_tokens(tokenizer.tokenize(text))
+
+
+def _lowercase_tokens(tokenized_text: tokenizer.TokenizedText) -> list[str]:
+  """Returns the lowercased text of every token of a tokenized text."""
+  text = tokenized_text.text
+  return [
+      text[start:end].lower()
+      for start, end in zip(tokenized_text.starts, tokenized_text.ends)
+  ]
 
 
 @functools.lru_cache(maxsize=10000)
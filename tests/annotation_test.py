@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 from collections.abc import Sequence
+import concurrent.futures
 import dataclasses
+import pickle
+import random
 import textwrap
+import threading
 from typing import Type
 from unittest import mock
 
@@ -680,12 +685,36 @@ class AnnotatorMultipleDocumentTest(parameterized.TestCase):
           ],
           batch_length=10,
       ),
+      dict(
+          testcase_name="multiple_documents_pipelined_batches",
+          documents=[
+              {"text": _FIXED_DOCUMENT_CONTENT, "document_id": "doc1"},
+              {"text": _FIXED_DOCUMENT_CONTENT, "document_id": "doc2"},
+              {"text": _FIXED_DOCUMENT_CONTENT, "document_id": "doc3"},
+          ],
+          expected_result=[
+              dataclasses.replace(
+                  _ANNOTATED_DOCUMENT,
+                  document_id="doc1",
+              ),
+              dataclasses.replace(
+                  _ANNOTATED_DOCUMENT,
+                  document_id="doc2",
+              ),
+              dataclasses.replace(
+                  _ANNOTATED_DOCUMENT,
+                  document_id="doc3",
+              ),
+          ],
+          max_batches_in_flight=2,
+      ),
   )
   def test_annotate_documents(
       self,
       documents: Sequence[dict[str, str]],
       expected_result: Sequence[data.AnnotatedDocument],
       batch_length: int = 1,
+      max_batches_in_flight: int = 1,
   ):
     mock_language_model = self.enter_context(
         mock.patch.object(inference, "GeminiLanguageModel", autospec=True)
@@ -724,6 +753,7 @@ class AnnotatorMultipleDocumentTest(parameterized.TestCase):
             max_char_buffer=200,
             batch_length=batch_length,
             debug=False,
+            max_batches_in_flight=max_batches_in_flight,
         )
     )
 
@@ -792,6 +822,548 @@ class AnnotatorMultipleDocumentTest(parameterized.TestCase):
       )
 
 
+class AnnotatorPipelineTest(absltest.TestCase):
+  """Tests for pipelined and continuous inference scheduling."""
+
+  def _make_inference(self, extraction_text: str) -> str:
+    return textwrap.dedent(f"""\
+      ```yaml
+      {schema.EXTRACTIONS_KEY}:
+      - word: "{extraction_text}"
+      ```""")
+
+  def test_next_batch_inferred_while_current_batch_resolves(self):
+    second_batch_started = threading.Event()
+    mock_language_model = mock.create_autospec(
+        inference.GeminiLanguageModel, instance=True
+    )
+
+    def mock_infer(batch_prompts, **kwargs):
+      del kwargs
+      for prompt in batch_prompts:
+        if "Second" in prompt:
+          second_batch_started.set()
+          word = "Second"
+        else:
+          word = "First"
+        yield [
+            inference.ScoredOutput(score=1.0, output=self._make_inference(word))
+        ]
+
+    mock_language_model.infer.side_effect = mock_infer
+    resolver = resolver_lib.Resolver(
+        format_type=data.FormatType.YAML, extraction_index_suffix=None
+    )
+    original_resolve = resolver.resolve
+    overlapped = []
+
+    def slow_resolve(input_text, **kwargs):
+      if "First" in input_text:
+        overlapped.append(second_batch_started.wait(timeout=5))
+      return original_resolve(input_text, **kwargs)
+
+    annotator = annotation.Annotator(
+        language_model=mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+    documents = [
+        data.Document(text="First document.", document_id="doc1"),
+        data.Document(text="Second document.", document_id="doc2"),
+    ]
+
+    with mock.patch.object(resolver, "resolve", side_effect=slow_resolve):
+      results = list(
+          annotator.annotate_documents(
+              documents,
+              resolver=resolver,
+              max_char_buffer=200,
+              batch_length=1,
+              debug=False,
+              max_batches_in_flight=2,
+          )
+      )
+
+    self.assertEqual(overlapped, [True])
+    self.assertEqual([doc.document_id for doc in results], ["doc1", "doc2"])
+    self.assertEqual(
+        [[e.extraction_text for e in doc.extractions] for doc in results],
+        [["First"], ["Second"]],
+    )
+
+  def test_continuous_batching_refills_slots_around_slow_chunk(self):
+    third_chunk_started = threading.Event()
+    mock_language_model = mock.create_autospec(
+        inference.GeminiLanguageModel, instance=True
+    )
+    batch_sizes = []
+    slow_chunk_overtaken = []
+
+    def mock_infer(batch_prompts, **kwargs):
+      del kwargs
+      batch_sizes.append(len(batch_prompts))
+      for prompt in batch_prompts:
+        if "Slow" in prompt:
+          slow_chunk_overtaken.append(third_chunk_started.wait(timeout=5))
+          word = "Slow"
+        elif "Third" in prompt:
+          third_chunk_started.set()
+          word = "Third"
+        else:
+          word = "Fast"
+        yield [
+            inference.ScoredOutput(score=1.0, output=self._make_inference(word))
+        ]
+
+    mock_language_model.infer.side_effect = mock_infer
+    annotator = annotation.Annotator(
+        language_model=mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+    documents = [
+        data.Document(text="Slow document.", document_id="doc1"),
+        data.Document(text="Fast document.", document_id="doc2"),
+        data.Document(text="Third document.", document_id="doc3"),
+    ]
+
+    results = list(
+        annotator.annotate_documents(
+            documents,
+            resolver=resolver_lib.Resolver(
+                format_type=data.FormatType.YAML, extraction_index_suffix=None
+            ),
+            max_char_buffer=200,
+            batch_length=2,
+            debug=False,
+            continuous_batching=True,
+            max_workers=2,
+        )
+    )
+
+    self.assertEqual(slow_chunk_overtaken, [True])
+    self.assertEqual(batch_sizes, [1, 1, 1])
+    self.assertEqual(
+        [doc.document_id for doc in results], ["doc1", "doc2", "doc3"]
+    )
+    self.assertEqual(
+        [[e.extraction_text for e in doc.extractions] for doc in results],
+        [["Slow"], ["Fast"], ["Third"]],
+    )
+
+  def test_each_run_declared_to_language_model(self):
+    mock_language_model = mock.create_autospec(
+        inference.GeminiLanguageModel, instance=True
+    )
+    mock_language_model.infer.side_effect = lambda batch_prompts, **_: iter([
+        [inference.ScoredOutput(score=1.0, output=self._make_inference("x"))]
+        for _ in batch_prompts
+    ])
+    annotator = annotation.Annotator(
+        language_model=mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+    resolver = resolver_lib.Resolver(
+        format_type=data.FormatType.YAML, extraction_index_suffix=None
+    )
+
+    annotator.annotate_text("x", resolver=resolver, extraction_passes=2)
+    annotator.annotate_text("x", resolver=resolver)
+
+    self.assertEqual(mock_language_model.begin_run.call_count, 2)
+
+  def test_prompt_prefix_declared_once_across_batches(self):
+    mock_language_model = mock.create_autospec(
+        inference.GeminiLanguageModel, instance=True
+    )
+    seen_prompts = []
+
+    def mock_infer(batch_prompts, **kwargs):
+      del kwargs
+      for prompt in batch_prompts:
+        seen_prompts.append(prompt)
+        yield [
+            inference.ScoredOutput(score=1.0, output=self._make_inference("x"))
+        ]
+
+    mock_language_model.infer.side_effect = mock_infer
+    annotator = annotation.Annotator(
+        language_model=mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(
+            description="Extract words."
+        ),
+        prompt_prefix_caching=True,
+    )
+    documents = [
+        data.Document(text=f"Document {i}.", document_id=f"doc{i}")
+        for i in range(3)
+    ]
+
+    list(
+        annotator.annotate_documents(
+            documents,
+            resolver=resolver_lib.Resolver(
+                format_type=data.FormatType.YAML, extraction_index_suffix=None
+            ),
+            max_char_buffer=200,
+            batch_length=1,
+            debug=False,
+        )
+    )
+
+    mock_language_model.set_prompt_prefix.assert_called_once_with(
+        "Extract words.\n"
+    )
+    self.assertLen(seen_prompts, 3)
+    for i, prompt in enumerate(seen_prompts):
+      self.assertEqual(f"Extract words.\n\nQ: Document {i}.\nA: ", prompt)
+
+  def test_resolve_processes_match_in_thread_resolution(self):
+    mock_language_model = mock.create_autospec(
+        inference.GeminiLanguageModel, instance=True
+    )
+
+    def mock_infer(batch_prompts, **kwargs):
+      del kwargs
+      for prompt in batch_prompts:
+        word = "Alpha" if "Alpha" in prompt else "Beta"
+        yield [
+            inference.ScoredOutput(score=1.0, output=self._make_inference(word))
+        ]
+
+    mock_language_model.infer.side_effect = mock_infer
+    annotator = annotation.Annotator(
+        language_model=mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+    documents = [
+        data.Document(text="Alpha one. Beta two.", document_id="doc1"),
+        data.Document(text="Beta three.", document_id="doc2"),
+        data.Document(text="Alpha four.", document_id="doc3"),
+    ]
+
+    def annotate(resolve_processes):
+      return list(
+          annotator.annotate_documents(
+              documents,
+              resolver=resolver_lib.Resolver(
+                  format_type=data.FormatType.YAML, extraction_index_suffix=None
+              ),
+              max_char_buffer=12,
+              batch_length=2,
+              debug=False,
+              resolve_processes=resolve_processes,
+          )
+      )
+
+    expected = annotate(resolve_processes=0)
+    actual = annotate(resolve_processes=2)
+
+    self.assertEqual(
+        [doc.document_id for doc in actual], ["doc1", "doc2", "doc3"]
+    )
+    self.assertEqual(
+        [[e.extraction_text for e in doc.extractions] for doc in expected],
+        [["Alpha", "Beta"], ["Beta"], ["Alpha"]],
+    )
+    for expected_doc, actual_doc in zip(expected, actual):
+      self.assertEqual(expected_doc.extractions, actual_doc.extractions)
+
+  def test_resolve_processes_send_tokens_and_resolver_kwargs_only(self):
+    mock_language_model = mock.create_autospec(
+        inference.GeminiLanguageModel, instance=True
+    )
+
+    def mock_infer(batch_prompts, **kwargs):
+      del kwargs
+      for _ in batch_prompts:
+        yield [
+            inference.ScoredOutput(
+                score=1.0, output=self._make_inference("Alpha")
+            )
+        ]
+
+    mock_language_model.infer.side_effect = mock_infer
+    annotator = annotation.Annotator(
+        language_model=mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+    start_methods = []
+    submitted_kwargs = []
+    caches = []
+    alignment_cache_class = resolver_lib.AlignmentCache
+
+    class ThreadProcessPool(concurrent.futures.ThreadPoolExecutor):
+      """Runs the resolve workers in threads, checking what is sent."""
+
+      def __init__(self, max_workers, initializer, initargs, mp_context):
+        start_methods.append(mp_context.get_start_method())
+        super().__init__(
+            max_workers=max_workers, initializer=initializer, initargs=initargs
+        )
+
+      def submit(self, fn, /, *args, **kwargs):
+        pickle.dumps((args, kwargs))
+        submitted_kwargs.append(kwargs)
+        return super().submit(fn, *args, **kwargs)
+
+    def make_cache():
+      cache = alignment_cache_class()
+      caches.append(cache)
+      return cache
+
+    with (
+        mock.patch.object(
+            concurrent.futures, "ProcessPoolExecutor", ThreadProcessPool
+        ),
+        mock.patch.object(
+            resolver_lib, "AlignmentCache", side_effect=make_cache
+        ),
+        mock.patch.object(annotation, "_process_resolver", None),
+    ):
+      result = annotator.annotate_text(
+          "Alpha one. Alpha two.",
+          resolver=resolver_lib.Resolver(
+              format_type=data.FormatType.YAML, extraction_index_suffix=None
+          ),
+          max_char_buffer=12,
+          batch_length=2,
+          extraction_passes=2,
+          resolve_processes=2,
+          max_workers=3,
+          fuzzy_alignment_threshold=0.9,
+      )
+
+    self.assertEqual(
+        [e.extraction_text for e in result.extractions], ["Alpha", "Alpha"]
+    )
+    self.assertEqual(start_methods, ["spawn", "spawn"])
+    self.assertLen(submitted_kwargs, 4)
+    for kwargs, chunk_text in zip(
+        submitted_kwargs, ["Alpha one.", "Alpha two."] * 2
+    ):
+      self.assertEqual(
+          set(kwargs), {"chunk_tokens", "fuzzy_alignment_threshold"}
+      )
+      self.assertEqual(kwargs["chunk_tokens"].text, chunk_text)
+    # The cache shared by the passes is not sent to the workers.
+    self.assertLen(caches, 1)
+    self.assertEqual(caches[0].hits + caches[0].misses, 0)
+
+
+class AnnotatorAsyncTest(absltest.TestCase):
+  """Tests for asynchronous annotation."""
+
+  def _make_inference(self, extraction_text: str) -> str:
+    return textwrap.dedent(f"""\
+      ```yaml
+      {schema.EXTRACTIONS_KEY}:
+      - word: "{extraction_text}"
+      ```""")
+
+  def _make_annotator(self, mock_ainfer) -> annotation.Annotator:
+    mock_language_model = mock.create_autospec(
+        inference.GeminiLanguageModel, instance=True
+    )
+    mock_language_model.ainfer.side_effect = mock_ainfer
+    return annotation.Annotator(
+        language_model=mock_language_model,
+        prompt_template=prompting.PromptTemplateStructured(description=""),
+    )
+
+  def _collect(self, async_iterator):
+    async def collect():
+      return [item async for item in async_iterator]
+
+    return asyncio.run(collect())
+
+  def test_documents_yielded_in_order_with_bounded_concurrency(self):
+    in_flight = 0
+    max_in_flight = 0
+
+    async def mock_ainfer(batch_prompts, **kwargs):
+      nonlocal in_flight, max_in_flight
+      del kwargs
+      in_flight += 1
+      max_in_flight = max(max_in_flight, in_flight)
+      word = "Slow" if "Slow" in batch_prompts[0] else "Fast"
+      # The first chunk finishes last; output must still follow input order.
+      await asyncio.sleep(0.02 if word == "Slow" else 0)
+      in_flight -= 1
+      return [
+          [inference.ScoredOutput(score=1.0, output=self._make_inference(word))]
+      ]
+
+    annotator = self._make_annotator(mock_ainfer)
+    documents = [
+        data.Document(text="Slow document.", document_id="doc1"),
+        data.Document(text="Fast document.", document_id="doc2"),
+        data.Document(text="Fast document.", document_id="doc3"),
+    ]
+
+    results = self._collect(
+        annotator.aannotate_documents(
+            documents,
+            resolver=resolver_lib.Resolver(
+                format_type=data.FormatType.YAML, extraction_index_suffix=None
+            ),
+            max_char_buffer=200,
+            debug=False,
+            max_concurrency=2,
+        )
+    )
+
+    self.assertEqual(max_in_flight, 2)
+    self.assertEqual(
+        [doc.document_id for doc in results], ["doc1", "doc2", "doc3"]
+    )
+    self.assertEqual(
+        [[e.extraction_text for e in doc.extractions] for doc in results],
+        [["Slow"], ["Fast"], ["Fast"]],
+    )
+
+  def test_resolution_runs_off_event_loop(self):
+    loop_thread = threading.get_ident()
+    resolve_threads = []
+
+    async def mock_ainfer(batch_prompts, **kwargs):
+      del batch_prompts, kwargs
+      return [[inference.ScoredOutput(output=self._make_inference("Fast"))]]
+
+    class RecordingResolver(resolver_lib.Resolver):
+
+      def resolve(self, input_text, **kwargs):
+        resolve_threads.append(threading.get_ident())
+        return super().resolve(input_text, **kwargs)
+
+    results = self._collect(
+        self._make_annotator(mock_ainfer).aannotate_documents(
+            [data.Document(text="Fast one. Fast two.", document_id="doc")],
+            resolver=RecordingResolver(
+                format_type=data.FormatType.YAML, extraction_index_suffix=None
+            ),
+            max_char_buffer=10,
+            debug=False,
+        )
+    )
+
+    self.assertEqual(
+        [e.extraction_text for e in results[0].extractions], ["Fast", "Fast"]
+    )
+    self.assertLen(resolve_threads, 2)
+    self.assertNotIn(loop_thread, resolve_threads)
+
+  def test_resolve_processes_resolve_chunks_in_pool(self):
+    submitted = []
+
+    async def mock_ainfer(batch_prompts, **kwargs):
+      del batch_prompts, kwargs
+      return [[inference.ScoredOutput(output=self._make_inference("Fast"))]]
+
+    class ThreadProcessPool(concurrent.futures.ThreadPoolExecutor):
+      """Runs the resolve workers in threads, checking what is sent."""
+
+      def __init__(self, max_workers, initializer, initargs, mp_context):
+        del mp_context
+        super().__init__(
+            max_workers=max_workers, initializer=initializer, initargs=initargs
+        )
+
+      def submit(self, fn, /, *args, **kwargs):
+        pickle.dumps((args, kwargs))
+        submitted.append(args[1])
+        return super().submit(fn, *args, **kwargs)
+
+    with (
+        mock.patch.object(
+            concurrent.futures, "ProcessPoolExecutor", ThreadProcessPool
+        ),
+        mock.patch.object(annotation, "_process_resolver", None),
+    ):
+      results = self._collect(
+          self._make_annotator(mock_ainfer).aannotate_documents(
+              [data.Document(text="Fast one. Fast two.", document_id="doc")],
+              resolver=resolver_lib.Resolver(
+                  format_type=data.FormatType.YAML,
+                  extraction_index_suffix=None,
+              ),
+              max_char_buffer=10,
+              debug=False,
+              resolve_processes=2,
+          )
+      )
+
+    self.assertEqual(
+        [e.extraction_text for e in results[0].extractions], ["Fast", "Fast"]
+    )
+    self.assertEqual(["Fast one.", "Fast two."], sorted(submitted))
+
+  def test_pending_inference_awaited_when_iteration_stops(self):
+    started = []
+
+    async def mock_ainfer(batch_prompts, **kwargs):
+      del kwargs
+      started.append(asyncio.current_task())
+      if "Slow" in batch_prompts[0]:
+        await asyncio.sleep(10)
+      return [[inference.ScoredOutput(output=self._make_inference("Fast"))]]
+
+    annotator = self._make_annotator(mock_ainfer)
+    documents = [
+        data.Document(text="Fast document.", document_id="doc1"),
+        data.Document(text="Fast document.", document_id="doc2"),
+        data.Document(text="Slow document.", document_id="doc3"),
+        data.Document(text="Slow document.", document_id="doc4"),
+    ]
+
+    async def first_document():
+      results = annotator.aannotate_documents(
+          documents,
+          resolver=resolver_lib.Resolver(
+              format_type=data.FormatType.YAML, extraction_index_suffix=None
+          ),
+          max_char_buffer=200,
+          debug=False,
+          max_concurrency=4,
+      )
+      first = await anext(results)
+      await results.aclose()
+      # Checked before asyncio.run cancels whatever is left on the loop.
+      return first, [task.cancelled() for task in started]
+
+    first, cancelled = asyncio.run(first_document())
+
+    self.assertEqual("doc1", first.document_id)
+    self.assertEqual([False, False, True, True], cancelled)
+
+  def test_extraction_passes_merged_per_chunk(self):
+    pass_outputs = iter(["Alice", "Alice", "Bob"])
+
+    async def mock_ainfer(batch_prompts, **kwargs):
+      del batch_prompts, kwargs
+      return [[
+          inference.ScoredOutput(
+              score=1.0, output=self._make_inference(next(pass_outputs))
+          )
+      ]]
+
+    annotator = self._make_annotator(mock_ainfer)
+
+    result = asyncio.run(
+        annotator.aannotate_text(
+            "Alice met Bob.",
+            resolver=resolver_lib.Resolver(
+                format_type=data.FormatType.YAML, extraction_index_suffix=None
+            ),
+            max_char_buffer=200,
+            debug=False,
+            extraction_passes=3,
+        )
+    )
+
+    self.assertEqual(
+        [e.extraction_text for e in result.extractions], ["Alice", "Bob"]
+    )
+
+
 class AnnotatorMultiPassTest(absltest.TestCase):
   """Tests for multi-pass extraction functionality."""
 
@@ -900,6 +1472,231 @@ class AnnotatorMultiPassTest(absltest.TestCase):
     )
     self.assertEqual(doctor_extraction.extraction_text, "Dr. Smith")
 
+  def test_sequential_passes_reuse_alignment_of_repeated_extractions(self):
+    output = textwrap.dedent(f"""\
+        ```yaml
+        {schema.EXTRACTIONS_KEY}:
+        - doctor: "Dr. Smith"
+        - medication: "aspirin"
+        ```""")
+    self.mock_language_model.infer.side_effect = [
+        [[inference.ScoredOutput(score=1.0, output=output)]],
+        [[inference.ScoredOutput(score=1.0, output=output.lower())]],
+    ]
+    resolver = resolver_lib.Resolver(
+        format_type=data.FormatType.YAML, extraction_index_suffix=None
+    )
+    align_extractions = self.enter_context(
+        mock.patch.object(
+            resolver_lib.WordAligner,
+            "align_extractions",
+            autospec=True,
+            side_effect=resolver_lib.WordAligner.align_extractions,
+        )
+    )
+
+    result = self.annotator.annotate_text(
+        "Dr. Smith prescribed aspirin.",
+        resolver=resolver,
+        extraction_passes=2,
+        debug=False,
+    )
+
+    align_extractions.assert_called_once()
+    self.assertEqual(
+        [(e.extraction_text, e.char_interval) for e in result.extractions],
+        [
+            ("Dr. Smith", data.CharInterval(start_pos=0, end_pos=9)),
+            ("aspirin", data.CharInterval(start_pos=21, end_pos=28)),
+        ],
+    )
+
+  def test_concurrent_passes_share_one_batch_and_merge_per_chunk(self):
+    """Test concurrent passes chunk once and merge passes per chunk."""
+    self.mock_language_model.infer.side_effect = [
+        [
+            [
+                inference.ScoredOutput(
+                    score=1.0,
+                    output=textwrap.dedent(f"""\
+                      ```yaml
+                      {schema.EXTRACTIONS_KEY}:
+                      - doctor: "Dr. Smith"
+                      ```"""),
+                )
+            ],
+            [
+                inference.ScoredOutput(
+                    score=1.0,
+                    output=textwrap.dedent(f"""\
+                      ```yaml
+                      {schema.EXTRACTIONS_KEY}:
+                      - patient: "Smith"
+                      - medication: "aspirin"
+                      ```"""),
+                )
+            ],
+        ],
+    ]
+    resolver = resolver_lib.Resolver(
+        format_type=data.FormatType.YAML, extraction_index_suffix=None
+    )
+
+    result = self.annotator.annotate_text(
+        "Dr. Smith prescribed aspirin.",
+        resolver=resolver,
+        extraction_passes=2,
+        concurrent_passes=True,
+        debug=False,
+    )
+
+    self.assertEqual(self.mock_language_model.infer.call_count, 1)
+    batch_prompts = self.mock_language_model.infer.call_args.kwargs[
+        "batch_prompts"
+    ]
+    self.assertLen(batch_prompts, 2)
+    self.assertEqual(batch_prompts[0], batch_prompts[1])
+    self.assertEqual(
+        [e.extraction_text for e in result.extractions],
+        ["Dr. Smith", "aspirin"],
+    )
+
+  def test_concurrent_passes_keep_chunks_of_batch_apart(self):
+    """Test pass outputs are grouped per chunk across a multi-chunk batch."""
+
+    def mock_infer(batch_prompts, **kwargs):
+      del kwargs
+      for index, prompt in enumerate(batch_prompts):
+        word = "Alpha" if "Alpha" in prompt else "Beta"
+        # Only the first pass of each chunk finds an alignable extraction.
+        output = word if index % 2 == 0 else "missing"
+        yield [
+            inference.ScoredOutput(
+                score=1.0,
+                output=textwrap.dedent(f"""\
+                  ```yaml
+                  {schema.EXTRACTIONS_KEY}:
+                  - word: "{output}"
+                  ```"""),
+            )
+        ]
+
+    self.mock_language_model.infer.side_effect = mock_infer
+    resolver = resolver_lib.Resolver(
+        format_type=data.FormatType.YAML, extraction_index_suffix=None
+    )
+    documents = [
+        data.Document(text="Alpha text.", document_id="doc1"),
+        data.Document(text="Beta text.", document_id="doc2"),
+    ]
+
+    results = list(
+        self.annotator.annotate_documents(
+            documents,
+            resolver=resolver,
+            batch_length=2,
+            extraction_passes=2,
+            concurrent_passes=True,
+            debug=False,
+        )
+    )
+
+    self.assertEqual(self.mock_language_model.infer.call_count, 1)
+    self.assertEqual(
+        [
+            [
+                e.extraction_text
+                for e in doc.extractions
+                if e.char_interval is not None
+            ]
+            for doc in results
+        ],
+        [["Alpha"], ["Beta"]],
+    )
+
+  def test_pass_window_yields_documents_before_reading_rest_of_stream(self):
+    """Test windowed passes yield each window before consuming the next."""
+    self.mock_language_model.infer.side_effect = lambda batch_prompts, **_: [
+        [
+            inference.ScoredOutput(
+                score=1.0,
+                output=textwrap.dedent(f"""\
+                  ```yaml
+                  {schema.EXTRACTIONS_KEY}:
+                  - word: "text"
+                  ```"""),
+            )
+        ]
+        for _ in batch_prompts
+    ]
+    resolver = resolver_lib.Resolver(
+        format_type=data.FormatType.YAML, extraction_index_suffix=None
+    )
+    documents_read = []
+
+    def document_stream():
+      for index in range(4):
+        documents_read.append(index)
+        yield data.Document(
+            text=f"Doc {index} text.", document_id=f"doc{index}"
+        )
+
+    results = self.annotator.annotate_documents(
+        document_stream(),
+        resolver=resolver,
+        extraction_passes=2,
+        pass_window_size=2,
+        debug=False,
+    )
+
+    first = next(results)
+    self.assertEqual(first.document_id, "doc0")
+    self.assertEqual(documents_read, [0, 1])
+    self.assertEqual(self.mock_language_model.infer.call_count, 4)
+
+    remaining = list(results)
+    self.assertEqual(
+        [doc.document_id for doc in remaining], ["doc1", "doc2", "doc3"]
+    )
+    self.assertEqual(self.mock_language_model.infer.call_count, 8)
+    self.assertEqual(
+        [e.extraction_text for e in remaining[-1].extractions], ["text"]
+    )
+
+  def test_pass_window_rejects_document_repeated_in_later_window(self):
+    """Test a document ID seen in an earlier window raises as without windows."""
+    self.mock_language_model.infer.side_effect = lambda batch_prompts, **_: [
+        [
+            inference.ScoredOutput(
+                score=1.0,
+                output=textwrap.dedent(f"""\
+                  ```yaml
+                  {schema.EXTRACTIONS_KEY}: []
+                  ```"""),
+            )
+        ]
+        for _ in batch_prompts
+    ]
+    documents = [
+        data.Document(text="First text.", document_id="doc0"),
+        data.Document(text="Second text.", document_id="doc1"),
+        data.Document(text="Repeated text.", document_id="doc0"),
+    ]
+
+    results = self.annotator.annotate_documents(
+        documents,
+        resolver=resolver_lib.Resolver(format_type=data.FormatType.YAML),
+        extraction_passes=2,
+        pass_window_size=2,
+        debug=False,
+    )
+
+    self.assertEqual(
+        ["doc0", "doc1"], [next(results).document_id for _ in range(2)]
+    )
+    with self.assertRaises(annotation.DocumentRepeatError):
+      next(results)
+
   def test_multipass_extraction_single_pass(self):
     """Test that extraction_passes=1 behaves like normal single-pass extraction."""
     text = "Patient has fever."
@@ -963,6 +1760,34 @@ class AnnotatorMultiPassTest(absltest.TestCase):
     self.assertLen(result.extractions, 1)
     self.assertEqual(result.extractions[0].extraction_class, "test")
 
+  def test_multipass_extraction_skips_pass_without_output(self):
+    """Test a pass whose prompt failed with an empty result is skipped."""
+    text = "Test text."
+
+    self.mock_language_model.infer.side_effect = [
+        [[inference.ScoredOutput()]],
+        [[
+            inference.ScoredOutput(
+                score=1.0,
+                output=textwrap.dedent(f"""\
+              ```yaml
+              {schema.EXTRACTIONS_KEY}:
+              - test: "Test"
+                test_index: 0
+              ```"""),
+            )
+        ]],
+    ]
+
+    resolver = resolver_lib.Resolver(format_type=data.FormatType.YAML)
+
+    result = self.annotator.annotate_text(
+        text, resolver=resolver, extraction_passes=2, debug=False
+    )
+
+    self.assertLen(result.extractions, 1)
+    self.assertEqual(result.extractions[0].extraction_class, "test")
+
 
 class MultiPassHelperFunctionsTest(parameterized.TestCase):
   """Tests for multi-pass helper functions."""
@@ -1039,6 +1864,60 @@ class MultiPassHelperFunctionsTest(parameterized.TestCase):
       extraction_classes = [e.extraction_class for e in result]
       self.assertCountEqual(extraction_classes, expected_classes)
 
+  @parameterized.named_parameters(
+      dict(testcase_name="default_blocks", block_size=None),
+      dict(testcase_name="small_blocks", block_size=2),
+  )
+  def test_merge_matches_pairwise_overlap_checks(self, block_size):
+    """Test the interval index keeps exactly what pairwise checks keep."""
+    if block_size is not None:
+      # Small blocks make the index split blocks on a few insertions.
+      self.enter_context(
+          mock.patch.object(annotation, "_BLOCK_SIZE", block_size)
+      )
+
+    def pairwise_merge(all_extractions):
+      merged = list(all_extractions[0])
+      for pass_extractions in all_extractions[1:]:
+        for extraction in pass_extractions:
+          if not any(
+              annotation._extractions_overlap(extraction, existing)
+              for existing in merged
+          ):
+            merged.append(extraction)
+      return merged
+
+    def random_extraction(rng, index):
+      kind = rng.random()
+      if kind < 0.05:
+        char_interval = None
+      elif kind < 0.1:
+        char_interval = data.CharInterval(start_pos=rng.randint(0, 200))
+      else:
+        start = rng.randint(0, 200)
+        # Includes zero-length and a few inverted (start > end) intervals.
+        end = start + rng.randint(-3, 12)
+        char_interval = data.CharInterval(start_pos=start, end_pos=end)
+      return data.Extraction(
+          f"class{index}", f"text{index}", char_interval=char_interval
+      )
+
+    rng = random.Random(0)
+    for _ in range(200):
+      all_extractions = [
+          [random_extraction(rng, i) for i in range(rng.randint(0, 40))]
+          for _ in range(rng.randint(1, 4))
+      ]
+      self.assertEqual(
+          [
+              id(e)
+              for e in annotation._merge_non_overlapping_extractions(
+                  all_extractions
+              )
+          ],
+          [id(e) for e in pairwise_merge(all_extractions)],
+      )
+
   @parameterized.named_parameters(
       dict(
           testcase_name="overlapping_intervals",
@@ -0,0 +1,281 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the persistent response cache provider wrapper."""
+
+import asyncio
+import dataclasses
+import os
+import tempfile
+
+from absl.testing import absltest
+
+from langextract.core import base_model
+from langextract.core import exceptions
+from langextract.core import types
+from langextract.providers import cached
+
+
+class CountingModel(base_model.BaseLanguageModel):
+  """Fake model answering each prompt with a numbered response."""
+
+  def __init__(self, model_id="fake-model", temperature=0.0):
+    super().__init__()
+    self.model_id = model_id
+    self.temperature = temperature
+    self.prompts = []
+
+  def infer(self, batch_prompts, **kwargs):
+    for prompt in batch_prompts:
+      self.prompts.append(prompt)
+      yield [
+          types.ScoredOutput(score=1.0, output=f"{prompt}#{len(self.prompts)}")
+      ]
+
+
+class CachedLanguageModelTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    tmpdir = self.enter_context(tempfile.TemporaryDirectory())
+    self.path = os.path.join(tmpdir, "cache.sqlite")
+
+  def _outputs(self, results):
+    return [outputs[0].output for outputs in results]
+
+  def _cached_model(self, inner, **config_kwargs):
+    model = cached.CachedLanguageModel(
+        inner, cached.ResponseCacheConfig(path=self.path, **config_kwargs)
+    )
+    self.addCleanup(model.close)
+    return model
+
+  def test_responses_replayed_from_disk(self):
+    first_inner = CountingModel()
+    first = self._cached_model(first_inner)
+    recorded = self._outputs(first.infer(["a", "b"]))
+
+    second_inner = CountingModel()
+    second = self._cached_model(second_inner)
+    replayed = self._outputs(second.infer(["a", "c", "b"]))
+
+    self.assertEqual(recorded, ["a#1", "b#2"])
+    self.assertEqual(replayed, ["a#1", "c#1", "b#2"])
+    self.assertEqual(second_inner.prompts, ["c"])
+    self.assertEqual(second.stats, cached.CacheStats(hits=2, misses=1))
+
+  def test_repeated_prompts_in_a_run_cached_by_occurrence(self):
+    first = self._cached_model(CountingModel())
+    recorded = self._outputs(first.infer(["a"])) + self._outputs(
+        first.infer(["a"])
+    )
+
+    second_inner = CountingModel()
+    second = self._cached_model(second_inner)
+    replayed = self._outputs(second.infer(["a", "a"]))
+
+    self.assertEqual(recorded, ["a#1", "a#2"])
+    self.assertEqual(replayed, recorded)
+    self.assertEmpty(second_inner.prompts)
+
+  def test_second_run_in_same_process_replays_first_run(self):
+    inner = CountingModel()
+    model = self._cached_model(inner)
+
+    model.begin_run()
+    recorded = self._outputs(model.infer(["a", "a"]))
+    model.begin_run()
+    replayed = self._outputs(model.infer(["a", "a"]))
+
+    self.assertEqual(recorded, ["a#1", "a#2"])
+    self.assertEqual(replayed, recorded)
+    self.assertEqual(inner.prompts, ["a", "a"])
+    self.assertEqual(model.stats, cached.CacheStats(hits=2, misses=2))
+
+  def test_kwargs_without_deterministic_serialization_rejected(self):
+    model = self._cached_model(CountingModel())
+
+    with self.assertRaises(exceptions.InferenceConfigError):
+      list(model.infer(["a"], callback=object()))
+
+  def test_structured_kwargs_serialized_deterministically(self):
+    @dataclasses.dataclass
+    class Settings:
+      stop: frozenset[str]
+
+    list(
+        self._cached_model(CountingModel()).infer(
+            ["a"], settings=Settings(stop=frozenset({"x", "y"}))
+        )
+    )
+    replay = self._cached_model(CountingModel())
+    list(replay.infer(["a"], settings=Settings(stop=frozenset({"y", "x"}))))
+
+    self.assertEqual(replay.stats, cached.CacheStats(hits=1, misses=0))
+
+  def test_generation_settings_are_part_of_the_key(self):
+    model = self._cached_model(CountingModel())
+    list(model.infer(["a"], top_p=0.5))
+
+    other_kwargs = self._cached_model(CountingModel())
+    other_temperature = self._cached_model(CountingModel(temperature=0.7))
+    same = self._cached_model(CountingModel())
+
+    list(other_kwargs.infer(["a"], top_p=0.9))
+    list(other_temperature.infer(["a"], top_p=0.5))
+    list(same.infer(["a"], top_p=0.5, max_workers=3))
+
+    self.assertEqual(other_kwargs.stats.misses, 1)
+    self.assertEqual(other_temperature.stats.misses, 1)
+    self.assertEqual(same.stats, cached.CacheStats(hits=1, misses=0))
+
+  def test_least_recently_used_entries_evicted_beyond_size_limit(self):
+    entry_size = len('[{"score": 1.0, "output": "a#1"}]')
+    model = self._cached_model(CountingModel(), max_size_bytes=2 * entry_size)
+    list(model.infer(["a", "b"]))
+
+    # Touch "a" through a fresh model so that "b" is least recently used.
+    reader = self._cached_model(CountingModel())
+    list(reader.infer(["a"]))
+    list(model.infer(["c"]))
+
+    replay_inner = CountingModel()
+    replay = self._cached_model(replay_inner)
+    list(replay.infer(["a", "b", "c"]))
+
+    self.assertEqual(model.stats.evictions, 1)
+    self.assertEqual(replay_inner.prompts, ["b"])
+
+  def test_read_only_cache_does_not_store_misses(self):
+    list(self._cached_model(CountingModel()).infer(["a"]))
+
+    read_only = self._cached_model(CountingModel(), read_only=True)
+    list(read_only.infer(["a", "b"]))
+
+    replay_inner = CountingModel()
+    replay = self._cached_model(replay_inner)
+    list(replay.infer(["a", "b"]))
+
+    self.assertEqual(read_only.stats, cached.CacheStats(hits=1, misses=1))
+    self.assertEqual(replay_inner.prompts, ["b"])
+
+  def test_read_only_cache_must_exist(self):
+    with self.assertRaises(exceptions.InferenceConfigError):
+      cached.CachedLanguageModel(
+          CountingModel(),
+          cached.ResponseCacheConfig(path=self.path, read_only=True),
+      )
+
+  def test_ainfer_uses_cache(self):
+    first = self._cached_model(CountingModel())
+    list(first.infer(["a"]))
+
+    second_inner = CountingModel()
+    second = self._cached_model(second_inner)
+    results = asyncio.run(second.ainfer(["a", "b"]))
+
+    self.assertEqual(self._outputs(results), ["a#1", "b#1"])
+    self.assertEqual(second_inner.prompts, ["b"])
+
+  def test_infer_unordered_yields_hits_before_misses(self):
+    first = self._cached_model(CountingModel())
+    list(first.infer(["a"]))
+
+    second_inner = CountingModel()
+    second = self._cached_model(second_inner)
+    results = list(second.infer_unordered(["b", "a"]))
+
+    self.assertEqual(
+        [(index, outputs[0].output) for index, outputs in results],
+        [(1, "a#1"), (0, "b#1")],
+    )
+    self.assertEqual(self._outputs(first.infer(["b"])), ["b#1"])
+
+  def test_results_completed_by_failed_batch_are_stored(self):
+    def infer_failing_second_prompt(batch_prompts, **kwargs):
+      del kwargs
+      yield [types.ScoredOutput(output=f"{batch_prompts[0]}!")]
+      raise exceptions.BatchInferenceError(
+          "Inference failed for prompt 1.",
+          index=1,
+          results={2: [types.ScoredOutput(output=f"{batch_prompts[2]}!")]},
+      )
+
+    inner = CountingModel()
+    inner.infer = infer_failing_second_prompt
+    first = self._cached_model(inner)
+    with self.assertRaises(exceptions.BatchInferenceError):
+      list(first.infer(["a", "b", "c"]))
+
+    second_inner = CountingModel()
+    second = self._cached_model(second_inner)
+    replayed = self._outputs(second.infer(["a", "b", "c"]))
+
+    self.assertEqual(replayed, ["a!", "b#1", "c!"])
+    self.assertEqual(second_inner.prompts, ["b"])
+
+  def test_results_completed_by_failed_async_batch_are_stored(self):
+    first_inner = CountingModel()
+    list(self._cached_model(first_inner).infer(["a"]))
+
+    async def ainfer_failing_second_prompt(batch_prompts, **kwargs):
+      del kwargs
+      self.assertEqual(batch_prompts, ["b", "c", "d"])
+      raise exceptions.BatchInferenceError(
+          "Inference failed for prompt 1.",
+          index=1,
+          results={
+              0: [types.ScoredOutput(output="b!")],
+              2: [types.ScoredOutput(output="d!")],
+          },
+      )
+
+    inner = CountingModel()
+    inner.ainfer = ainfer_failing_second_prompt
+    with self.assertRaises(exceptions.BatchInferenceError):
+      asyncio.run(self._cached_model(inner).ainfer(["a", "b", "c", "d"]))
+
+    second_inner = CountingModel()
+    second = self._cached_model(second_inner)
+    replayed = asyncio.run(second.ainfer(["a", "b", "c", "d"]))
+
+    self.assertEqual(
+        [outputs[0].output for outputs in replayed], ["a#1", "b!", "c#1", "d!"]
+    )
+    self.assertEqual(second_inner.prompts, ["c"])
+
+  def test_empty_results_of_failed_prompts_not_stored(self):
+    inner = CountingModel()
+    inner.infer = lambda batch_prompts, **kwargs: iter([[types.ScoredOutput()]])
+    list(self._cached_model(inner).infer(["a"]))
+
+    second_inner = CountingModel()
+    second = self._cached_model(second_inner)
+
+    self.assertEqual(self._outputs(second.infer(["a"])), ["a#1"])
+    self.assertEqual(second_inner.prompts, ["a"])
+
+  def test_attributes_delegated_to_wrapped_model(self):
+    inner = CountingModel(model_id="delegated")
+    model = self._cached_model(inner)
+
+    model.set_fence_output(False)
+
+    self.assertEqual(model.model_id, "delegated")
+    self.assertFalse(model.requires_fence_output)
+    self.assertFalse(inner.requires_fence_output)
+
+
+if __name__ == "__main__":
+  absltest.main()
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import random
 import textwrap
 
 from absl.testing import absltest
@@ -237,6 +238,16 @@ class ChunkIteratorTest(absltest.TestCase):
         chunking.get_token_interval_text(tokenized_text, chunk_interval), text
     )
 
+  def test_cjk_text_chunks_respect_buffer(self):
+    text = "患者主诉头痛三天。伴有恶心！是否发热？" * 3
+    tokenized_text = tokenizer.tokenize(text)
+    chunks = list(chunking.ChunkIterator(tokenized_text, max_char_buffer=10))
+
+    self.assertEqual(
+        [chunk.chunk_text for chunk in chunks],
+        ["患者主诉头痛三天。", "伴有恶心！是否发热？"] * 3,
+    )
+
   def test_newlines_is_secondary_sentence_break(self):
     text = textwrap.dedent("""\
     Medications:
@@ -285,6 +296,154 @@ class ChunkIteratorTest(absltest.TestCase):
       next(chunk_iter)
 
 
+def _greedy_chunk_intervals(
+    tokenized_text: tokenizer.TokenizedText, max_char_buffer: int
+) -> list[tuple[int, int]]:
+  """Chunks like ChunkIterator did before packing by binary search.
+
+  Every chunk grows one token, then one sentence, at a time, and checks its
+  char length after each step.
+  """
+
+  def exceeds_buffer(start_index: int, end_index: int) -> bool:
+    char_interval = chunking.get_char_interval(
+        tokenized_text, tokenizer.TokenInterval(start_index, end_index)
+    )
+    return char_interval.end_pos - char_interval.start_pos > max_char_buffer
+
+  sentence_iter = chunking.SentenceIterator(tokenized_text)
+  newline_flags = tokenized_text.newline_flags
+  broken_sentence = False
+  intervals = []
+  for sentence in sentence_iter:
+    start = sentence.start_index
+    if exceeds_buffer(start, start + 1):
+      sentence_iter.curr_token_pos = start + 1
+      broken_sentence = start + 1 < sentence.end_index
+      intervals.append((start, start + 1))
+      continue
+
+    end = start + 1
+    start_of_new_line = -1
+    overflowed = False
+    for token_index in range(start, sentence.end_index):
+      if newline_flags[token_index]:
+        start_of_new_line = token_index
+      if exceeds_buffer(start, token_index + 1):
+        if start_of_new_line > 0 and start_of_new_line > start:
+          end = start_of_new_line
+        sentence_iter.curr_token_pos = end
+        broken_sentence = True
+        overflowed = True
+        break
+      end = token_index + 1
+    if overflowed:
+      intervals.append((start, end))
+      continue
+
+    if broken_sentence:
+      broken_sentence = False
+    else:
+      for next_sentence in sentence_iter:
+        if exceeds_buffer(start, next_sentence.end_index):
+          sentence_iter.curr_token_pos = end
+          break
+        end = next_sentence.end_index
+    intervals.append((start, end))
+  return intervals
+
+
+class ChunkIteratorGreedyEquivalenceTest(parameterized.TestCase):
+  """Checks ChunkIterator against the token-by-token greedy packer."""
+
+  @parameterized.named_parameters(
+      dict(
+          testcase_name="long_tokens",
+          text=(
+              "Short. Pneumonoultramicroscopicsilicovolcanoconiosis is long."
+              " Supercalifragilisticexpialidocious! Ok."
+          ),
+          buffer_sizes=(1, 5, 10, 20, 45),
+      ),
+      dict(
+          testcase_name="newline_breaks",
+          text=(
+              "Medications:\nTheophyline 600 mg qhs for asthma\nDiltiazem"
+              " 300 mg qhs\nfor hypertension and more text. Next one.\n\n"
+              "Plan:\nfollow up"
+          ),
+          buffer_sizes=(8, 15, 25, 40, 80),
+      ),
+      dict(
+          testcase_name="buffer_edges",
+          text="Abc def. Ghi jkl. Mno pqr.\nStu vwx.",
+          # 7 and 8 are the lengths of one sentence without and with its
+          # period, 17 of two sentences.
+          buffer_sizes=(6, 7, 8, 9, 16, 17, 18, 35, 36),
+      ),
+      dict(
+          testcase_name="cjk",
+          text="患者主诉头痛三天。伴有恶心！\n是否发热？“没有。”" * 2,
+          buffer_sizes=(1, 3, 9, 10, 20),
+      ),
+  )
+  def test_matches_greedy_packing(self, text, buffer_sizes):
+    tokenized_text = tokenizer.tokenize(text)
+    for max_char_buffer in buffer_sizes:
+      with self.subTest(max_char_buffer=max_char_buffer):
+        chunks = chunking.ChunkIterator(tokenized_text, max_char_buffer)
+        self.assertEqual(
+            [
+                (
+                    chunk.token_interval.start_index,
+                    chunk.token_interval.end_index,
+                )
+                for chunk in chunks
+            ],
+            _greedy_chunk_intervals(tokenized_text, max_char_buffer),
+        )
+
+  def test_matches_greedy_packing_on_random_texts(self):
+    rng = random.Random(0)
+    words = [
+        "a",
+        "to",
+        "the",
+        "patient",
+        "Dr.",
+        "hypercholesterolemia",
+        "mg",
+        "2023-03-15",
+        "I/O",
+        ".",
+        "!",
+        "?",
+        "\n",
+        "\nThe",
+        "头痛",
+        "。",
+        "“",
+    ]
+    for _ in range(50):
+      text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 80)))
+      tokenized_text = tokenizer.tokenize(text)
+      if not tokenized_text.num_tokens:
+        continue
+      max_char_buffer = rng.randint(1, 120)
+      with self.subTest(text=text, max_char_buffer=max_char_buffer):
+        chunks = chunking.ChunkIterator(tokenized_text, max_char_buffer)
+        self.assertEqual(
+            [
+                (
+                    chunk.token_interval.start_index,
+                    chunk.token_interval.end_index,
+                )
+                for chunk in chunks
+            ],
+            _greedy_chunk_intervals(tokenized_text, max_char_buffer),
+        )
+
+
 class BatchingTest(parameterized.TestCase):
 
   _SAMPLE_DOCUMENT = data.Document(
@@ -20,6 +20,7 @@ for router. The no-name-in-module warning for providers.registry is expected.
 # pylint: disable=no-name-in-module
 
 import os
+import tempfile
 from unittest import mock
 
 from absl.testing import absltest
@@ -27,6 +28,7 @@ from absl.testing import absltest
 from langextract import exceptions
 from langextract import factory
 from langextract import inference
+from langextract.providers import cached
 from langextract.providers import registry
 
 
@@ -97,6 +99,24 @@ class FactoryTest(absltest.TestCase):
     self.assertEqual(model.model_id, "gemini-pro")
     self.assertEqual(model.api_key, "test-key")
 
+  def test_create_model_with_cache_wraps_provider(self):
+    """Test a cache config wraps the provider in a CachedLanguageModel."""
+    tmpdir = self.enter_context(tempfile.TemporaryDirectory())
+    config = factory.ModelConfig(
+        model_id="gemini-pro",
+        provider_kwargs={"api_key": "test-key"},
+        cache=cached.ResponseCacheConfig(
+            path=os.path.join(tmpdir, "cache.sqlite")
+        ),
+    )
+
+    model = factory.create_model(config)
+
+    self.assertIsInstance(model, cached.CachedLanguageModel)
+    self.assertIsInstance(model.model, FakeGeminiProvider)
+    self.assertEqual(model.model_id, "gemini-pro")
+    self.assertEqual(list(model.infer(["prompt"]))[0][0].output, "gemini")
+
   def test_create_model_from_id(self):
     """Test convenience function for creating model from ID."""
     model = factory.create_model_from_id("gemini-flash", api_key="test-key")
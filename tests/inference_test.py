@@ -20,17 +20,28 @@ pylint warnings are expected for test fixtures.
 """
 # pylint: disable=attribute-defined-outside-init
 
+import asyncio
+import collections
+import concurrent.futures
+import http.server
+import json
+import os
+import threading
+import time
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
+from google.genai import errors as genai_errors
 
 from langextract import exceptions
 from langextract import inference
 from langextract.core import data
+from langextract.providers import concurrency
 from langextract.providers import gemini
 from langextract.providers import ollama
 from langextract.providers import openai as openai_provider
+from langextract.providers import retry
 
 
 class TestBaseLanguageModel(absltest.TestCase):
@@ -85,6 +96,28 @@ class TestBaseLanguageModel(absltest.TestCase):
         "merge_kwargs should work even without _extra_kwargs attribute",
     )
 
+  def test_ainfer_defaults_to_infer_in_worker_thread(self):
+    """Test ainfer falls back to running infer in a worker thread."""
+
+    class TestModel(inference.BaseLanguageModel):  # pylint: disable=too-few-public-methods
+
+      def infer(self, batch_prompts, **kwargs):
+        for prompt in batch_prompts:
+          yield [
+              inference.ScoredOutput(
+                  score=1.0, output=f"{prompt}:{kwargs['suffix']}"
+              )
+          ]
+
+    model = TestModel()
+
+    results = asyncio.run(model.ainfer(["a", "b"], suffix="x"))
+
+    self.assertEqual(
+        [["a:x"], ["b:x"]],
+        [[output.output for output in outputs] for outputs in results],
+    )
+
 
 class TestOllamaLanguageModel(absltest.TestCase):
 
@@ -159,7 +192,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     ]]
     self.assertEqual(results, expected_results)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_extra_kwargs_passed_to_api(self, mock_post):
     """Verify extra kwargs like timeout and keep_alive are passed to the API."""
     mock_response = mock.Mock()
@@ -186,10 +219,10 @@ class TestOllamaLanguageModel(absltest.TestCase):
 
     self.assertEqual(json_payload["options"]["keep_alive"], 600)
     self.assertEqual(json_payload["options"]["num_thread"], 8)
-    # timeout is passed to requests.post, not in the JSON payload
+    # timeout is passed to Session.post, not in the JSON payload
     self.assertEqual(call_args.kwargs["timeout"], 300)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_stop_and_top_p_passthrough(self, mock_post):
     """Verify stop and top_p parameters are passed to Ollama API."""
     mock_response = mock.Mock()
@@ -217,7 +250,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     self.assertEqual(json_payload["stop"], ["\\n\\n", "END"])
     self.assertEqual(json_payload["options"]["top_p"], 0.9)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_defaults_when_unspecified(self, mock_post):
     """Verify Ollama uses correct defaults when parameters are not specified."""
     mock_response = mock.Mock()
@@ -242,7 +275,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     self.assertEqual(json_payload["options"]["num_ctx"], 2048)
     self.assertEqual(call_args.kwargs["timeout"], 120)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_runtime_kwargs_override_stored(self, mock_post):
     """Verify runtime kwargs override stored kwargs."""
     mock_response = mock.Mock()
@@ -269,7 +302,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     self.assertEqual(json_payload["options"]["temperature"], 0.8)
     self.assertEqual(json_payload["options"]["keep_alive"], 600)
 
-  @mock.patch("requests.post")
+  @mock.patch("requests.Session.post")
   def test_ollama_temperature_zero(self, mock_post):
     """Test that temperature=0.0 is properly passed to Ollama."""
     mock_response = mock.Mock()
@@ -305,7 +338,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     mock_response.json.return_value = {"response": "test output"}
 
     with mock.patch.object(
-        model._requests, "post", return_value=mock_response
+        model._session, "post", return_value=mock_response
     ) as mock_post:
       model._ollama_query(prompt="test prompt")
 
@@ -330,7 +363,7 @@ class TestOllamaLanguageModel(absltest.TestCase):
     mock_response.json.return_value = {"response": "test output"}
 
     with mock.patch.object(
-        model._requests, "post", return_value=mock_response
+        model._session, "post", return_value=mock_response
     ) as mock_post:
       list(model.infer(["test prompt"]))
 
@@ -342,6 +375,501 @@ class TestOllamaLanguageModel(absltest.TestCase):
           "Timeout from constructor should flow through infer()",
       )
 
+  def test_ollama_ainfer_preserves_prompt_order(self):
+    """Test async Ollama inference returns outputs in prompt order."""
+
+    async def fake_aquery(session, prompt, **kwargs):
+      del session, kwargs
+      # Finish the first prompt last to exercise out-of-order completion.
+      await asyncio.sleep(0.01 if prompt == "first" else 0)
+      return {"response": f"{prompt} response"}
+
+    model = ollama.OllamaLanguageModel(
+        model_id="test-model", model_url="http://localhost:11434"
+    )
+
+    with mock.patch.object(
+        model, "_ollama_aquery", side_effect=fake_aquery
+    ) as mock_aquery:
+      results = asyncio.run(model.ainfer(["first", "second"]))
+
+    self.assertEqual(
+        ["first response", "second response"],
+        [outputs[0].output for outputs in results],
+    )
+    self.assertEqual(2, mock_aquery.call_count)
+    self.assertEqual("test-model", mock_aquery.call_args.kwargs["model"])
+
+  def test_ollama_sends_declared_prefix_as_system_prompt(self):
+    """Test a local Ollama stand-in receives the prefix as the system prompt."""
+    payloads = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+
+      def do_POST(self):  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        payloads.append(json.loads(body))
+        response = json.dumps({"response": "{}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+      def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    self.addCleanup(server.server_close)
+    self.addCleanup(server.shutdown)
+
+    model = ollama.OllamaLanguageModel(
+        model_id="test-model",
+        model_url=f"http://127.0.0.1:{server.server_address[1]}",
+    )
+    prefix = "Extract entities.\n\nExamples\nQ: a\nA: b\n"
+    model.set_prompt_prefix(prefix)
+
+    list(model.infer([f"{prefix}\nQ: first\nA: ", "unrelated prompt"]))
+    asyncio.run(model.ainfer([f"{prefix}\nQ: second\nA: "]))
+
+    self.assertCountEqual(
+        [
+            (prefix, "Q: first\nA: "),
+            ("", "unrelated prompt"),
+            (prefix, "Q: second\nA: "),
+        ],
+        [(p["system"], p["prompt"]) for p in payloads],
+    )
+
+  def test_ollama_reuses_connection_and_retries_unavailable(self):
+    """Test requests share one keep-alive connection and 503s are retried."""
+    requests_seen = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+      protocol_version = "HTTP/1.1"
+
+      def do_POST(self):  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        requests_seen.append((self.client_address, json.loads(body)["prompt"]))
+        status = 503 if len(requests_seen) == 1 else 200
+        response = json.dumps({"response": f"{len(requests_seen)}"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+      def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    self.addCleanup(server.server_close)
+    self.addCleanup(server.shutdown)
+
+    model = ollama.OllamaLanguageModel(
+        model_id="test-model",
+        model_url=f"http://127.0.0.1:{server.server_address[1]}",
+        max_workers=1,
+    )
+    self.addCleanup(model.close)
+
+    results = list(model.infer(["first", "second", "third"]))
+
+    self.assertEqual(
+        [[inference.ScoredOutput(score=1.0, output=f"{i}")] for i in (2, 3, 4)],
+        results,
+    )
+    self.assertEqual(
+        ["first", "first", "second", "third"],
+        [prompt for _, prompt in requests_seen],
+    )
+    self.assertLen({address for address, _ in requests_seen}, 1)
+
+  def test_ollama_ainfer_reuses_session_of_running_loop(self):
+    """Test ainfer calls on one loop share a session and its connection."""
+    client_addresses = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+      protocol_version = "HTTP/1.1"
+      disable_nagle_algorithm = True
+
+      def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers["Content-Length"]))
+        client_addresses.append(self.client_address)
+        response = json.dumps({"response": "{}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+      def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    self.addCleanup(server.server_close)
+    self.addCleanup(server.shutdown)
+
+    model = ollama.OllamaLanguageModel(
+        model_id="test-model",
+        model_url=f"http://127.0.0.1:{server.server_address[1]}",
+    )
+
+    async def run():
+      async with model:
+        first = model._async_session()
+        for prompt in ("a", "b", "c"):
+          await model.ainfer([prompt])
+        self.assertIs(first, model._async_session())
+      return first
+
+    session = asyncio.run(run())
+
+    self.assertTrue(session.closed)
+    self.assertLen(client_addresses, 3)
+    self.assertLen(set(client_addresses), 1)
+
+  def test_ollama_infer_concurrent_in_prompt_order(self):
+    """Test prompts are sent by max_workers threads and yielded in order."""
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+      protocol_version = "HTTP/1.1"
+
+      def do_POST(self):  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        prompt = json.loads(body)["prompt"]
+        with lock:
+          in_flight[0] += 1
+          peak[0] = max(peak[0], in_flight[0])
+        # Earlier prompts finish last.
+        time.sleep(0.05 * (5 - int(prompt)))
+        with lock:
+          in_flight[0] -= 1
+        response = json.dumps({"response": f"out {prompt}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+      def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    self.addCleanup(server.server_close)
+    self.addCleanup(server.shutdown)
+
+    model = ollama.OllamaLanguageModel(
+        model_id="test-model",
+        model_url=f"http://127.0.0.1:{server.server_address[1]}",
+        max_workers=3,
+    )
+    self.addCleanup(model.close)
+
+    results = list(model.infer([str(i) for i in range(5)]))
+
+    self.assertEqual(
+        [
+            [inference.ScoredOutput(score=1.0, output=f"out {i}")]
+            for i in range(5)
+        ],
+        results,
+    )
+    self.assertEqual(3, peak[0])
+
+  def test_ollama_workers_capped_by_server_parallelism(self):
+    """Test OLLAMA_NUM_PARALLEL caps the number of concurrent requests."""
+    with mock.patch.dict(os.environ, {"OLLAMA_NUM_PARALLEL": "2"}):
+      model = ollama.OllamaLanguageModel(model_id="test-model", max_workers=8)
+    explicit = ollama.OllamaLanguageModel(
+        model_id="test-model", max_workers=8, num_parallel=4
+    )
+
+    self.assertEqual(2, model.num_parallel)
+    self.assertEqual(2, model._num_workers())
+    self.assertEqual(4, explicit._num_workers())
+    self.assertEqual(1, explicit._num_workers(max_workers=1))
+
+  def test_ollama_env_parallelism_ignored_for_remote_server(self):
+    """Test the client's OLLAMA_NUM_PARALLEL does not cap a remote server."""
+    with mock.patch.dict(os.environ, {"OLLAMA_NUM_PARALLEL": "2"}):
+      remote = ollama.OllamaLanguageModel(
+          model_id="test-model",
+          model_url="http://ollama.example.com:11434",
+          max_workers=8,
+      )
+      local = ollama.OllamaLanguageModel(
+          model_id="test-model", base_url="http://[::1]:11434", max_workers=8
+      )
+
+    self.assertIsNone(remote.num_parallel)
+    self.assertEqual(8, remote._num_workers())
+    self.assertEqual(2, local.num_parallel)
+
+  def test_ollama_max_workers_override_capped_by_pool_size(self):
+    """Test a per-call max_workers never exceeds the pooled connections."""
+    model = ollama.OllamaLanguageModel(
+        model_id="test-model", max_workers=4, num_parallel=16
+    )
+    pooled = ollama.OllamaLanguageModel(
+        model_id="test-model", max_workers=4, num_parallel=16, pool_size=6
+    )
+
+    self.assertEqual(4, model._num_workers(max_workers=12))
+    self.assertEqual(6, pooled._num_workers(max_workers=12))
+    self.assertEqual(2, pooled._num_workers(max_workers=2))
+
+    max_workers = []
+
+    async def record(session, **kwargs):
+      del session, kwargs
+      await asyncio.sleep(0.01)
+      return {"response": "{}"}
+
+    async def run():
+      with mock.patch.object(pooled, "_ollama_aquery", side_effect=record):
+        with mock.patch.object(
+            asyncio, "Semaphore", wraps=asyncio.Semaphore
+        ) as semaphore:
+          await pooled.ainfer(["a", "b"], max_workers=12)
+          max_workers.append(semaphore.call_args.args[0])
+      await pooled.aclose()
+
+    asyncio.run(run())
+    self.assertEqual([6], max_workers)
+
+
+class _StatusError(Exception):
+
+  def __init__(self, code, headers=None):
+    super().__init__(f"status {code}")
+    self.code = code
+    self.response = mock.Mock(headers=headers or {})
+
+
+def _raise(error):
+  raise error
+
+
+class AdaptiveLimiterTest(absltest.TestCase):
+
+  def test_limit_grows_only_when_saturated(self):
+    limiter = concurrency.AdaptiveLimiter(initial_limit=1, max_limit=4)
+
+    self.assertEqual("a", limiter.run(lambda: "a"))
+    self.assertEqual(2, limiter.limit)
+    for _ in range(3):
+      limiter.run(lambda: None)
+
+    self.assertEqual(
+        concurrency.LimiterStats(limit=2, successes=4), limiter.stats
+    )
+
+  def test_overload_backs_off_once_per_burst(self):
+    limiter = concurrency.AdaptiveLimiter(initial_limit=4)
+    started = threading.Barrier(2)
+
+    def overloaded():
+      started.wait(timeout=10)
+      raise exceptions.InferenceRuntimeError(
+          "API error", original=_StatusError(429)
+      )
+
+    def call():
+      with self.assertRaises(exceptions.InferenceRuntimeError):
+        limiter.run(overloaded)
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(
+        concurrency.LimiterStats(limit=2, overloads=2), limiter.stats
+    )
+    with self.assertRaises(ValueError):
+      limiter.run(_raise, ValueError())
+    self.assertEqual(2, limiter.limit)
+    with self.assertRaises(_StatusError):
+      limiter.run(_raise, _StatusError(503))
+    self.assertEqual(1, limiter.limit)
+
+  def test_shared_limiter_raised_to_largest_initial_limit(self):
+    first = concurrency.shared_limiter("raise-initial-test", 1)
+    second = concurrency.shared_limiter("raise-initial-test", 8)
+
+    self.assertIs(first, second)
+    self.assertEqual(8, first.limit)
+    self.assertEqual(
+        8, concurrency.shared_limiter("raise-initial-test", 2).limit
+    )
+    with self.assertRaises(_StatusError):
+      first.run(_raise, _StatusError(429))
+    self.assertEqual(4, first.limit)
+    concurrency.shared_limiter("raise-initial-test", 16)
+    self.assertEqual(4, first.limit)
+
+  def test_shared_limiter_max_limit_defaults_to_initial_limit(self):
+    limiter = concurrency.shared_limiter("max-limit-test", 3)
+
+    self.assertEqual(3, limiter.max_limit)
+    concurrency.shared_limiter("max-limit-test", 2, 6)
+    self.assertEqual(6, limiter.max_limit)
+    self.assertEqual(3, limiter.limit)
+
+  def test_async_and_sync_requests_share_slots(self):
+    limiter = concurrency.AdaptiveLimiter(initial_limit=1, max_limit=1)
+    sync_started = threading.Event()
+    release_sync = threading.Event()
+    order = []
+
+    def sync_request():
+      sync_started.set()
+      self.assertTrue(release_sync.wait(timeout=10))
+      order.append("sync")
+
+    async def async_request():
+      order.append("async")
+      return "done"
+
+    thread = threading.Thread(target=limiter.run, args=(sync_request,))
+    thread.start()
+    self.assertTrue(sync_started.wait(timeout=10))
+
+    async def run():
+      task = asyncio.ensure_future(limiter.arun(async_request))
+      await asyncio.sleep(0.05)
+      self.assertFalse(task.done())
+      self.assertEqual(1, limiter.stats.in_flight)
+      release_sync.set()
+      return await asyncio.wait_for(task, timeout=10)
+
+    self.assertEqual("done", asyncio.run(run()))
+    thread.join()
+    self.assertEqual(["sync", "async"], order)
+    self.assertEqual(
+        concurrency.LimiterStats(limit=1, successes=2), limiter.stats
+    )
+
+  def test_async_overload_lowers_limit(self):
+    limiter = concurrency.AdaptiveLimiter(initial_limit=4)
+
+    async def overloaded():
+      raise _StatusError(429)
+
+    with self.assertRaises(_StatusError):
+      asyncio.run(limiter.arun(overloaded))
+
+    self.assertEqual(
+        concurrency.LimiterStats(limit=2, overloads=1), limiter.stats
+    )
+
+  def test_raise_initial_limit_capped_by_max_limit(self):
+    limiter = concurrency.AdaptiveLimiter(initial_limit=2, max_limit=5)
+
+    limiter.raise_initial_limit(10)
+
+    self.assertEqual(5, limiter.limit)
+
+  def test_limiter_key_hashes_credential(self):
+    key = concurrency.limiter_key("openai", "", "gpt-4o", credential="sk-1")
+
+    self.assertTrue(key.startswith("openai::gpt-4o:"))
+    self.assertNotIn("sk-1", key)
+    self.assertEqual(
+        key,
+        concurrency.limiter_key("openai", "", "gpt-4o", credential="sk-1"),
+    )
+    self.assertNotEqual(
+        key,
+        concurrency.limiter_key("openai", "", "gpt-4o", credential="sk-2"),
+    )
+    self.assertEqual(
+        "openai::gpt-4o", concurrency.limiter_key("openai", "", "gpt-4o")
+    )
+
+
+class RetryPolicyTest(absltest.TestCase):
+
+  def test_backoff_grows_exponentially_up_to_max_delay(self):
+    policy = retry.RetryPolicy(initial_delay=1.0, max_delay=5.0, jitter=False)
+
+    self.assertEqual(
+        [1.0, 2.0, 4.0, 5.0], [policy.backoff(n) for n in range(1, 5)]
+    )
+    self.assertEqual(3.0, policy.backoff(1, retry_after=3.0))
+    self.assertEqual(5.0, policy.backoff(1, retry_after=100.0))
+
+  def test_retry_after_read_from_wrapped_error(self):
+    def wrapped(headers):
+      return exceptions.InferenceRuntimeError(
+          "API error", original=_StatusError(429, headers)
+      )
+
+    self.assertEqual(7.0, retry.retry_after(wrapped({"retry-after": "7"})))
+    self.assertEqual(
+        0.25, retry.retry_after(wrapped({"retry-after-ms": "250"}))
+    )
+    self.assertEqual(
+        0.0,
+        retry.retry_after(
+            wrapped({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        ),
+    )
+    self.assertIsNone(retry.retry_after(wrapped({})))
+
+  def test_only_transient_errors_are_retryable(self):
+    self.assertTrue(retry.is_retryable_error(_StatusError(503)))
+    self.assertTrue(retry.is_retryable_error(TimeoutError()))
+    self.assertFalse(retry.is_retryable_error(_StatusError(400)))
+    self.assertFalse(retry.is_retryable_error(ValueError()))
+
+  def test_arun_batch_skips_prompts_not_started_after_failure(self):
+    calls = []
+
+    async def fn(prompt):
+      calls.append(prompt)
+      if prompt == "bad":
+        raise _StatusError(400)
+      return inference.ScoredOutput(output=prompt)
+
+    failures = []
+    with self.assertRaises(exceptions.BatchInferenceError) as raised:
+      asyncio.run(
+          retry.arun_batch(
+              fn,
+              ["a", "bad", "c"],
+              retry.RetryPolicy(),
+              max_concurrency=1,
+              on_failure=failures.append,
+          )
+      )
+
+    self.assertEqual(["a", "bad"], calls)
+    self.assertEqual(1, raised.exception.index)
+    self.assertEqual(
+        ["a"], [r[0].output for r in raised.exception.results.values()]
+    )
+    self.assertEqual(
+        [(1, "bad", 1)], [(f.index, f.prompt, f.attempts) for f in failures]
+    )
+
 
 class TestGeminiLanguageModel(absltest.TestCase):
 
@@ -393,6 +921,260 @@ class TestGeminiLanguageModel(absltest.TestCase):
           f"Config value for {key} should match what was provided",
       )
 
+  @mock.patch("google.genai.Client")
+  def test_gemini_reuses_worker_threads_across_batches(self, mock_client_class):
+    """Test batches share the model's thread pool until it is closed."""
+    mock_client_class.return_value.models.generate_content.side_effect = (
+        lambda model, contents, config: mock.Mock(text=contents)
+    )
+    thread_pool = self.enter_context(
+        mock.patch.object(
+            concurrent.futures,
+            "ThreadPoolExecutor",
+            wraps=concurrent.futures.ThreadPoolExecutor,
+        )
+    )
+
+    with gemini.GeminiLanguageModel(
+        api_key="test-key", max_workers=2, adaptive_concurrency=False
+    ) as model:
+      first = list(model.infer(["a", "b", "c"]))
+      second = list(model.infer(["d", "e"]))
+      self.assertEqual(1, thread_pool.call_count)
+      model.max_workers = 3
+      list(model.infer(["f", "g", "h"]))
+      self.assertEqual(2, thread_pool.call_count)
+      self.assertEqual(3, model._executor.max_workers)
+
+    self.assertEqual(["a", "b", "c"], [r[0].output for r in first])
+    self.assertEqual(["d", "e"], [r[0].output for r in second])
+    self.assertEqual(0, model._executor.max_workers)
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_models_share_adaptive_limiter(self, mock_client_class):
+    """Test a 429 from one model lowers the limit of every model instance."""
+    mock_client_class.return_value.models.generate_content.side_effect = (
+        _StatusError(429)
+    )
+    first = gemini.GeminiLanguageModel(
+        model_id="gemini-limiter-test",
+        api_key="test-key",
+        max_workers=8,
+        retry_policy=retry.RetryPolicy(max_attempts=1),
+    )
+    second = gemini.GeminiLanguageModel(
+        model_id="gemini-limiter-test", api_key="test-key", max_workers=8
+    )
+    unlimited = gemini.GeminiLanguageModel(
+        model_id="gemini-limiter-test",
+        api_key="test-key",
+        adaptive_concurrency=False,
+    )
+
+    with self.assertRaises(exceptions.InferenceRuntimeError):
+      list(first.infer(["a"]))
+
+    self.assertIs(first._limiter, second._limiter)
+    self.assertIsNone(unlimited._limiter)
+    stats = concurrency.limiter_stats()[
+        concurrency.limiter_key(
+            "gemini", "gemini-limiter-test", credential="test-key"
+        )
+    ]
+    self.assertEqual(4, stats.limit)
+    self.assertEqual(1, stats.overloads)
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_adaptive_limit_grows_above_max_workers(
+      self, mock_client_class
+  ):
+    """Test the limit passes max_workers only up to max_concurrency."""
+    lock = threading.Lock()
+    in_flight = [0]
+    peaks = []
+
+    def generate_content(model, contents, config):
+      del model, config
+      with lock:
+        in_flight[0] += 1
+        peaks[-1] = max(peaks[-1], in_flight[0])
+      time.sleep(0.01)
+      with lock:
+        in_flight[0] -= 1
+      return mock.Mock(text=contents)
+
+    mock_client_class.return_value.models.generate_content.side_effect = (
+        generate_content
+    )
+    capped = gemini.GeminiLanguageModel(
+        model_id="gemini-capped-test", api_key="test-key", max_workers=2
+    )
+    self.addCleanup(capped.close)
+    peaks.append(0)
+    list(capped.infer([str(i) for i in range(20)]))
+    self.assertEqual(2, peaks[-1])
+    self.assertEqual(2, capped._limiter.limit)
+    self.assertEqual(2, capped._executor.max_workers)
+
+    with gemini.GeminiLanguageModel(
+        model_id="gemini-growth-test",
+        api_key="test-key",
+        max_workers=2,
+        max_concurrency=4,
+    ) as model:
+      for _ in range(4):
+        peaks.append(0)
+        results = list(model.infer([str(i) for i in range(20)]))
+        self.assertLessEqual(model._executor.max_workers, 4)
+
+    self.assertEqual(
+        [str(i) for i in range(20)], [r[0].output for r in results]
+    )
+    self.assertEqual(4, model._limiter.limit)
+    self.assertEqual(4, max(peaks[1:]))
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_limiter_shared_per_api_key(self, mock_client_class):
+    """Test models using different API keys do not share a limiter."""
+    del mock_client_class
+    first = gemini.GeminiLanguageModel(
+        model_id="gemini-key-test", api_key="first-key"
+    )
+    same = gemini.GeminiLanguageModel(
+        model_id="gemini-key-test", api_key="first-key"
+    )
+    other = gemini.GeminiLanguageModel(
+        model_id="gemini-key-test", api_key="second-key"
+    )
+
+    self.assertIs(first._limiter, same._limiter)
+    self.assertIsNot(first._limiter, other._limiter)
+    for key in concurrency.limiter_stats():
+      self.assertNotIn("first-key", key)
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_retries_transient_errors(self, mock_client_class):
+    """Test a prompt is retried on 503 but not on a client error."""
+    generate_content = mock_client_class.return_value.models.generate_content
+    generate_content.side_effect = [
+        _StatusError(503, {"retry-after": "0"}),
+        mock.Mock(text="ok"),
+        _StatusError(400),
+    ]
+    model = gemini.GeminiLanguageModel(
+        api_key="test-key",
+        adaptive_concurrency=False,
+        retry_policy=retry.RetryPolicy(initial_delay=0.0, jitter=False),
+    )
+
+    self.assertEqual("ok", next(model.infer(["a"]))[0].output)
+    with self.assertRaisesRegex(exceptions.BatchInferenceError, "1 attempts"):
+      list(model.infer(["b"]))
+
+    self.assertEqual(3, generate_content.call_count)
+    self.assertEqual(["b"], [failure.prompt for failure in model.failures])
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_failed_prompt_keeps_completed_results(
+      self, mock_client_class
+  ):
+    """Test results completed alongside a failed prompt are not discarded."""
+    last_started = threading.Event()
+
+    def generate_content(model, contents, config):
+      del model, config
+      if contents == "bad":
+        self.assertTrue(last_started.wait(timeout=10))
+        raise _StatusError(400)
+      if contents == "c":
+        last_started.set()
+      return mock.Mock(text=contents)
+
+    mock_client_class.return_value.models.generate_content.side_effect = (
+        generate_content
+    )
+    model = gemini.GeminiLanguageModel(
+        api_key="test-key", max_workers=3, adaptive_concurrency=False
+    )
+    self.addCleanup(model.close)
+
+    results = model.infer(["a", "bad", "c"])
+    self.assertEqual("a", next(results)[0].output)
+    with self.assertRaises(exceptions.BatchInferenceError) as raised:
+      next(results)
+
+    self.assertEqual(1, raised.exception.index)
+    self.assertEqual(
+        {2: "c"},
+        {
+            i: outputs[0].output
+            for i, outputs in raised.exception.results.items()
+        },
+    )
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_empty_result_for_exhausted_prompt(self, mock_client_class):
+    """Test the empty policy yields no output for a failed prompt and goes on."""
+    mock_client_class.return_value.models.generate_content.side_effect = (
+        lambda model, contents, config: (
+            mock.Mock(text=contents)
+            if contents != "bad"
+            else _raise(_StatusError(503))
+        )
+    )
+    model = gemini.GeminiLanguageModel(
+        api_key="test-key",
+        max_workers=2,
+        adaptive_concurrency=False,
+        retry_policy=retry.RetryPolicy(
+            max_attempts=2,
+            initial_delay=0.0,
+            on_exhausted=retry.OnExhausted.EMPTY,
+        ),
+    )
+    self.addCleanup(model.close)
+
+    outputs = [r[0].output for r in model.infer(["a", "bad", "c"])]
+
+    self.assertEqual(["a", None, "c"], outputs)
+    self.assertEqual(
+        [(1, "bad", 2)],
+        [(f.index, f.prompt, f.attempts) for f in model.failures],
+    )
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_yields_results_before_batch_completes(
+      self, mock_client_class
+  ):
+    """Test ordered and unordered results stream while a prompt is pending."""
+    release = threading.Event()
+
+    def generate_content(model, contents, config):
+      del model, config
+      if contents == "slow":
+        self.assertTrue(release.wait(timeout=10))
+      return mock.Mock(text=contents)
+
+    mock_client_class.return_value.models.generate_content.side_effect = (
+        generate_content
+    )
+    model = gemini.GeminiLanguageModel(api_key="test-key", max_workers=3)
+    self.addCleanup(model.close)
+
+    ordered = model.infer(["a", "b", "slow"])
+    self.assertEqual("a", next(ordered)[0].output)
+    self.assertEqual("b", next(ordered)[0].output)
+    release.set()
+    self.assertEqual("slow", next(ordered)[0].output)
+
+    release.clear()
+    unordered = model.infer_unordered(["slow", "b"])
+    index, outputs = next(unordered)
+    self.assertEqual((1, "b"), (index, outputs[0].output))
+    release.set()
+    index, outputs = next(unordered)
+    self.assertEqual((0, "slow"), (index, outputs[0].output))
+
   @mock.patch("google.genai.Client")
   def test_gemini_runtime_kwargs_filtered(self, mock_client_class):
     """Test that runtime kwargs are also filtered by allow-list."""
@@ -435,6 +1217,299 @@ class TestGeminiLanguageModel(absltest.TestCase):
         "unknown_runtime_param", config, "Unknown kwargs should be filtered out"
     )
 
+  @mock.patch("google.genai.Client")
+  def test_gemini_ainfer_retries_and_keeps_completed_results(
+      self, mock_client_class
+  ):
+    """Test ainfer applies retry_policy and records the failed prompt."""
+    attempts = collections.Counter()
+
+    async def generate_content(model, contents, config):
+      del model, config
+      attempts[contents] += 1
+      if contents == "flaky" and attempts[contents] == 1:
+        raise _StatusError(503, {"retry-after": "0"})
+      if contents == "bad":
+        raise _StatusError(400)
+      return mock.Mock(text=contents)
+
+    mock_client_class.return_value.aio.models.generate_content = mock.AsyncMock(
+        side_effect=generate_content
+    )
+    model = gemini.GeminiLanguageModel(
+        api_key="test-key",
+        retry_policy=retry.RetryPolicy(initial_delay=0.0, jitter=False),
+    )
+    sleep = self.enter_context(
+        mock.patch.object(asyncio, "sleep", wraps=asyncio.sleep)
+    )
+
+    results = asyncio.run(model.ainfer(["a", "flaky"]))
+    with self.assertRaises(exceptions.BatchInferenceError) as raised:
+      asyncio.run(model.ainfer(["b", "bad"]))
+
+    self.assertEqual(["a", "flaky"], [r[0].output for r in results])
+    self.assertEqual(2, attempts["flaky"])
+    sleep.assert_called_once_with(0.0)
+    self.assertEqual(1, attempts["bad"])
+    self.assertEqual(1, raised.exception.index)
+    self.assertEqual(
+        {0: "b"},
+        {
+            i: outputs[0].output
+            for i, outputs in raised.exception.results.items()
+        },
+    )
+    self.assertEqual(["bad"], [f.prompt for f in model.failures])
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_ainfer_uses_shared_limiter(self, mock_client_class):
+    """Test a 429 on the async path lowers the limit used by infer()."""
+
+    async def generate_content(model, contents, config):
+      del model, config
+      raise _StatusError(429)
+
+    mock_client_class.return_value.aio.models.generate_content = mock.AsyncMock(
+        side_effect=generate_content
+    )
+    model = gemini.GeminiLanguageModel(
+        model_id="gemini-async-limiter-test",
+        api_key="test-key",
+        max_workers=8,
+        retry_policy=retry.RetryPolicy(max_attempts=1),
+    )
+    sync_model = gemini.GeminiLanguageModel(
+        model_id="gemini-async-limiter-test", api_key="test-key", max_workers=8
+    )
+
+    with self.assertRaises(exceptions.BatchInferenceError):
+      asyncio.run(model.ainfer(["a"]))
+
+    self.assertIs(model._limiter, sync_model._limiter)
+    self.assertEqual(
+        concurrency.LimiterStats(limit=4, overloads=1),
+        sync_model._limiter.stats,
+    )
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_ainfer_empty_result_for_exhausted_prompt(
+      self, mock_client_class
+  ):
+    """Test ainfer honors OnExhausted.EMPTY."""
+
+    async def generate_content(model, contents, config):
+      del model, config
+      if contents == "bad":
+        raise _StatusError(503)
+      return mock.Mock(text=contents)
+
+    mock_client_class.return_value.aio.models.generate_content = mock.AsyncMock(
+        side_effect=generate_content
+    )
+    model = gemini.GeminiLanguageModel(
+        api_key="test-key",
+        retry_policy=retry.RetryPolicy(
+            max_attempts=2,
+            initial_delay=0.0,
+            on_exhausted=retry.OnExhausted.EMPTY,
+        ),
+    )
+
+    results = asyncio.run(model.ainfer(["a", "bad", "c"]))
+
+    self.assertEqual(["a", None, "c"], [r[0].output for r in results])
+    self.assertEqual(
+        [(1, "bad", 2)],
+        [(f.index, f.prompt, f.attempts) for f in model.failures],
+    )
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_ainfer_uses_async_client(self, mock_client_class):
+    """Test ainfer awaits the SDK's async client with the same config."""
+    mock_client = mock.Mock()
+    mock_client_class.return_value = mock_client
+
+    mock_response = mock.Mock()
+    mock_response.text = '{"result": "test"}'
+    mock_client.aio.models.generate_content = mock.AsyncMock(
+        return_value=mock_response
+    )
+
+    model = gemini.GeminiLanguageModel(
+        model_id="gemini-2.5-flash",
+        api_key="test-key",
+        stop_sequences=["\n\n"],
+    )
+
+    results = asyncio.run(
+        model.ainfer(["prompt 1", "prompt 2"], temperature=0.2)
+    )
+
+    self.assertEqual(
+        ['{"result": "test"}', '{"result": "test"}'],
+        [outputs[0].output for outputs in results],
+    )
+    self.assertEqual(2, mock_client.aio.models.generate_content.await_count)
+    mock_client.models.generate_content.assert_not_called()
+    config = mock_client.aio.models.generate_content.call_args.kwargs["config"]
+    self.assertEqual(0.2, config["temperature"])
+    self.assertEqual(["\n\n"], config["stop_sequences"])
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_creates_prefix_cache_once(self, mock_client_class):
+    """Test the declared prefix is cached once and referenced by requests."""
+    mock_client = mock.Mock()
+    mock_client_class.return_value = mock_client
+    mock_client.caches.create.return_value.name = "cachedContents/abc"
+
+    mock_response = mock.Mock()
+    mock_response.text = '{"result": "test"}'
+    mock_client.models.generate_content.return_value = mock_response
+    mock_client.aio.models.generate_content = mock.AsyncMock(
+        return_value=mock_response
+    )
+
+    model = gemini.GeminiLanguageModel(
+        model_id="gemini-2.5-flash", api_key="test-key", max_workers=4
+    )
+    model.set_prompt_prefix("Shared prefix\n")
+
+    list(model.infer([f"Shared prefix\n\nQ: {i}" for i in range(4)]))
+    asyncio.run(model.ainfer(["Shared prefix\n\nQ: async"]))
+
+    mock_client.caches.create.assert_called_once()
+    self.assertEqual(
+        ["Shared prefix\n"],
+        mock_client.caches.create.call_args.kwargs["config"]["contents"],
+    )
+    calls = mock_client.models.generate_content.call_args_list + (
+        mock_client.aio.models.generate_content.call_args_list
+    )
+    self.assertCountEqual(
+        ["Q: 0", "Q: 1", "Q: 2", "Q: 3", "Q: async"],
+        [call.kwargs["contents"] for call in calls],
+    )
+    for call in calls:
+      self.assertEqual(
+          "cachedContents/abc", call.kwargs["config"]["cached_content"]
+      )
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_sends_full_prompt_when_prefix_cache_fails(
+      self, mock_client_class
+  ):
+    """Test a failed cache creation falls back to full prompts without retry."""
+    mock_client = mock.Mock()
+    mock_client_class.return_value = mock_client
+    mock_client.caches.create.side_effect = RuntimeError("too small")
+
+    mock_response = mock.Mock()
+    mock_response.text = '{"result": "test"}'
+    mock_client.models.generate_content.return_value = mock_response
+
+    model = gemini.GeminiLanguageModel(
+        model_id="gemini-2.5-flash", api_key="test-key", max_workers=1
+    )
+    model.set_prompt_prefix("Shared prefix\n")
+
+    list(model.infer(["Shared prefix\n\nQ: 0", "Shared prefix\n\nQ: 1"]))
+
+    mock_client.caches.create.assert_called_once()
+    calls = mock_client.models.generate_content.call_args_list
+    self.assertEqual(
+        ["Shared prefix\n\nQ: 0", "Shared prefix\n\nQ: 1"],
+        [call.kwargs["contents"] for call in calls],
+    )
+    for call in calls:
+      self.assertNotIn("cached_content", call.kwargs["config"])
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_extends_prefix_cache_before_it_expires(
+      self, mock_client_class
+  ):
+    """Test the prefix cache TTL is extended instead of reaching expiry."""
+    mock_client = mock.Mock()
+    mock_client_class.return_value = mock_client
+    mock_client.caches.create.return_value.name = "cachedContents/abc"
+    mock_client.models.generate_content.return_value.text = "{}"
+
+    model = gemini.GeminiLanguageModel(
+        model_id="gemini-2.5-flash", api_key="test-key", max_workers=1
+    )
+    model.set_prompt_prefix("Shared prefix\n")
+
+    with mock.patch.object(gemini.time, "monotonic", return_value=0.0):
+      list(model.infer(["Shared prefix\n\nQ: 0"]))
+    with mock.patch.object(gemini.time, "monotonic", return_value=3400.0):
+      list(model.infer(["Shared prefix\n\nQ: 1"]))
+
+    mock_client.caches.create.assert_called_once()
+    mock_client.caches.update.assert_called_once_with(
+        name="cachedContents/abc", config={"ttl": "3600s"}
+    )
+    for call in mock_client.models.generate_content.call_args_list:
+      self.assertEqual(
+          "cachedContents/abc", call.kwargs["config"]["cached_content"]
+      )
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_resends_full_prompt_when_prefix_cache_expired(
+      self, mock_client_class
+  ):
+    """Test a request survives its cached content expiring on the server."""
+    mock_client = mock.Mock()
+    mock_client_class.return_value = mock_client
+    old_cache, new_cache = mock.Mock(), mock.Mock()
+    old_cache.name = "cachedContents/old"
+    new_cache.name = "cachedContents/new"
+    mock_client.caches.create.side_effect = [old_cache, new_cache]
+    not_found = genai_errors.ClientError(
+        404, {"error": {"code": 404, "message": "CachedContent not found"}}
+    )
+    mock_response = mock.Mock(text="{}")
+    mock_client.models.generate_content.side_effect = [
+        not_found,
+        mock_response,
+        mock_response,
+    ]
+
+    model = gemini.GeminiLanguageModel(
+        model_id="gemini-2.5-flash", api_key="test-key", max_workers=1
+    )
+    model.set_prompt_prefix("Shared prefix\n")
+
+    list(model.infer(["Shared prefix\n\nQ: 0", "Shared prefix\n\nQ: 1"]))
+
+    calls = mock_client.models.generate_content.call_args_list
+    self.assertEqual(
+        ["Q: 0", "Shared prefix\n\nQ: 0", "Q: 1"],
+        [call.kwargs["contents"] for call in calls],
+    )
+    self.assertNotIn("cached_content", calls[1].kwargs["config"])
+    self.assertEqual(
+        "cachedContents/new", calls[2].kwargs["config"]["cached_content"]
+    )
+    self.assertEqual(2, mock_client.caches.create.call_count)
+
+  @mock.patch("google.genai.Client")
+  def test_gemini_close_deletes_prefix_caches(self, mock_client_class):
+    """Test the cached content created by a model is deleted on close."""
+    mock_client = mock.Mock()
+    mock_client_class.return_value = mock_client
+    mock_client.caches.create.return_value.name = "cachedContents/abc"
+    mock_client.models.generate_content.return_value.text = "{}"
+
+    model = gemini.GeminiLanguageModel(
+        model_id="gemini-2.5-flash", api_key="test-key", max_workers=1
+    )
+    model.set_prompt_prefix("Shared prefix\n")
+    list(model.infer(["Shared prefix\n\nQ: 0"]))
+
+    model.close()
+
+    mock_client.caches.delete.assert_called_once_with(name="cachedContents/abc")
+
 
 class TestOpenAILanguageModelInference(parameterized.TestCase):
 
@@ -705,6 +1780,116 @@ class TestOpenAILanguageModel(absltest.TestCase):
 
     self.assertNotIn("candidate_count", config)
 
+  @mock.patch("openai.AsyncOpenAI")
+  @mock.patch("openai.OpenAI")
+  def test_openai_ainfer_uses_async_client(
+      self, mock_openai_class, mock_async_openai_class
+  ):
+    """Test ainfer awaits the async OpenAI client."""
+    mock_async_client = mock.Mock()
+    mock_async_openai_class.return_value = mock_async_client
+
+    mock_response = mock.Mock()
+    mock_response.choices = [
+        mock.Mock(message=mock.Mock(content='{"result": "test"}'))
+    ]
+    mock_async_client.chat.completions.create = mock.AsyncMock(
+        return_value=mock_response
+    )
+
+    model = openai_provider.OpenAILanguageModel(api_key="test-key", seed=42)
+
+    results = asyncio.run(model.ainfer(["prompt 1", "prompt 2"]))
+
+    self.assertEqual(
+        ['{"result": "test"}', '{"result": "test"}'],
+        [outputs[0].output for outputs in results],
+    )
+    self.assertEqual(2, mock_async_client.chat.completions.create.await_count)
+    mock_openai_class.return_value.chat.completions.create.assert_not_called()
+    call_args = mock_async_client.chat.completions.create.call_args
+    self.assertEqual(42, call_args.kwargs["seed"])
+
+  @mock.patch("openai.AsyncOpenAI")
+  @mock.patch("openai.OpenAI")
+  def test_openai_ainfer_uses_one_client_per_loop(
+      self, mock_openai_class, mock_async_openai_class
+  ):
+    """Test successive loops each get their own async client."""
+    clients = []
+
+    def new_client(**kwargs):
+      del kwargs
+      loop = asyncio.get_running_loop()
+
+      async def create(**api_params):
+        del api_params
+        if asyncio.get_running_loop() is not loop:
+          raise RuntimeError("Event loop is closed")
+        return mock.Mock(choices=[mock.Mock(message=mock.Mock(content="ok"))])
+
+      client = mock.Mock()
+      client.chat.completions.create = mock.AsyncMock(side_effect=create)
+      client.close = mock.AsyncMock()
+      clients.append(client)
+      return client
+
+    mock_async_openai_class.side_effect = new_client
+    model = openai_provider.OpenAILanguageModel(api_key="test-key")
+
+    async def run_twice():
+      first = await model.ainfer(["a"])
+      second = await model.ainfer(["b"])
+      return first + second
+
+    async def run_and_close():
+      results = await model.ainfer(["c"])
+      await model.aclose()
+      return results
+
+    results = asyncio.run(run_twice())
+    results += asyncio.run(model.ainfer(["d"]))
+    results += asyncio.run(run_and_close())
+
+    self.assertEqual(["ok"] * 4, [r[0].output for r in results])
+    self.assertLen(clients, 3)
+    self.assertEqual(
+        [2, 1, 1], [c.chat.completions.create.await_count for c in clients]
+    )
+    clients[2].close.assert_awaited_once()
+    mock_openai_class.return_value.close.assert_called_once()
+
+  @mock.patch("openai.AsyncOpenAI")
+  @mock.patch("openai.OpenAI")
+  def test_openai_ainfer_retries_connection_errors(
+      self, mock_openai_class, mock_async_openai_class
+  ):
+    """Test ainfer retries by retry_policy with the client's retries off."""
+    del mock_openai_class
+    import openai  # pylint: disable=import-outside-toplevel
+
+    mock_response = mock.Mock()
+    mock_response.choices = [mock.Mock(message=mock.Mock(content="ok"))]
+    create = mock.AsyncMock(
+        side_effect=[
+            openai.APIConnectionError(request=mock.Mock()),
+            mock_response,
+        ]
+    )
+    mock_async_openai_class.return_value.chat.completions.create = create
+
+    model = openai_provider.OpenAILanguageModel(
+        api_key="test-key",
+        retry_policy=retry.RetryPolicy(initial_delay=0.0),
+    )
+
+    results = asyncio.run(model.ainfer(["prompt"]))
+
+    self.assertEqual("ok", results[0][0].output)
+    self.assertEqual(2, create.await_count)
+    self.assertEqual(0, mock_async_openai_class.call_args.kwargs["max_retries"])
+    self.assertEqual([], model.failures)
+
 
 if __name__ == "__main__":
   absltest.main()
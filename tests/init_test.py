@@ -14,6 +14,7 @@
 
 """Tests for the main package functions in __init__.py."""
 
+import asyncio
 import textwrap
 from unittest import mock
 
@@ -192,6 +193,54 @@ class InitTest(absltest.TestCase):
     _, kwargs = mock_model.infer.call_args
     self.assertEqual(kwargs.get("max_workers"), 5)
 
+  @mock.patch("langextract.extraction.factory.create_model")
+  def test_lx_aextract_awaits_model_ainfer(self, mock_create_model):
+    input_text = "Patient takes Aspirin 100mg."
+
+    mock_model = mock.MagicMock()
+    mock_model.ainfer = mock.AsyncMock(
+        return_value=[[
+            inference.ScoredOutput(
+                output='```json\n{"extractions": [{"entity": "Aspirin"}]}\n```',
+                score=0.9,
+            )
+        ]]
+    )
+    mock_model.requires_fence_output = True
+    mock_create_model.return_value = mock_model
+
+    mock_examples = [
+        lx.data.ExampleData(
+            text="Patient takes Tylenol.",
+            extractions=[
+                lx.data.Extraction(
+                    extraction_class="entity", extraction_text="Tylenol"
+                ),
+            ],
+        )
+    ]
+
+    actual_result = asyncio.run(
+        lx.aextract(
+            text_or_documents=input_text,
+            prompt_description="Extract medications.",
+            examples=mock_examples,
+            api_key="some_api_key",
+            fence_output=True,
+            use_schema_constraints=False,
+        )
+    )
+
+    mock_model.ainfer.assert_awaited_once()
+    mock_model.infer.assert_not_called()
+    self.assertEqual(
+        [e.extraction_text for e in actual_result.extractions], ["Aspirin"]
+    )
+    self.assertEqual(
+        actual_result.extractions[0].char_interval,
+        data.CharInterval(start_pos=14, end_pos=21),
+    )
+
 
 if __name__ == "__main__":
   absltest.main()
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import textwrap
+from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -325,6 +326,90 @@ class QAPromptGeneratorTest(parameterized.TestCase):
     )
     self.assertEqual(expected_formatted_example, actual_formatted_example)
 
+  def test_examples_rendered_once_and_refreshed_on_change(self):
+    """Tests the examples block is reused until examples or settings change."""
+    template = prompting.PromptTemplateStructured(
+        description="Extract conditions.",
+        examples=[
+            data.ExampleData(
+                text="Patient has diabetes.",
+                extractions=[
+                    data.Extraction(
+                        extraction_text="diabetes",
+                        extraction_class="condition",
+                    )
+                ],
+            )
+        ],
+    )
+    prompt_generator = prompting.QAPromptGenerator(
+        template=template, format_type=data.FormatType.YAML
+    )
+
+    with mock.patch.object(
+        prompt_generator,
+        "format_example_as_text",
+        wraps=prompt_generator.format_example_as_text,
+    ) as mock_format:
+      first = prompt_generator.render("First chunk.")
+      second = prompt_generator.render("Second chunk.", "Some context.")
+      self.assertEqual(mock_format.call_count, 1)
+
+      template.examples.append(
+          data.ExampleData(text="Patient has asthma.", extractions=[])
+      )
+      with_new_example = prompt_generator.render("First chunk.")
+      self.assertEqual(mock_format.call_count, 3)
+
+      prompt_generator.format_type = data.FormatType.JSON
+      as_json = prompt_generator.render("First chunk.")
+      self.assertEqual(mock_format.call_count, 5)
+
+    self.assertIn("Some context.", second)
+    self.assertIn("Patient has asthma.", with_new_example)
+    self.assertNotIn("Patient has asthma.", first)
+    self.assertIn('"extractions"', as_json)
+    self.assertEqual(
+        first,
+        prompting.QAPromptGenerator(
+            template=prompting.PromptTemplateStructured(
+                description=template.description,
+                examples=template.examples[:1],
+            ),
+            format_type=data.FormatType.YAML,
+        ).render("First chunk."),
+    )
+
+  def test_prefix_and_suffix_compose_full_prompt(self):
+    """Tests the static prefix plus the question suffix equals render()."""
+    template = prompting.PromptTemplateStructured(
+        description="Extract conditions.",
+        examples=[
+            data.ExampleData(
+                text="Patient has diabetes.",
+                extractions=[
+                    data.Extraction(
+                        extraction_text="diabetes",
+                        extraction_class="condition",
+                    )
+                ],
+            )
+        ],
+    )
+    prompt_generator = prompting.QAPromptGenerator(template=template)
+
+    prefix = prompt_generator.render_prefix()
+    with_context = prompt_generator.render_suffix("Chunk.", "Some context.")
+
+    self.assertEqual(
+        prompt_generator.render("Chunk."),
+        "\n".join([prefix, prompt_generator.render_suffix("Chunk.")]),
+    )
+    self.assertNotIn("Chunk.", prefix)
+    self.assertIn("Patient has diabetes.", prefix)
+    self.assertTrue(with_context.startswith("Some context.\n"))
+    self.assertTrue(with_context.endswith("Chunk.\nA: "))
+
 
 if __name__ == "__main__":
   absltest.main()
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import difflib
+import random
 import textwrap
 from typing import Sequence
+from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -25,6 +29,57 @@ from langextract.core import data
 from langextract.core import tokenizer
 
 
+def _full_scan_fuzzy_interval(
+    source_text: str,
+    extraction_text: str,
+    threshold: float,
+    max_window: int | None = None,
+) -> tokenizer.TokenInterval | None:
+  """Fuzzy-aligns like the original scan over every window of the source.
+
+  Args:
+    source_text: The source text.
+    extraction_text: The extraction text.
+    threshold: Minimum fraction of extraction tokens matched by the window.
+    max_window: Largest window size scanned. Defaults to the source length.
+
+  Returns:
+    The token interval of the smallest, earliest window with the best match
+    ratio, or None if no window reaches the threshold.
+  """
+
+  def normalize(text):
+    return [
+        resolver_lib._normalize_token(token)
+        for token in resolver_lib._tokenize_with_lowercase(text)
+    ]
+
+  source_tokens = normalize(source_text)
+  extraction_tokens = normalize(extraction_text)
+  len_e = len(extraction_tokens)
+  if max_window is None:
+    max_window = len(source_tokens)
+  extraction_counts = collections.Counter(extraction_tokens)
+  matcher = difflib.SequenceMatcher(autojunk=False, b=extraction_tokens)
+  best_ratio, best_span = 0.0, None
+  for window_size in range(len_e, min(max_window, len(source_tokens)) + 1):
+    for start in range(len(source_tokens) - window_size + 1):
+      window = source_tokens[start : start + window_size]
+      overlap = (extraction_counts & collections.Counter(window)).total()
+      if overlap < int(len_e * threshold):
+        continue
+      matcher.set_seq1(window)
+      ratio = sum(size for _, _, size in matcher.get_matching_blocks()) / len_e
+      if ratio > best_ratio:
+        best_ratio, best_span = ratio, (start, window_size)
+  if best_span is None or best_ratio < threshold:
+    return None
+  start, window_size = best_span
+  return tokenizer.TokenInterval(
+      start_index=start, end_index=start + window_size
+  )
+
+
 def assert_char_interval_match_source(
     test_case: absltest.TestCase,
     source_text: str,
@@ -1663,6 +1718,112 @@ class AlignEntitiesTest(parameterized.TestCase):
       )
       self.assertEqual(aligned_extraction_groups, expected_output)
 
+  @parameterized.parameters(
+      "problems heart",
+      "mild degenerative disc disease",
+      "The iliopsoas tendon is intact",
+      "headache and fever",
+      "no fever today",
+  )
+  def test_indexed_fuzzy_alignment_matches_exhaustive(self, extraction_text):
+    source_text = (
+        "Patient has severe heart problems today. The iliopsoas and proximal"
+        " hamstring tendons are intact. Findings consistent with degenerative"
+        " disc disease at L5-S1, no fever."
+    )
+
+    def align(exhaustive):
+      return self.aligner.align_extractions(
+          [[
+              data.Extraction(
+                  extraction_class="finding", extraction_text=extraction_text
+              )
+          ]],
+          source_text,
+          enable_fuzzy_alignment=True,
+          exhaustive_fuzzy_alignment=exhaustive,
+      )
+
+    self.assertEqual(align(exhaustive=False), align(exhaustive=True))
+
+  def test_indexed_fuzzy_alignment_bounds_window_size(self):
+    # The shared tokens span 11 tokens, more than twice the extraction's 4.
+    source_text = "aspirin one two three four five six seven eight daily dose"
+
+    def align(exhaustive):
+      (extraction,) = self.aligner.align_extractions(
+          [[
+              data.Extraction(
+                  extraction_class="medication",
+                  extraction_text="aspirin daily dose twice",
+              )
+          ]],
+          source_text,
+          enable_fuzzy_alignment=True,
+          exhaustive_fuzzy_alignment=exhaustive,
+      )[0]
+      return extraction.token_interval
+
+    self.assertEqual(
+        align(exhaustive=True),
+        tokenizer.TokenInterval(start_index=0, end_index=11),
+    )
+    self.assertIsNone(align(exhaustive=False))
+
+  def test_fuzzy_alignment_matches_full_scan_on_random_texts(self):
+    rng = random.Random(0)
+    words = [
+        "pain",
+        "pains",
+        "chest",
+        "left",
+        "arm",
+        "arms",
+        "no",
+        "fever",
+        "mild",
+        "the",
+        "and",
+        ".",
+    ]
+    threshold = 0.5
+    for _ in range(100):
+      source_text = " ".join(rng.choices(words, k=rng.randint(1, 30)))
+      extraction_text = " ".join(rng.choices(words, k=rng.randint(1, 5)))
+      num_extraction_tokens = tokenizer.tokenize(extraction_text).num_tokens
+
+      for exhaustive, max_window in (
+          (True, None),
+          (
+              False,
+              num_extraction_tokens
+              * resolver_lib._FUZZY_ALIGNMENT_WINDOW_FACTOR,
+          ),
+      ):
+        with self.subTest(
+            source_text=source_text,
+            extraction_text=extraction_text,
+            exhaustive=exhaustive,
+        ):
+          extraction = data.Extraction(
+              extraction_class="finding", extraction_text=extraction_text
+          )
+          aligned = self.aligner._fuzzy_align_extraction(
+              extraction,
+              resolver_lib._lowercase_tokens(tokenizer.tokenize(source_text)),
+              tokenizer.tokenize(source_text),
+              token_offset=0,
+              char_offset=0,
+              fuzzy_alignment_threshold=threshold,
+              exhaustive=exhaustive,
+          )
+          self.assertEqual(
+              aligned.token_interval if aligned else None,
+              _full_scan_fuzzy_interval(
+                  source_text, extraction_text, threshold, max_window
+              ),
+          )
+
 
 class ResolverTest(parameterized.TestCase):
   _TWO_MEDICATIONS_JSON_UNDELIMITED = textwrap.dedent(f"""\
@@ -1951,6 +2112,99 @@ class ResolverTest(parameterized.TestCase):
 
     assert_char_interval_match_source(self, text, aligned_extractions)
 
+  def test_align_with_document_token_slice_skips_retokenizing(self):
+    text = "Intro line.\nPatient takes aspirin daily and ibuprofen weekly."
+    tokenized_text = tokenizer.tokenize(text)
+    chunk = tokenizer.TokenInterval(start_index=3, end_index=11)
+    chunk_text = chunking.get_token_interval_text(tokenized_text, chunk)
+    char_offset = tokenized_text.starts[chunk.start_index]
+
+    def make_extractions():
+      return [
+          data.Extraction(extraction_class="drug", extraction_text="aspirin"),
+          data.Extraction(
+              extraction_class="drug", extraction_text="ibuprofens weekly"
+          ),
+          data.Extraction(extraction_class="drug", extraction_text="aspirin"),
+      ]
+
+    expected = list(
+        self.default_resolver.align(
+            make_extractions(),
+            source_text=chunk_text,
+            token_offset=chunk.start_index,
+            char_offset=char_offset,
+        )
+    )
+    with mock.patch.object(
+        tokenizer, "tokenize", wraps=tokenizer.tokenize
+    ) as mock_tokenize:
+      actual = list(
+          self.default_resolver.align(
+              make_extractions(),
+              source_text=chunk_text,
+              token_offset=chunk.start_index,
+              char_offset=char_offset,
+              tokenized_text=tokenized_text.slice(chunk),
+          )
+      )
+
+    self.assertEqual(expected, actual)
+    self.assertEqual(
+        [e.alignment_status for e in actual],
+        [
+            data.AlignmentStatus.MATCH_EXACT,
+            data.AlignmentStatus.MATCH_FUZZY,
+            data.AlignmentStatus.MATCH_FUZZY,
+        ],
+    )
+    assert_char_interval_match_source(self, text, actual)
+    # Only the delimiter and the two distinct extraction texts are tokenized.
+    self.assertCountEqual(
+        [call.args[0] for call in mock_tokenize.call_args_list],
+        ["\u241f", "aspirin", "ibuprofens weekly"],
+    )
+
+  def test_align_reuses_alignment_cache(self):
+    source_text = "Take aspirin, then aspirin again with food."
+    cache = resolver_lib.AlignmentCache()
+
+    def align(*extraction_texts):
+      extractions = [
+          data.Extraction(extraction_class="medication", extraction_text=text)
+          for text in extraction_texts
+      ]
+      return list(
+          self.default_resolver.align(
+              extractions,
+              source_text,
+              token_offset=4,
+              char_offset=20,
+              alignment_cache=cache,
+          )
+      )
+
+    first = align("aspirin", "Aspirin", "with  food")
+    with mock.patch.object(
+        resolver_lib.WordAligner, "align_extractions", autospec=True
+    ) as align_extractions:
+      second = align("ASPIRIN", "aspirin", "with food")
+    align_extractions.assert_not_called()
+
+    self.assertEqual(
+        [e.char_interval for e in second], [e.char_interval for e in first]
+    )
+    self.assertEqual(
+        [e.char_interval for e in first],
+        [
+            data.CharInterval(start_pos=25, end_pos=32),
+            data.CharInterval(start_pos=39, end_pos=46),
+            data.CharInterval(start_pos=53, end_pos=62),
+        ],
+    )
+    self.assertEqual((cache.hits, cache.misses), (3, 3))
+    self.assertEqual(cache.hit_rate, 0.5)
+
   def test_align_with_no_extractions_in_chunk(self):
     tokenized_text = tokenizer.tokenize("No extractions here.")
 
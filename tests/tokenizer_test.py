@@ -12,7 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import dataclasses
+import pickle
 import textwrap
+from unittest import mock
+import warnings
 
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -112,6 +117,38 @@ class TokenizerTest(parameterized.TestCase):
               ),
           ],
       ),
+      dict(
+          testcase_name="slash_abbreviation_and_carriage_return",
+          input_text="\nBP 140/90\r\nI/O ok",
+          expected_tokens=[
+              tokenizer.Token(index=0, token_type=tokenizer.TokenType.WORD),
+              tokenizer.Token(index=1, token_type=tokenizer.TokenType.ACRONYM),
+              tokenizer.Token(
+                  index=2,
+                  token_type=tokenizer.TokenType.ACRONYM,
+                  first_token_after_newline=True,
+              ),
+              tokenizer.Token(index=3, token_type=tokenizer.TokenType.WORD),
+          ],
+      ),
+      dict(
+          testcase_name="cjk_characters_and_full_width_punctuation",
+          input_text="患者头痛。한국어 OK！",
+          expected_tokens=[
+              tokenizer.Token(index=0, token_type=tokenizer.TokenType.WORD),
+              tokenizer.Token(index=1, token_type=tokenizer.TokenType.WORD),
+              tokenizer.Token(index=2, token_type=tokenizer.TokenType.WORD),
+              tokenizer.Token(index=3, token_type=tokenizer.TokenType.WORD),
+              tokenizer.Token(
+                  index=4, token_type=tokenizer.TokenType.PUNCTUATION
+              ),
+              tokenizer.Token(index=5, token_type=tokenizer.TokenType.WORD),
+              tokenizer.Token(index=6, token_type=tokenizer.TokenType.WORD),
+              tokenizer.Token(
+                  index=7, token_type=tokenizer.TokenType.PUNCTUATION
+              ),
+          ],
+      ),
       dict(
           testcase_name="empty_string",
           input_text="",
@@ -165,6 +202,89 @@ class TokenizerTest(parameterized.TestCase):
         msg="Newline flags mismatch",
     )
 
+  def test_columns_and_lazy_tokens_view(self):
+    tokenized = tokenizer.tokenize("Age: 25\nI/O")
+
+    self.assertEqual(tokenized.num_tokens, 4)
+    self.assertEqual(list(tokenized.starts), [0, 3, 5, 8])
+    self.assertEqual(list(tokenized.ends), [3, 4, 7, 11])
+    self.assertEqual(
+        list(tokenized.token_types),
+        [
+            tokenizer.TokenType.WORD,
+            tokenizer.TokenType.PUNCTUATION,
+            tokenizer.TokenType.NUMBER,
+            tokenizer.TokenType.ACRONYM,
+        ],
+    )
+    self.assertEqual(list(tokenized.newline_flags), [0, 0, 0, 1])
+
+    tokens = tokenized.tokens
+    self.assertIs(tokens, tokenized.tokens)
+    self.assertEqual(
+        tokens[3],
+        tokenizer.Token(
+            index=3,
+            token_type=tokenizer.TokenType.ACRONYM,
+            char_interval=tokenizer.CharInterval(start_pos=8, end_pos=11),
+            first_token_after_newline=True,
+        ),
+    )
+    self.assertEqual(
+        tokenizer.TokenizedText(text=tokenized.text, tokens=tokens), tokenized
+    )
+
+  def test_tokens_are_read_only(self):
+    tokenized = tokenizer.tokenize("Age: 25")
+    token = tokenized.tokens[0]
+
+    with self.assertRaises(TypeError):
+      tokenized.tokens.append(token)
+    with self.assertRaises(TypeError):
+      tokenized.tokens[0] = token
+    tokenized.tokens = [token]
+    tokens_copy = copy.deepcopy(tokenized.tokens)
+    tokens_copy.append(token)
+
+    self.assertEqual(tokenized.num_tokens, 1)
+    self.assertEqual(list(tokenized.ends), [3])
+    self.assertEqual(pickle.loads(pickle.dumps(tokenized.tokens)), [token])
+
+  def test_dataclass_functions_use_text_and_tokens(self):
+    tokenized = tokenizer.tokenize("Age: 25")
+
+    replaced = dataclasses.replace(tokenized, tokens=tokenized.tokens[:2])
+
+    self.assertEqual(
+        [field.name for field in dataclasses.fields(tokenized)],
+        ["text", "tokens"],
+    )
+    self.assertEqual(replaced.text, "Age: 25")
+    self.assertEqual(list(replaced.starts), [0, 3])
+    self.assertEqual(
+        dataclasses.asdict(tokenized)["tokens"][2],
+        {
+            "index": 2,
+            "token_type": tokenizer.TokenType.NUMBER,
+            "char_interval": {"start_pos": 5, "end_pos": 7},
+            "first_token_after_newline": False,
+        },
+    )
+
+  def test_slice_pickles_and_compacts(self):
+    tokenized = tokenizer.tokenize("Age: 25\nI/O")
+    sliced = tokenized.slice(
+        tokenizer.TokenInterval(start_index=2, end_index=4)
+    )
+
+    self.assertEqual(pickle.loads(pickle.dumps(sliced)), sliced)
+    compact = sliced.compact()
+    self.assertEqual(compact.text, "25\nI/O")
+    self.assertEqual(list(compact.starts), [0, 3])
+    self.assertEqual(list(compact.ends), [2, 6])
+    self.assertEqual(list(compact.token_types), list(sliced.token_types))
+    self.assertEqual(list(compact.newline_flags), [0, 1])
+
 
 class TokensTextTest(parameterized.TestCase):
 
@@ -259,14 +379,37 @@ class SentenceRangeTest(parameterized.TestCase):
           start_pos=0,
           expected_interval=(0, 9),
       ),
+      dict(
+          testcase_name="full_width_terminator",
+          input_text="患者头痛。医生开药！",
+          start_pos=0,
+          expected_interval=(0, 5),
+      ),
+      dict(
+          testcase_name="full_width_terminator_with_closing_quote",
+          input_text="他说：“你好！”然后走了。",
+          start_pos=0,
+          expected_interval=(0, 6),
+      ),
+      dict(
+          testcase_name="full_width_terminator_before_opening_quote",
+          input_text="他走了。“你好。”",
+          start_pos=0,
+          expected_interval=(0, 4),
+      ),
+      dict(
+          testcase_name="opening_quote_starts_next_sentence",
+          input_text="他走了。“你好。”",
+          start_pos=4,
+          expected_interval=(4, 8),
+      ),
   )
   def test_partial_sentence_range(
       self, input_text, start_pos, expected_interval
   ):
     tokenized = tokenizer.tokenize(input_text)
-    tokens = tokenized.tokens
 
-    interval = tokenizer.find_sentence_range(input_text, tokens, start_pos)
+    interval = tokenizer.find_sentence_range(input_text, tokenized, start_pos)
     expected_start, expected_end = expected_interval
     self.assertEqual(interval.start_index, expected_start)
     self.assertEqual(interval.end_index, expected_end)
@@ -280,11 +423,10 @@ class SentenceRangeTest(parameterized.TestCase):
   )
   def test_full_sentence_range(self, input_text, start_pos):
     tokenized = tokenizer.tokenize(input_text)
-    tokens = tokenized.tokens
 
-    interval = tokenizer.find_sentence_range(input_text, tokens, start_pos)
+    interval = tokenizer.find_sentence_range(input_text, tokenized, start_pos)
     self.assertEqual(interval.start_index, 0)
-    self.assertLen(tokens, interval.end_index)
+    self.assertEqual(tokenized.num_tokens, interval.end_index)
 
   @parameterized.named_parameters(
       dict(
@@ -300,9 +442,55 @@ class SentenceRangeTest(parameterized.TestCase):
   )
   def test_invalid_start_pos(self, input_text, start_pos):
     tokenized = tokenizer.tokenize(input_text)
-    tokens = tokenized.tokens
     with self.assertRaises(tokenizer.SentenceRangeError):
-      tokenizer.find_sentence_range(input_text, tokens, start_pos)
+      tokenizer.find_sentence_range(input_text, tokenized, start_pos)
+
+  def test_sentence_ends_computed_once(self):
+    input_text = "Dr. Smith came. He left!\nThen rest\nwas over"
+    tokenized = tokenizer.tokenize(input_text)
+
+    sentence_ends = tokenized.sentence_ends
+    self.assertIs(sentence_ends, tokenized.sentence_ends)
+    self.assertEqual(list(sentence_ends), [5, 8, tokenized.num_tokens])
+    for start_pos in range(tokenized.num_tokens):
+      self.assertEqual(
+          tokenizer.find_sentence_range(
+              input_text, tokenized, start_pos
+          ).end_index,
+          tokenizer.find_sentence_range(
+              input_text, tokenized.tokens, start_pos
+          ).end_index,
+      )
+
+  def test_token_list_of_tokenized_text_reuses_it(self):
+    input_text = "One. Two. Three."
+    tokenized = tokenizer.tokenize(input_text)
+
+    with (
+        mock.patch.object(
+            tokenizer,
+            "_find_sentence_ends",
+            wraps=tokenizer._find_sentence_ends,
+        ) as find_sentence_ends,
+        warnings.catch_warnings(),
+    ):
+      warnings.simplefilter("error")
+      intervals = [
+          tokenizer.find_sentence_range(input_text, tokenized.tokens, start)
+          for start in (0, 2, 4)
+      ]
+
+    self.assertEqual([interval.end_index for interval in intervals], [2, 4, 6])
+    find_sentence_ends.assert_called_once()
+
+  def test_other_token_sequences_deprecated(self):
+    input_text = "One. Two."
+    tokens = list(tokenizer.tokenize(input_text).tokens)
+
+    with self.assertWarns(FutureWarning):
+      interval = tokenizer.find_sentence_range(input_text, tokens, 0)
+
+    self.assertEqual(interval.end_index, 2)
 
 
 if __name__ == "__main__":